@@ -1,47 +1,111 @@
 # -*- coding: utf-8 -*-
 
+import os
 from collections import defaultdict
 from configparser import NoOptionError, NoSectionError, RawConfigParser
-from typing import Optional
+from contextlib import contextmanager
+from typing import Iterator, Optional
 
 from atomicwrites import atomic_write
 
 
 class Config:
+    """
+    Read and write an INI-style configuration file (such as tahoe.cfg).
+
+    The parsed contents of the file are kept in memory and are only
+    re-read if the file's modification time or size changes (e.g., because
+    it was modified by another process).
+    """
+
     def __init__(self, filename: str) -> None:
         self.filename = filename
+        self._parser: Optional[RawConfigParser] = None
+        self._stamp: Optional[tuple[int, int]] = None
+        self._batch_depth = 0
+        self._dirty = False
+
+    def _get_stamp(self) -> Optional[tuple[int, int]]:
+        try:
+            st = os.stat(self.filename)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _read(self) -> RawConfigParser:
+        if self._parser is not None and self._batch_depth:
+            # Don't discard any changes that haven't been written yet
+            return self._parser
+        stamp = self._get_stamp()
+        if self._parser is None or stamp != self._stamp:
+            parser = RawConfigParser(allow_no_value=True)
+            parser.read(self.filename)
+            self._parser = parser
+            self._stamp = stamp
+        return self._parser
+
+    def _write(self) -> None:
+        if self._batch_depth:
+            self._dirty = True
+            return
+        if self._parser is None:
+            return
+        try:
+            with atomic_write(self.filename, mode="w", overwrite=True) as f:
+                self._parser.write(f)
+        except Exception:
+            self._parser = None  # Re-read the file next time
+            raise
+        self._stamp = self._get_stamp()
+
+    @contextmanager
+    def batch(self) -> Iterator["Config"]:
+        """
+        Defer writing any changes made with ``set`` or ``save`` until the
+        end of the ``with`` block, so that they are written to the file
+        (atomically) all at once. Changes are discarded if the block raises
+        an exception.
+        """
+        self._read()
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._parser = None
+                self._dirty = False
+            raise
+        self._batch_depth -= 1
+        if not self._batch_depth and self._dirty:
+            self._dirty = False
+            self._write()
 
     def set(self, section: str, option: str, value: str) -> None:
-        config = RawConfigParser(allow_no_value=True)
-        config.read(self.filename)
+        config = self._read()
         if not config.has_section(section):
             config.add_section(section)
         config.set(section, option, value)
-        with atomic_write(self.filename, mode="w", overwrite=True) as f:
-            config.write(f)
+        self._write()
 
     def get(self, section: str, option: str) -> Optional[str]:
-        config = RawConfigParser(allow_no_value=True)
-        config.read(self.filename)
+        config = self._read()
         try:
             return config.get(section, option)
         except (NoOptionError, NoSectionError):
             return None
 
     def save(self, settings_dict: dict) -> None:
-        config = RawConfigParser(allow_no_value=True)
-        config.read(self.filename)
+        config = self._read()
         for section, d in settings_dict.items():
             if not config.has_section(section):
                 config.add_section(section)
             for option, value in d.items():
                 config.set(section, option, value)
-        with atomic_write(self.filename, mode="w", overwrite=True) as f:
-            config.write(f)
+        self._write()
 
     def load(self) -> dict:
-        config = RawConfigParser(allow_no_value=True)
-        config.read(self.filename)
+        config = self._read()
         settings_dict: defaultdict = defaultdict(dict)
         for section in config.sections():
             for option, value in config.items(section):
@@ -78,19 +78,11 @@ from gridsync.preferences import get_preference, set_preference
 from gridsync.tahoe import Tahoe, get_nodedirs
 from gridsync.tor import get_tor
 from gridsync.types import TwistedDeferred
+from gridsync.util import DequeHandler
 
 app.setWindowIcon(QIcon(resource(settings["application"]["tray_icon"])))
 
 
-class DequeHandler(logging.Handler):
-    def __init__(self, deque: collections.deque) -> None:
-        super().__init__()
-        self.deque = deque
-
-    def emit(self, record: logging.LogRecord) -> None:
-        self.deque.append(self.format(record))
-
-
 class LogFormatter(logging.Formatter):
     def formatTime(
         self, record: logging.LogRecord, datefmt: Optional[str] = None
@@ -123,13 +115,14 @@ class Core:
         handler: Union[logging.StreamHandler, DequeHandler]
         if to_stdout:
             handler = logging.StreamHandler(stream=sys.stdout)
+            fmt = "%(asctime)s %(levelname)s %(funcName)s %(message)s"
+            handler.setFormatter(LogFormatter(fmt=fmt))
             startLogging(sys.stdout)
         else:
+            # Records are only formatted (by format_log_record) when viewed
             handler = DequeHandler(self.log_deque)
             observer = PythonLoggingObserver()
             observer.start()
-        fmt = "%(asctime)s %(levelname)s %(funcName)s %(message)s"
-        handler.setFormatter(LogFormatter(fmt=fmt))
         logger = logging.getLogger()
         logger.addHandler(handler)
         logger.setLevel(logging.DEBUG)
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+An in-memory cache of Tahoe-LAFS directory listings (``?t=json`` output).
+"""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from gridsync.capabilities import diminish
+
+# Capabilities whose ``?t=json`` representation can never change
+_IMMUTABLE_PREFIXES = (
+    "URI:DIR2-CHK:",
+    "URI:DIR2-LIT:",
+    "URI:CHK:",
+    "URI:LIT:",
+)
+
+
+def _root(cap: str) -> str:
+    return cap.split("/", 1)[0]
+
+
+def is_immutable(cap: str) -> bool:
+    """
+    Determine whether the object at the given capability (or at a path
+    beneath it) can ever change.
+
+    Verify-capabilities are treated as immutable since they do not expose
+    the contents of the objects they refer to.
+    """
+    root = _root(cap)
+    return root.startswith(_IMMUTABLE_PREFIXES) or "-Verifier:" in root
+
+
+class DirectoryCache:
+    """
+    A least-recently-used cache of raw ``?t=json`` responses, keyed by
+    capability (optionally followed by a "/"-separated path).
+
+    Entries for immutable capabilities and verify-capabilities never expire
+    (but may still be evicted when the cache is full). Entries for mutable
+    capabilities expire after ``ttl`` seconds or when ``invalidate`` is
+    called for the directory they belong to. Paths beneath a mutable
+    capability are not cached at all, since modifying any directory along
+    the path (which can be reached through other capabilities) can change
+    what the path refers to.
+
+    Since a listing may be fetched while the directory is being modified,
+    callers should obtain a ``generation`` before fetching a listing and
+    pass it to ``put``; listings fetched before an invalidation are then
+    discarded instead of being cached.
+
+    :ivar hits: The number of lookups that were answered from the cache.
+    :ivar misses: The number of lookups that were not.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 30.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        # cap -> (content, expiry time or None if the entry never expires)
+        self._entries: OrderedDict[
+            str, tuple[bytes, Optional[float]]
+        ] = OrderedDict()
+        # dircap -> number of times it was invalidated
+        self._invalidations: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, cap: str) -> Optional[bytes]:
+        cap = cap.rstrip("/")
+        entry = self._entries.get(cap)
+        if entry is not None:
+            content, expires = entry
+            if expires is None or time.monotonic() < expires:
+                self._entries.move_to_end(cap)
+                self.hits += 1
+                return content
+            del self._entries[cap]
+        self.misses += 1
+        return None
+
+    def generation(self, cap: str) -> int:
+        """
+        Return a number that changes whenever the entry for the given
+        capability is invalidated.
+        """
+        return self._invalidations.get(cap.rstrip("/"), 0)
+
+    def put(
+        self, cap: str, content: bytes, generation: Optional[int] = None
+    ) -> None:
+        """
+        Cache the listing of the given capability.
+
+        :param generation: The ``generation`` of ``cap`` from before the
+            listing was fetched; if it has since changed, the listing may
+            be stale and is not cached.
+        """
+        cap = cap.rstrip("/")
+        if generation is not None and generation != self.generation(cap):
+            return
+        if is_immutable(cap):
+            expires = None
+        elif "/" in cap:
+            return
+        else:
+            expires = time.monotonic() + self.ttl
+        self._entries[cap] = (content, expires)
+        self._entries.move_to_end(cap)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, dircap: str) -> None:
+        """
+        Drop the entries for the given directory (and for its read-only
+        form).
+        """
+        dircap = dircap.rstrip("/")
+        caps = {dircap}
+        try:
+            caps.add(diminish(dircap))
+        except ValueError:
+            pass
+        for cap in caps:
+            self._invalidations[cap] = self._invalidations.get(cap, 0) + 1
+            self._entries.pop(cap, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self), "hits": self.hits, "misses": self.misses}
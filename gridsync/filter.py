@@ -2,8 +2,11 @@
 from __future__ import annotations
 
 import json
+import logging
 import os
-from typing import TYPE_CHECKING, Optional
+import re
+from itertools import islice
+from typing import TYPE_CHECKING, Iterable, Optional, Union
 
 from gridsync import autostart_file_path, config_dir, pkgdir
 from gridsync.crypto import trunchash
@@ -112,12 +115,161 @@ def get_filters(core: Core) -> list:
     return filters
 
 
+def _overlap_offsets(outer: str, inner: str) -> list[int]:
+    """
+    Return the offsets (after the first character) at which an occurrence
+    of ``inner`` could begin inside an occurrence of ``outer`` and extend
+    past its end.
+    """
+    offsets = []
+    i = outer.find(inner[0], 1)
+    while i != -1:
+        if len(outer) - i < len(inner) and inner.startswith(outer[i:]):
+            offsets.append(i)
+        i = outer.find(inner[0], i + 1)
+    return offsets
+
+
+def _can_overlap(a: str, b: str) -> bool:
+    return (
+        a in b
+        or b in a
+        or bool(_overlap_offsets(a, b))
+        or bool(_overlap_offsets(b, a))
+    )
+
+
+def _trie_regex(strings: list[str]) -> str:
+    """
+    Return a regular expression that matches the longest of the given
+    strings that occurs at any position.
+    """
+    trie: dict = {}
+    for string in strings:
+        node = trie
+        for char in string:
+            node = node.setdefault(char, {})
+        node[""] = {}  # Marks the end of a string
+
+    def build(node: dict) -> str:
+        chain = ""
+        while len(node) == 1 and "" not in node:  # Follow unbranched paths
+            ((char, node),) = node.items()
+            chain += re.escape(char)
+        branches = [re.escape(c) + build(n) for c, n in node.items() if c]
+        if not branches:
+            return chain
+        group = "(?:" + "|".join(branches) + ")"
+        return chain + (group + "?" if "" in node else group)
+
+    return build(trie)
+
+
+class _RedactionPass:
+    """
+    Mask all occurrences of a group of strings (none of which contains an
+    earlier one after its first character) in a single pass.
+
+    Where more than one of the strings begins at the same position, the
+    earliest one takes precedence. In the (rare) event that an earlier
+    string begins in the middle of an occurrence of a later one and
+    extends past its end, the strings are replaced one at a time instead.
+    """
+
+    def __init__(self, masks: dict[str, str]) -> None:
+        self.masks = masks
+        self.pattern = re.compile(_trie_regex(list(masks)))
+        priorities = {s: i for i, s in enumerate(masks)}
+        # The pattern matches the longest string at a given position; the
+        # string that takes precedence there is the earliest of its prefixes
+        self.preferred: dict[str, str] = {}
+        # string -> [(offset, earlier string that could begin there)]
+        self.overlaps: dict[str, list[tuple[int, str]]] = {}
+        for string in masks:
+            prefixes = [
+                string[:n]
+                for n in range(1, len(string) + 1)
+                if string[:n] in priorities
+            ]
+            self.preferred[string] = min(prefixes, key=priorities.__getitem__)
+            self.overlaps[string] = [
+                (offset, earlier)
+                for earlier in list(masks)[: priorities[string]]
+                for offset in _overlap_offsets(string, earlier)
+            ]
+
+    def _redact_sequentially(self, in_str: str) -> str:
+        for string, mask in self.masks.items():
+            in_str = in_str.replace(string, mask)
+        return in_str
+
+    def redact(self, in_str: str) -> str:
+        parts = []
+        pos = 0
+        match = self.pattern.search(in_str)
+        while match:
+            start = match.start()
+            string = self.preferred[match.group()]
+            for offset, earlier in self.overlaps[string]:
+                if in_str.startswith(earlier, start + offset):
+                    return self._redact_sequentially(in_str)
+            parts.append(in_str[pos:start])
+            parts.append(self.masks[string])
+            pos = start + len(string)
+            match = self.pattern.search(in_str, pos)
+        parts.append(in_str[pos:])
+        return "".join(parts)
+
+
+class Redactor:
+    """
+    Replace each of the strings in ``filters`` -- a list of (string, mask)
+    pairs, as returned by ``get_filters`` -- with its mask.
+
+    The output is the same as that of replacing each string in turn (in
+    the order given) but, rather than making one pass over the input per
+    filter, the filters are compiled into as few passes as possible --
+    usually one -- each of which masks all of its strings at once. A new
+    pass is only needed when a filter's string contains an earlier one
+    (after its first character) or could match part of an earlier filter's
+    mask, since the earlier replacement changes what the later filter will
+    match.
+    """
+
+    def __init__(self, filters: list) -> None:
+        pairs = [
+            (s, "<Filtered:{}>".format(mask))
+            for s, mask in filters
+            if s and mask
+        ]
+        all_masks = {mask for _, mask in pairs}
+        self.passes: list[_RedactionPass] = []
+        seen: set[str] = set()
+        group: dict[str, str] = {}
+        for s, mask in pairs:
+            if s in seen and not any(_can_overlap(s, m) for m in all_masks):
+                # All occurrences of s have already been replaced
+                continue
+            seen.add(s)
+            if any(
+                s.find(prev, 1) != -1 or _can_overlap(s, prev_mask)
+                for prev, prev_mask in group.items()
+            ):
+                self.passes.append(_RedactionPass(group))
+                group = {}
+            group.setdefault(s, mask)
+        if group:
+            self.passes.append(_RedactionPass(group))
+
+    def redact(self, in_str: str) -> str:
+        filtered = in_str
+        for redaction_pass in self.passes:
+            filtered = redaction_pass.redact(filtered)
+        return filtered
+
+
 def apply_filters(in_str: str, filters: list) -> str:
-    filtered = in_str
-    for s, mask in filters:
-        if s and mask:
-            filtered = filtered.replace(s, "<Filtered:{}>".format(mask))
-    return filtered
+    return Redactor(filters).redact(in_str)
 
 
 def get_mask(string: str, tag: str, identifier: Optional[str] = None) -> str:
@@ -295,9 +447,7 @@ def _apply_filter_by_message_type(  # noqa: max-complexity
     return msg
 
 
-def filter_tahoe_log_message(message: str, identifier: Optional[str]) -> str:
-    msg = json.loads(message)
-
+def _filter_eliot_message(msg: dict, identifier: Optional[str]) -> dict:
     action_type = msg.get("action_type")
     if action_type:
         _apply_filter_by_action_type(msg, action_type, identifier)
@@ -306,7 +456,12 @@ def filter_tahoe_log_message(message: str, identifier: Optional[str]) -> str:
     if message_type:
         _apply_filter_by_message_type(msg, message_type)
 
-    return json.dumps(msg, sort_keys=True)
+    return msg
+
+
+def filter_tahoe_log_message(message: str, identifier: Optional[str]) -> str:
+    msg = json.loads(message)
+    return json.dumps(_filter_eliot_message(msg, identifier), sort_keys=True)
 
 
 def filter_eliot_logs(
@@ -323,3 +478,59 @@ def join_eliot_logs(messages: list[str]) -> str:
     for message in messages:
         reordered.append(json.dumps(json.loads(message), sort_keys=True))
     return "\n".join(reordered)
+
+
+def dump_eliot_logs(
+    messages: Iterable[Union[str, bytes]],
+    identifier: Optional[str] = None,
+    chunk_size: int = 1024,
+) -> tuple[str, str]:
+    """
+    Serialize eliot log messages both as-is and with sensitive values
+    filtered, decoding each message only once.
+
+    Messages are consumed ``chunk_size`` at a time so that (lazily
+    produced) messages never need to be decoded all at once. Messages
+    that are not valid JSON objects are skipped.
+
+    :returns: A 2-tuple of the unfiltered and filtered messages, each
+        (key-sorted and) joined by newlines, as would be returned by
+        ``join_eliot_logs`` and ``join_eliot_logs(filter_eliot_logs(...))``.
+    """
+    unfiltered_chunks = []
+    filtered_chunks = []
+    skipped = 0
+    iterator = iter(messages)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            break
+        decoded = []
+        for message in chunk:
+            try:
+                msg = json.loads(message)
+            except ValueError:
+                skipped += 1
+                continue
+            if isinstance(msg, dict):
+                decoded.append(msg)
+            else:
+                skipped += 1
+        if not decoded:
+            continue
+        # The filters modify messages in-place so the unfiltered form must
+        # be serialized first.
+        unfiltered_chunks.append(
+            "\n".join(json.dumps(msg, sort_keys=True) for msg in decoded)
+        )
+        filtered_chunks.append(
+            "\n".join(
+                json.dumps(
+                    _filter_eliot_message(msg, identifier), sort_keys=True
+                )
+                for msg in decoded
+            )
+        )
+    if skipped:
+        logging.warning("Skipped %i malformed eliot log messages", skipped)
+    return "\n".join(unfiltered_chunks), "\n".join(filtered_chunks)
@@ -31,15 +31,10 @@ from gridsync import (
     resource,
 )
 from gridsync.desktop import get_clipboard_modes, set_clipboard_text
-from gridsync.filter import (
-    apply_filters,
-    filter_eliot_logs,
-    get_filters,
-    get_mask,
-    join_eliot_logs,
-)
+from gridsync.filter import Redactor, dump_eliot_logs, get_filters, get_mask
 from gridsync.gui.widgets import HSpacer
 from gridsync.msg import error
+from gridsync.util import format_log_record
 
 if TYPE_CHECKING:
     from gridsync.core import Core
@@ -104,9 +99,17 @@ class LogLoader(QObject):
         self.core = core
         self.content = ""
         self.filtered_content = ""
+        self._filters: list = []
+        self._redactor = Redactor([])
 
     def load(self) -> None:
         start_time = time.time()
+        for gateway in self.core.gui.main_window.gateways:
+            logging.debug(
+                'Directory cache stats for "%s": %s',
+                gateway.name,
+                gateway.dircache.stats(),
+            )
         self.content = (
             header
             + "Tahoe-LAFS:   {}\n".format(self.core.tahoe_version)
@@ -116,30 +119,32 @@ class LogLoader(QObject):
             )
             + warning_text
             + "\n----- Beginning of {} debug log -----\n".format(APP_NAME)
-            + "\n".join(self.core.log_deque)
+            + "\n".join(
+                format_log_record(r) for r in list(self.core.log_deque)
+            )
             + "\n----- End of {} debug log -----\n".format(APP_NAME)
         )
         filters = get_filters(self.core)
-        self.filtered_content = apply_filters(self.content, filters)
+        if filters != self._filters:
+            # The compiled filters are re-used until the filters change
+            self._filters = filters
+            self._redactor = Redactor(filters)
+        self.filtered_content = self._redactor.redact(self.content)
         for i, gateway in enumerate(self.core.gui.main_window.gateways):
             gateway_id = str(i + 1)
+            tahoe_log, filtered_tahoe_log = dump_eliot_logs(
+                gateway.iter_streamed_log_messages(), gateway_id
+            )
+            magic_folder_log, filtered_magic_folder_log = dump_eliot_logs(
+                gateway.magic_folder.iter_log_messages(), gateway_id
+            )
             self.content = self.content + log_fmt(
-                gateway.name,
-                join_eliot_logs(gateway.get_streamed_log_messages()),
-                join_eliot_logs(gateway.magic_folder.get_log_messages()),
+                gateway.name, tahoe_log, magic_folder_log
             )
             self.filtered_content = self.filtered_content + log_fmt(
                 get_mask(gateway.name, "GatewayName", gateway_id),
-                join_eliot_logs(
-                    filter_eliot_logs(
-                        gateway.get_streamed_log_messages(), gateway_id
-                    )
-                ),
-                join_eliot_logs(
-                    filter_eliot_logs(
-                        gateway.magic_folder.get_log_messages(), gateway_id
-                    )
-                ),
+                filtered_tahoe_log,
+                filtered_magic_folder_log,
             )
         self.done.emit()
         logging.debug("Loaded logs in %f seconds", time.time() - start_time)
@@ -9,7 +9,7 @@ from collections import defaultdict
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from humanize import naturalsize, naturaltime
+from humanize import naturalsize, naturaltime, precisedelta
 from qtpy.QtCore import QFileInfo, QSize, Qt, Slot
 from qtpy.QtGui import QColor, QIcon, QStandardItem, QStandardItemModel
 from qtpy.QtWidgets import QAction, QFileIconProvider, QToolBar
@@ -36,6 +36,9 @@ class Model(QStandardItemModel):
         self.status_dict: dict[str, MagicFolderStatus] = {}
         self.members_dict: dict[str, list] = {}
         self._magic_folder_errors: defaultdict = defaultdict(dict)
+        # folder_name -> the parts of the tooltip of the folder's name item
+        self._name_tooltips: dict[str, str] = {}
+        self._interval_tooltips: dict[str, str] = {}
         self.setHeaderData(0, Qt.Horizontal, "Name")
         self.setHeaderData(1, Qt.Horizontal, "Status")
         self.setHeaderData(2, Qt.Horizontal, "Last modified")
@@ -63,6 +66,7 @@ class Model(QStandardItemModel):
         self.mf_monitor.folder_removed.connect(self.on_folder_removed)
         self.mf_monitor.folder_mtime_updated.connect(self.set_mtime)
         self.mf_monitor.folder_size_updated.connect(self.set_size)
+        self.mf_monitor.folder_intervals_updated.connect(self.set_intervals)
         self.mf_monitor.backup_added.connect(self.add_remote_folder)
         self.mf_monitor.folder_status_changed.connect(self.set_status)
         self.mf_monitor.error_occurred.connect(self.on_error_occurred)
@@ -129,7 +133,8 @@ class Model(QStandardItemModel):
             return
         composite_pixmap = CompositePixmap(self.icon_folder.pixmap(256, 256))
         name = QStandardItem(QIcon(composite_pixmap), basename)
-        name.setToolTip(path)
+        self._name_tooltips[basename] = path
+        name.setToolTip(self._name_tooltip(basename))
         status = QStandardItem()
         mtime = QStandardItem()
         size = QStandardItem()
@@ -154,6 +159,8 @@ class Model(QStandardItemModel):
 
     def remove_folder(self, folder_name: str) -> None:
         self.gui.systray.remove_operation((self.gateway, folder_name))
+        self._name_tooltips.pop(folder_name, None)
+        self._interval_tooltips.pop(folder_name, None)
         items = self.findItems(folder_name)
         if items:
             self.removeRow(items[0].row())
@@ -175,29 +182,39 @@ class Model(QStandardItemModel):
                 pixmap = CompositePixmap(folder_pixmap)
             items[0].setIcon(QIcon(pixmap))
 
-    def set_status_private(self, folder_name: str) -> None:
-        self.update_folder_icon(folder_name)
+    def _name_tooltip(self, folder_name: str) -> str:
+        tooltip = self._name_tooltips.get(folder_name, folder_name)
+        intervals = self._interval_tooltips.get(folder_name)
+        if intervals:
+            tooltip += "\n\n" + intervals
+        return tooltip
+
+    def _update_name_tooltip(self, folder_name: str) -> None:
         items = self.findItems(folder_name)
         if items:
-            items[0].setToolTip(
-                "{}\n\nThis folder is private; only you can view and\nmodify "
-                "its contents.".format(
-                    self.gateway.magic_folder.get_directory(folder_name)
-                    or folder_name + " (Stored remotely)"
-                )
+            items[0].setToolTip(self._name_tooltip(folder_name))
+
+    def set_status_private(self, folder_name: str) -> None:
+        self.update_folder_icon(folder_name)
+        self._name_tooltips[folder_name] = (
+            "{}\n\nThis folder is private; only you can view and\nmodify "
+            "its contents.".format(
+                self.gateway.magic_folder.get_directory(folder_name)
+                or folder_name + " (Stored remotely)"
             )
+        )
+        self._update_name_tooltip(folder_name)
 
     def set_status_shared(self, folder_name: str) -> None:
         self.update_folder_icon(folder_name, "laptop.png")
-        items = self.findItems(folder_name)
-        if items:
-            items[0].setToolTip(
-                "{}\n\nAt least one other device can view and modify\n"
-                "this folder's contents.".format(
-                    self.gateway.magic_folder.get_directory(folder_name)
-                    or folder_name + " (Stored remotely)"
-                )
+        self._name_tooltips[folder_name] = (
+            "{}\n\nAt least one other device can view and modify\n"
+            "this folder's contents.".format(
+                self.gateway.magic_folder.get_directory(folder_name)
+                or folder_name + " (Stored remotely)"
             )
+        )
+        self._update_name_tooltip(folder_name)
 
     def update_overlay(self, folder_name: str) -> None:
         members = self.members_dict.get(folder_name)
@@ -340,6 +357,18 @@ class Model(QStandardItemModel):
             item.setText(naturalsize(size))
             item.setData(size, Qt.UserRole)
 
+    @Slot(str, int, int)
+    def set_intervals(
+        self, name: str, scan_interval: int, poll_interval: int
+    ) -> None:
+        scan = precisedelta(scan_interval)
+        poll = precisedelta(poll_interval)
+        self._interval_tooltips[name] = (
+            f"Checked for local changes every {scan}\n"
+            f"Checked for remote changes every {poll}"
+        )
+        self._update_name_tooltip(name)
+
     @Slot()
     def update_natural_times(self) -> None:
         for i in range(self.rowCount()):
@@ -359,5 +388,8 @@ class Model(QStandardItemModel):
 
     @Slot(str)
     def on_folder_removed(self, folder_name: str) -> None:
+        # Remote folders are not scanned or polled
+        self._interval_tooltips.pop(folder_name, None)
+        self._update_name_tooltip(folder_name)
         self.set_status(folder_name, MagicFolderStatus.STORED_REMOTELY)
         self.fade_row(folder_name)
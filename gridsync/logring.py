@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Bounded, compressed in-memory storage for (eliot) log messages.
+"""
+from __future__ import annotations
+
+import struct
+import threading
+import zlib
+from collections import deque
+from typing import Iterator, Optional
+
+try:
+    import zstandard
+except ImportError:  # zstd is unavailable; use zlib instead
+    zstandard = None
+
+_LENGTH = struct.Struct(">I")
+
+
+def _compress(data: bytes) -> bytes:
+    if zstandard is not None:
+        return zstandard.ZstdCompressor().compress(data)
+    return zlib.compress(data)
+
+
+def _decompress(data: bytes) -> bytes:
+    if zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def _pack(messages: list[bytes]) -> bytes:
+    return b"".join(_LENGTH.pack(len(m)) + m for m in messages)
+
+
+def _unpack(data: bytes) -> Iterator[bytes]:
+    offset = 0
+    while offset < len(data):
+        (length,) = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        yield data[offset : offset + length]
+        offset += length
+
+
+class LogRing:
+    """
+    A ring buffer of log messages (as bytes) that keeps only the most
+    recent ``maxlen`` messages, like a ``deque(maxlen=maxlen)`` would.
+
+    Incoming messages are grouped into blocks of ``block_size`` messages
+    and each full block is compressed (with zstd, if the ``zstandard``
+    package is available, or zlib otherwise). Since log messages are very
+    repetitive this reduces the memory needed to retain them considerably.
+    The oldest blocks are also dropped whenever the (compressed) size of
+    the buffer exceeds ``max_bytes``.
+
+    Messages may be appended from one thread while being read from another.
+
+    :ivar maxlen: The maximum number of messages to keep (or None for no
+        limit).
+    """
+
+    def __init__(
+        self,
+        maxlen: Optional[int] = None,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,
+        block_size: int = 1024,
+    ) -> None:
+        self.maxlen = maxlen
+        self.max_bytes = max_bytes
+        self.block_size = block_size
+        # (number of messages, compressed messages), oldest first
+        self._blocks: deque[tuple[int, bytes]] = deque()
+        self._blocks_size = 0
+        # The number of messages at the start of the oldest block that have
+        # been evicted (but not yet dropped along with the rest of the block)
+        self._skip = 0
+        self._current: list[bytes] = []
+        self._current_size = 0
+        self._len = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._len
+
+    def append(self, message: bytes) -> None:
+        if self.maxlen == 0:
+            return
+        with self._lock:
+            self._current.append(message)
+            self._current_size += len(message)
+            self._len += 1
+            if len(self._current) >= self.block_size:
+                block = _compress(_pack(self._current))
+                self._blocks.append((len(self._current), block))
+                self._blocks_size += len(block)
+                self._current = []
+                self._current_size = 0
+            self._evict()
+
+    def _drop_oldest_block(self) -> None:
+        count, block = self._blocks.popleft()
+        self._blocks_size -= len(block)
+        self._len -= count - self._skip
+        self._skip = 0
+
+    def _evict(self) -> None:
+        if self.max_bytes is not None:
+            while (
+                self._blocks
+                and self._blocks_size + self._current_size > self.max_bytes
+            ):
+                self._drop_oldest_block()
+        if self.maxlen is None:
+            return
+        while self._len > self.maxlen:
+            excess = self._len - self.maxlen
+            if not self._blocks:
+                del self._current[:excess]
+                self._current_size = sum(len(m) for m in self._current)
+                self._len -= excess
+            elif self._blocks[0][0] - self._skip <= excess:
+                self._drop_oldest_block()
+            else:
+                self._skip += excess
+                self._len -= excess
+
+    def clear(self) -> None:
+        with self._lock:
+            self._blocks.clear()
+            self._blocks_size = 0
+            self._skip = 0
+            self._current = []
+            self._current_size = 0
+            self._len = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        """
+        Iterate over the messages (oldest first) that were in the buffer at
+        the time this was called, decompressing one block at a time.
+        """
+        with self._lock:
+            blocks = list(self._blocks)
+            skip = self._skip
+            current = list(self._current)
+        for _, block in blocks:
+            messages = _unpack(_decompress(block))
+            for i, message in enumerate(messages):
+                if i >= skip:
+                    yield message
+            skip = 0
+        yield from current
+
+    def memory_usage(self) -> int:
+        """
+        Return the (approximate) number of bytes used to store messages.
+        """
+        return self._blocks_size + self._current_size
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent, size-bounded on-disk storage for (eliot) log messages.
+"""
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import IO, Iterator, Optional, Union
+
+_SEGMENT_SUFFIX = ".log"
+
+
+class LogSpool:
+    """
+    A spool of newline-delimited log messages, written to a series of
+    segment files in ``directory``.
+
+    Messages are appended to the current segment by a background thread
+    (so that callers -- e.g., the reactor -- never block on disk I/O). A new
+    segment is started whenever the current one grows beyond
+    ``segment_size`` bytes (or the spool is re-opened) and the oldest
+    segments are deleted whenever the spool as a whole grows beyond
+    ``max_bytes``. Since messages are kept on disk, they survive restarts
+    (and crashes) of the application.
+
+    Messages may be appended from one thread while being read from another.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_bytes: int = 256 * 1024 * 1024,
+        segment_size: int = 8 * 1024 * 1024,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.segment_size = segment_size
+        self._queue: queue.SimpleQueue[
+            Union[bytes, threading.Event, None]
+        ] = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def segments(self) -> list[Path]:
+        """
+        Return the paths of the segment files, oldest first.
+        """
+        try:
+            paths = [
+                p
+                for p in self.directory.iterdir()
+                if p.suffix == _SEGMENT_SUFFIX and p.stem.isdigit()
+            ]
+        except OSError:
+            return []
+        return sorted(paths, key=lambda p: int(p.stem))
+
+    def append(self, message: bytes) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="LogSpool", daemon=True
+                )
+                self._thread.start()
+        self._queue.put(message)
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Wait until all of the messages appended so far have been written.
+
+        :returns: Whether they were written before ``timeout`` elapsed.
+        """
+        with self._lock:
+            if self._thread is None:
+                return True
+            event = threading.Event()
+            self._queue.put(event)
+        return event.wait(timeout)
+
+    def close(self) -> None:
+        """
+        Write any pending messages and stop the writer thread. Appending a
+        message after closing the spool starts a new segment.
+        """
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._thread = None
+            self._queue.put(None)
+        thread.join()
+
+    def _open_segment(self) -> IO[bytes]:
+        self.directory.mkdir(parents=True, exist_ok=True, mode=0o700)
+        segments = self.segments()
+        index = int(segments[-1].stem) + 1 if segments else 0
+        return open(  # pylint: disable=consider-using-with
+            Path(self.directory, f"{index:08d}{_SEGMENT_SUFFIX}"), "ab"
+        )
+
+    def _remove_old_segments(self) -> None:
+        segments = self.segments()
+        sizes = []
+        for path in segments:
+            try:
+                sizes.append(path.stat().st_size)
+            except OSError:
+                sizes.append(0)
+        total = sum(sizes)
+        # Never remove the current (i.e., newest) segment
+        for path, size in zip(segments[:-1], sizes):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError as e:  # E.g., it is being read on Windows
+                logging.warning("Error removing %s: %s", path, str(e))
+                break
+            total -= size
+
+    def _write(self, f: Optional[IO[bytes]], message: bytes) -> IO[bytes]:
+        """
+        Write ``message`` to the current segment ``f``, first starting a
+        new segment if there is none or if ``f`` has grown too large.
+
+        :returns: The segment that was written to.
+        """
+        if f is None or f.tell() >= self.segment_size:
+            if f is not None:
+                f.close()
+            f = self._open_segment()
+            self._remove_old_segments()
+        f.write(message + b"\n")
+        if self._queue.empty():
+            f.flush()
+        return f
+
+    @staticmethod
+    def _flush(f: Optional[IO[bytes]], event: threading.Event) -> None:
+        """
+        Flush the current segment (if any) and signal a pending ``flush``.
+        """
+        if f is not None:
+            try:
+                f.flush()
+            except OSError as e:
+                logging.error("Error flushing log spool: %s", str(e))
+        event.set()
+
+    def _run(self) -> None:
+        f: Optional[IO[bytes]] = None
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            if isinstance(item, threading.Event):
+                self._flush(f, item)
+                continue
+            try:
+                f = self._write(f, item)
+            except OSError as e:
+                logging.error("Error writing to log spool: %s", str(e))
+                if f is not None:
+                    f.close()
+                f = None
+        if f is not None:
+            f.close()
+
+    @staticmethod
+    def _read_segment(path: Path) -> Iterator[bytes]:
+        try:
+            with open(path, "rb") as f:
+                if not os.fstat(f.fileno()).st_size:
+                    return
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                    start = 0
+                    while True:
+                        end = m.find(b"\n", start)
+                        if end == -1:
+                            # Ignore any partially-written message at the end
+                            break
+                        if end > start:
+                            yield m[start:end]
+                        start = end + 1
+        except FileNotFoundError:  # Removed while reading the spool
+            return
+
+    def __iter__(self) -> Iterator[bytes]:
+        """
+        Iterate over the messages in the spool, oldest first, reading each
+        segment via ``mmap``.
+        """
+        self.flush()
+        for path in self.segments():
+            yield from self._read_segment(path)
@@ -3,17 +3,25 @@ from __future__ import annotations
 import json
 import logging
 import os
-from collections import defaultdict, deque
+from collections import defaultdict
 from datetime import datetime
 from enum import Enum, auto
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Union
+from urllib.parse import urlencode
 
+import attr
 import treq
 from qtpy.QtCore import QObject, Signal
 from twisted.internet import reactor
-from twisted.internet.defer import Deferred, DeferredList
-from twisted.internet.task import deferLater
+from twisted.internet.defer import (
+    Deferred,
+    DeferredList,
+    DeferredSemaphore,
+    succeed,
+)
+from twisted.internet.task import LoopingCall
+from twisted.python.failure import Failure
 
 if TYPE_CHECKING:
     from qtpy.QtCore import SignalInstance
@@ -23,12 +31,22 @@ if TYPE_CHECKING:
 from gridsync import APP_NAME
 from gridsync.capabilities import diminish
 from gridsync.crypto import randstr
+from gridsync.logring import LogRing
+from gridsync.logspool import LogSpool
 from gridsync.msg import critical
 from gridsync.supervisor import Supervisor
 from gridsync.system import SubprocessProtocol, which
+from gridsync.util import PathTrie
 from gridsync.watchdog import Watchdog
 from gridsync.websocket import WebSocketReaderService
 
+# The shortest and longest intervals (in seconds) at which magic-folders
+# are scanned for local changes and polled for remote ones; new folders are
+# configured with the latter and are then scanned/polled more often by
+# MagicFolderMonitor while they are active (see AdaptiveIntervals)
+MIN_INTERVAL = 10
+MAX_INTERVAL = 600
+
 
 class MagicFolderError(Exception):
     pass
@@ -55,6 +73,210 @@ class MagicFolderStatus(Enum):
     WAITING = auto()
 
 
+class FileStatusIndex:
+    """
+    The file statuses of a single magic-folder (as returned by
+    ``MagicFolder.get_file_status``) as of the last check, keyed by relpath.
+
+    The absolute path of each file is resolved only once -- when its
+    relpath is first seen -- rather than on every check.
+    """
+
+    def __init__(self, magic_path: str) -> None:
+        self.magic_path = magic_path
+        self.files: dict[str, dict] = {}
+        self.total_size: int = 0
+        self.latest_mtime: int = 0
+        self._paths: dict[str, str] = {}
+
+    def update(
+        self, file_status: list[dict]
+    ) -> tuple[list[dict], list[tuple[dict, bool, bool]], list[dict]]:
+        """
+        Replace the indexed file statuses with those in ``file_status``.
+
+        :returns: The statuses of the files that were added; those of the
+            files that were modified (each along with whether its mtime
+            and/or its size changed); and those of the files that were
+            removed.
+        """
+        previous = self.files
+        files: dict[str, dict] = {}
+        added: list[dict] = []
+        modified: list[tuple[dict, bool, bool]] = []
+        total_size = 0
+        latest_mtime = 0
+        for item in file_status:
+            relpath = item.get("relpath", "")
+            path = self._paths.get(relpath)
+            if path is None:
+                path = str(Path(self.magic_path, relpath).resolve())
+                self._paths[relpath] = path
+            item["path"] = path
+            files[relpath] = item
+            total_size += int(item.get("size") or 0)  # XXX None if deleted
+            mtime = item.get("last-updated", 0)
+            if mtime > latest_mtime:
+                latest_mtime = mtime
+            prev_item = previous.get(relpath)
+            if prev_item is None:
+                added.append(item)
+                continue
+            mtime_changed = item.get("mtime") != prev_item.get("mtime", 0)
+            size_changed = item.get("size") != prev_item.get("size", 0)
+            if mtime_changed or size_changed:
+                modified.append((item, mtime_changed, size_changed))
+        removed: list[dict] = []
+        for relpath, item in previous.items():
+            if relpath not in files:
+                removed.append(item)
+                self._paths.pop(relpath, None)
+        self.files = files
+        self.total_size = total_size
+        self.latest_mtime = latest_mtime
+        return added, modified, removed
+
+
+@attr.s
+class _Schedule:
+    """
+    :ivar interval: The current interval, in seconds.
+
+    :ivar configured: The interval that magic-folder itself was configured
+        with (and so the longest interval that will be used).
+
+    :ivar due: The time at which the next scan or poll is due.
+
+    :ivar active: Whether activity has been seen since the last scan or poll.
+    """
+
+    interval: int = attr.ib()
+    configured: int = attr.ib()
+    due: float = attr.ib()
+    active: bool = attr.ib(default=False)
+
+
+class AdaptiveIntervals:
+    """
+    Per-folder scan and poll intervals that adapt to each folder's activity.
+
+    Local activity in a folder (e.g., many files being changed at once)
+    shortens its scan interval to ``minimum`` and remote activity (e.g.,
+    files being downloaded) shortens its poll interval likewise. Each time
+    a folder's scan (or poll) comes due without any activity having been
+    seen since the last one, the interval is doubled, up to the interval
+    that magic-folder itself was configured with for that folder (or
+    ``maximum``, if that is lower). Folders start out at ``initial``.
+    """
+
+    def __init__(
+        self,
+        minimum: int = MIN_INTERVAL,
+        maximum: int = MAX_INTERVAL,
+        initial: int = 60,
+    ) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self.initial = initial
+        self._scans: dict[str, _Schedule] = {}
+        self._polls: dict[str, _Schedule] = {}
+
+    def _clamp(self, interval: int) -> int:
+        return max(min(interval, self.maximum), self.minimum)
+
+    def add_folder(
+        self,
+        folder_name: str,
+        scan_interval: int,
+        poll_interval: int,
+        now: float,
+    ) -> None:
+        for schedules, configured in (
+            (self._scans, self._clamp(scan_interval)),
+            (self._polls, self._clamp(poll_interval)),
+        ):
+            interval = min(self.initial, configured)
+            schedules[folder_name] = _Schedule(
+                interval, configured, now + interval
+            )
+
+    def remove_folder(self, folder_name: str) -> None:
+        self._scans.pop(folder_name, None)
+        self._polls.pop(folder_name, None)
+
+    def folders(self) -> list[str]:
+        return list(self._scans)
+
+    def get_intervals(self, folder_name: str) -> tuple[int, int]:
+        return (
+            self._scans[folder_name].interval,
+            self._polls[folder_name].interval,
+        )
+
+    def _record(
+        self, schedules: dict[str, _Schedule], folder_name: str
+    ) -> bool:
+        schedule = schedules.get(folder_name)
+        if schedule is None:
+            return False
+        schedule.active = True
+        if schedule.interval == self.minimum:
+            return False
+        schedule.due = schedule.due - schedule.interval + self.minimum
+        schedule.interval = self.minimum
+        return True
+
+    def record_local_activity(self, folder_name: str) -> bool:
+        """
+        Note that local changes were made in the given folder.
+
+        :returns: Whether the folder's scan interval changed as a result.
+        """
+        return self._record(self._scans, folder_name)
+
+    def record_remote_activity(self, folder_name: str) -> bool:
+        """
+        Note that remote changes were made to the given folder.
+
+        :returns: Whether the folder's poll interval changed as a result.
+        """
+        return self._record(self._polls, folder_name)
+
+    @staticmethod
+    def _advance(
+        schedules: dict[str, _Schedule], minimum: int, now: float
+    ) -> tuple[list[str], set[str]]:
+        due = []
+        changed = set()
+        for folder_name, schedule in schedules.items():
+            if now < schedule.due:
+                continue
+            if schedule.interval < schedule.configured:
+                # Otherwise, magic-folder will do it on its own
+                due.append(folder_name)
+            if schedule.active:
+                interval = minimum
+            else:
+                interval = min(schedule.interval * 2, schedule.configured)
+            if interval != schedule.interval:
+                changed.add(folder_name)
+            schedule.interval = interval
+            schedule.due = now + interval
+            schedule.active = False
+        return due, changed
+
+    def advance(self, now: float) -> tuple[list[str], list[str], set[str]]:
+        """
+        Adjust the intervals of all folders whose scans or polls are due.
+
+        :returns: The folders that should be scanned, those that should be
+            polled, and those whose intervals changed.
+        """
+        to_scan, scans_changed = self._advance(self._scans, self.minimum, now)
+        to_poll, polls_changed = self._advance(self._polls, self.minimum, now)
+        return to_scan, to_poll, scans_changed | polls_changed
+
+
 class MagicFolderMonitor(QObject):
 
     status_message_received = Signal(dict)
@@ -74,6 +296,8 @@ class MagicFolderMonitor(QObject):
     folder_mtime_updated = Signal(str, int)  # folder_name, mtime
     folder_size_updated = Signal(str, object)  # folder_name, size
     folder_status_changed = Signal(str, object)  # folder_name, status
+    # folder_name, scan_interval, poll_interval
+    folder_intervals_updated = Signal(str, int, int)
 
     backup_added = Signal(str)  # folder_name
     backup_removed = Signal(str)  # folder_name
@@ -96,10 +320,20 @@ class MagicFolderMonitor(QObject):
         self.errors: list = []
 
         self._prev_state: dict = {}
+        # The operations parsed from `_prev_state`, kept so that each new
+        # state only needs to be compared against -- not re-parsed
+        self._prev_uploads: defaultdict[str, dict] = defaultdict(dict)
+        self._prev_downloads: defaultdict[str, dict] = defaultdict(dict)
         self._known_folders: dict[str, dict] = {}
         self._known_backups: list[str] = []
 
         self._folder_sizes: dict[str, int] = {}
+        self._file_indexes: dict[str, FileStatusIndex] = {}
+        # Folders whose file status has (probably) changed since the last
+        # check, according to the status messages received since then
+        self._dirty_folders: set[str] = set()
+        # Whether folders have been added or removed since the last check
+        self._folders_changed: bool = False
         self._folder_statuses: dict[str, MagicFolderStatus] = {}
         self._total_folders_size: int = 0
 
@@ -107,36 +341,152 @@ class MagicFolderMonitor(QObject):
         self._operations_completed: defaultdict[str, dict] = defaultdict(dict)
 
         self._watchdog = Watchdog()
-        self._watchdog.path_modified.connect(self._schedule_magic_folder_scan)
-        self._scheduled_scans: defaultdict[str, set] = defaultdict(set)
+        # The maximum number of changed files to snapshot individually;
+        # larger batches of changes result in a full scan of the folder
+        self.snapshot_threshold: int = 20
+        self._watchdog.paths_modified.connect(self._on_paths_modified)
         self._scheduled_polls: defaultdict[str, set] = defaultdict(set)
 
+        self.intervals = AdaptiveIntervals()
+        self._intervals_timer = LoopingCall(self._check_intervals)
+        self.download_started.connect(self._on_remote_activity)
+
         self._overall_status: MagicFolderStatus = MagicFolderStatus.LOADING
 
-    # XXX The `_maybe_do_...` functions could probably be refactored to
-    # duplicate less
-    def _maybe_do_scan(self, event_id: str, path: str) -> None:
-        try:
-            self._scheduled_scans[path].remove(event_id)
-        except KeyError:
-            pass
-        if self._scheduled_scans[path]:
+    async def _snapshot_local_changes(
+        self,
+        folder_name: str,
+        magic_path: str,
+        relpaths: list[str],
+        directories_changed: bool,
+    ) -> None:
+        """
+        Snapshot the given (changed) files individually or, if there are
+        too many of them -- or if changes were made that can't be handled
+        with per-file snapshots (i.e., directories were moved or deleted,
+        or a file was deleted) -- scan the whole folder instead.
+        """
+        if directories_changed or len(relpaths) > self.snapshot_threshold:
+            await self.magic_folder.scan(folder_name)
             return
-        for folder_name, data in self.magic_folder.magic_folders.items():
-            magic_path = data.get("magic_path", "")
-            if not magic_path:
+        files = []
+        for relpath in relpaths:
+            if relpath == os.curdir or relpath.startswith(os.pardir):
                 continue
-            if path == magic_path or path.startswith(magic_path + os.sep):
-                # XXX Something should handle errors
-                Deferred.fromCoroutine(self.magic_folder.scan(folder_name))
+            path = os.path.join(magic_path, relpath)
+            if os.path.isfile(path):
+                files.append(relpath)
+            elif os.path.isdir(path):
+                # Only the directory's mtime changed; any changes to its
+                # contents are reported separately
+                continue
+            else:
+                # The file was deleted (or moved away). Since the file
+                # status index may be stale, let magic-folder determine
+                # whether it had ever been snapshotted.
+                await self.magic_folder.scan(folder_name)
+                return
+        for relpath in files:
+            try:
+                await self.magic_folder.add_snapshot(folder_name, relpath)
+            except MagicFolderWebError as e:
+                logging.warning(
+                    "Error snapshotting %s; scanning instead: %s",
+                    relpath,
+                    str(e),
+                )
+                await self.magic_folder.scan(folder_name)
+                return
+
+    def _on_paths_modified(
+        self, path: str, relpaths: list[str], directories_changed: bool
+    ) -> None:
+        logging.debug("%i path(s) modified in %s", len(relpaths), path)
+        match = self.magic_folder.get_folder_for_path(path)
+        if match is None:
+            return
+        folder_name, _ = match
+        magic_path = self.magic_folder.get_directory(folder_name)
+        folder_relpaths = []
+        for relpath in relpaths:
+            match = self.magic_folder.get_folder_for_path(
+                os.path.join(path, relpath)
+            )
+            # Changes inside a nested magic-folder are handled by the watch
+            # on that folder
+            if match and match[0] == folder_name:
+                folder_relpaths.append(match[1] or os.curdir)
+        # Changes that are snapshotted individually need no further scans;
+        # only larger batches (which may well continue -- e.g., while an
+        # archive is being extracted) make the folder worth scanning often
+        if (
+            directories_changed
+            or len(folder_relpaths) > self.snapshot_threshold
+        ):
+            self._on_local_activity(folder_name)
+        # XXX Something should handle errors
+        Deferred.fromCoroutine(
+            self._snapshot_local_changes(
+                folder_name, magic_path, folder_relpaths, directories_changed
+            )
+        )
 
-    def _schedule_magic_folder_scan(self, path: str) -> None:
-        event_id = randstr(8)
-        self._scheduled_scans[path].add(event_id)
-        reactor.callLater(  # type: ignore
-            0.25, lambda: self._maybe_do_scan(event_id, path)
+    def _emit_intervals(self, folder_name: str) -> None:
+        scan_interval, poll_interval = self.intervals.get_intervals(
+            folder_name
+        )
+        self.folder_intervals_updated.emit(
+            folder_name, scan_interval, poll_interval
+        )
+
+    def _on_local_activity(self, folder_name: str, *_: object) -> None:
+        if self.intervals.record_local_activity(folder_name):
+            self._emit_intervals(folder_name)
+
+    def _on_remote_activity(self, folder_name: str, *_: object) -> None:
+        if self.intervals.record_remote_activity(folder_name):
+            self._emit_intervals(folder_name)
+
+    def _update_interval_folders(self, now: float) -> None:
+        folders = self.magic_folder.magic_folders
+        known = set(self.intervals.folders())
+        for folder_name in known - set(folders):
+            self.intervals.remove_folder(folder_name)
+        for folder_name, data in folders.items():
+            if folder_name not in known:
+                self.intervals.add_folder(
+                    folder_name,
+                    data.get("scan_interval") or self.intervals.maximum,
+                    data.get("poll_interval") or self.intervals.maximum,
+                    now,
+                )
+                self._emit_intervals(folder_name)
+
+    @staticmethod
+    def _log_interval_error(failure: Failure, folder_name: str) -> None:
+        logging.warning(
+            "Error checking %s for changes: %s",
+            folder_name,
+            failure.getErrorMessage(),
         )
 
+    def _check_intervals(self) -> None:
+        """
+        Scan or poll any folders whose (adaptive) intervals have elapsed,
+        adjusting their intervals according to their recent activity.
+        """
+        now = reactor.seconds()  # type: ignore
+        self._update_interval_folders(now)
+        to_scan, to_poll, changed = self.intervals.advance(now)
+        for folder_name in to_scan:
+            d = Deferred.fromCoroutine(self.magic_folder.scan(folder_name))
+            d.addErrback(self._log_interval_error, folder_name)
+        for folder_name in to_poll:
+            d = Deferred.fromCoroutine(self.magic_folder.poll(folder_name))
+            d.addErrback(self._log_interval_error, folder_name)
+        for folder_name in changed:
+            self._emit_intervals(folder_name)
+
     def _maybe_do_poll(self, event_id: str, folder_name: str) -> None:
         try:
             self._scheduled_polls[folder_name].remove(event_id)
@@ -193,8 +543,9 @@ class MagicFolderMonitor(QObject):
         started_signal: SignalInstance,
     ) -> None:
         for folder, operation in current_operations.items():
+            previous = previous_operations.get(folder, {})
             for relpath, data in operation.items():
-                if relpath not in previous_operations[folder]:
+                if relpath not in previous:
                     self._operations_queued[folder].add(relpath)
                     started_signal.emit(folder, relpath, data)
 
@@ -205,12 +556,32 @@ class MagicFolderMonitor(QObject):
         finished_signal: SignalInstance,
     ) -> None:
         for folder, operation in previous_operations.items():
+            current = current_operations.get(folder, {})
             for relpath, data in operation.items():
-                if relpath not in current_operations[folder]:
+                if relpath not in current:
                     # XXX: Confirm in "recent" list?
                     self._operations_completed[folder][relpath] = data
+                    self._dirty_folders.add(folder)
                     finished_signal.emit(folder, relpath, data)
 
+    def _check_dirty_folders(
+        self, current_state: dict, previous_state: dict
+    ) -> None:
+        current_folders = current_state.get("folders", {})
+        previous_folders = previous_state.get("folders", {})
+        if current_folders.keys() != previous_folders.keys():
+            self._folders_changed = True
+        for folder, data in current_folders.items():
+            prev_data = previous_folders.get(folder)
+            if (
+                prev_data is None
+                or data.get("scanner", {}).get("last-scan")
+                != prev_data.get("scanner", {}).get("last-scan")
+                or data.get("poller", {}).get("last-poll")
+                != prev_data.get("poller", {}).get("last-poll")
+            ):
+                self._dirty_folders.add(folder)
+
     def _parse_folder_statuses(self, state: dict) -> dict:
         folder_statuses = {}
         for folder, data in state.get("folders", {}).items():
@@ -247,21 +618,37 @@ class MagicFolderMonitor(QObject):
         if status != self._overall_status:
             self._overall_status = status
             self.overall_status_changed.emit(status)
+            dirty_folders = self._dirty_folders
+            self._dirty_folders = set()
             # XXX Something should wait on the result
             Deferred.fromCoroutine(
-                self.do_check()
+                self.do_check(dirty_folders)
             )  # Update folder sizes, mtimes
 
     def compare_states(
-        self, current_state: dict, previous_state: dict
+        self, current_state: dict, previous_state: Optional[dict] = None
     ) -> None:
+        """
+        Compare the given state against the previous one, emitting signals
+        for any differences.
+
+        If ``previous_state`` is omitted (or is the state that was last
+        compared), the operations that were parsed from it last time are
+        re-used instead of parsing it again.
+        """
+        if previous_state is None or previous_state is self._prev_state:
+            previous_state = self._prev_state
+            previous_uploads = self._prev_uploads
+            previous_downloads = self._prev_downloads
+        else:
+            previous_uploads, previous_downloads = self._parse_operations(
+                previous_state
+            )
         self._check_errors(current_state, previous_state)
+        self._check_dirty_folders(current_state, previous_state)
         current_uploads, current_downloads = self._parse_operations(
             current_state
         )
-        previous_uploads, previous_downloads = self._parse_operations(
-            previous_state
-        )
         self._check_operations_started(
             current_uploads, previous_uploads, self.upload_started
         )
@@ -278,7 +665,9 @@ class MagicFolderMonitor(QObject):
             current = len(self._operations_completed[folder])
             total = len(self._operations_queued[folder])
             self.sync_progress_updated.emit(folder, current, total)
-            if not current_uploads[folder] and not current_downloads[folder]:
+            if not (
+                current_uploads.get(folder) or current_downloads.get(folder)
+            ):
                 updated_files = list(self._operations_completed[folder])
                 try:
                     del self._operations_completed[folder]
@@ -289,6 +678,9 @@ class MagicFolderMonitor(QObject):
                 except KeyError:
                     pass
                 self.files_updated.emit(folder, updated_files)
+        self._prev_state = current_state
+        self._prev_uploads = current_uploads
+        self._prev_downloads = current_downloads
         folder_statuses = self._parse_folder_statuses(current_state)
         self._check_folder_statuses(folder_statuses)
         self._check_overall_status(folder_statuses)
@@ -332,64 +724,33 @@ class MagicFolderMonitor(QObject):
             if backup not in current_backups:
                 self.backup_removed.emit(backup)
 
-    @staticmethod
-    def _parse_file_status(
-        file_status: list[dict], magic_path: str
-    ) -> tuple[dict[str, dict], list[int], int, int]:
-        files = {}
-        sizes = []
-        latest_mtime = 0
-        for item in file_status:
-            relpath = item.get("relpath", "")
-            item["path"] = str(Path(magic_path, relpath).resolve())
-            files[relpath] = item
-            size = int(item.get("size") or 0)  # XXX "size" is None if deleted
-            sizes.append(size)
-            mtime = item.get("last-updated", 0)
-            if mtime > latest_mtime:
-                latest_mtime = mtime
-        total_size = sum(sizes)
-        return files, sizes, total_size, latest_mtime
-
     def _compare_file_status(
-        self,
-        folder_name: str,
-        magic_path: str,
-        file_status: list[dict],
-        previous_file_status: list[dict],
+        self, folder_name: str, magic_path: str, file_status: list[dict]
     ) -> None:
-        current = self._parse_file_status(file_status, magic_path)
-        current_files, _, current_total_size, current_latest_mtime = current
-        previous = self._parse_file_status(previous_file_status, magic_path)
-        prev_files, _, prev_total_size, prev_latest_mtime = previous
-
-        for file, status in current_files.items():
-            if file not in prev_files:
-                self.file_added.emit(folder_name, status)
-            else:
-                prev_status = prev_files.get(file, {})
-                prev_size = prev_status.get("size", 0)
-                prev_mtime = prev_status.get("mtime", 0)
-                size = status.get("size")
-                mtime = status.get("mtime")
-                modified = False
-                if mtime != prev_mtime:
-                    modified = True
-                    self.file_mtime_updated.emit(folder_name, status)
-                if size != prev_size:
-                    modified = True
-                    self.file_size_updated.emit(folder_name, status)
-                if modified:
-                    self.file_modified.emit(folder_name, status)
-        for file, status in prev_files.items():
-            if file not in prev_files:
-                self.file_removed.emit(folder_name, status)
-        if current_total_size != prev_total_size:
-            self.folder_size_updated.emit(folder_name, current_total_size)
-        if current_latest_mtime != prev_latest_mtime:
-            self.folder_mtime_updated.emit(folder_name, current_latest_mtime)
-
-        self._folder_sizes[folder_name] = current_total_size
+        index = self._file_indexes.get(folder_name)
+        if index is None or index.magic_path != magic_path:
+            index = FileStatusIndex(magic_path)
+            self._file_indexes[folder_name] = index
+        prev_total_size = index.total_size
+        prev_latest_mtime = index.latest_mtime
+
+        added, modified, removed = index.update(file_status)
+        for status in added:
+            self.file_added.emit(folder_name, status)
+        for status, mtime_changed, size_changed in modified:
+            if mtime_changed:
+                self.file_mtime_updated.emit(folder_name, status)
+            if size_changed:
+                self.file_size_updated.emit(folder_name, status)
+            self.file_modified.emit(folder_name, status)
+        for status in removed:
+            self.file_removed.emit(folder_name, status)
+        if index.total_size != prev_total_size:
+            self.folder_size_updated.emit(folder_name, index.total_size)
+        if index.latest_mtime != prev_latest_mtime:
+            self.folder_mtime_updated.emit(folder_name, index.latest_mtime)
+
+        self._folder_sizes[folder_name] = index.total_size
 
     def _check_total_folders_size(self) -> None:
         total = sum(self._folder_sizes.values())
@@ -397,15 +758,15 @@ class MagicFolderMonitor(QObject):
             self._total_folders_size = total
             self.total_folders_size_updated.emit(total)
 
-    def compare_files(
-        self, current_folders: dict, previous_folders: dict
-    ) -> None:
+    def compare_files(self, current_folders: dict) -> None:
+        for folder_name in list(self._file_indexes):
+            if folder_name not in current_folders:
+                del self._file_indexes[folder_name]
         for folder_name, data in current_folders.items():
+            if "file_status" not in data:
+                continue  # The file status could not be retrieved
             self._compare_file_status(
-                folder_name,
-                data.get("magic_path", ""),
-                data.get("file_status", []),
-                previous_folders.get(folder_name, {}).get("file_status", []),
+                folder_name, data.get("magic_path", ""), data["file_status"]
             )
         self._check_total_folders_size()
 
@@ -418,9 +779,8 @@ class MagicFolderMonitor(QObject):
         data = json.loads(msg)
         self.status_message_received.emit(data)
         state = data.get("state")
-        self.compare_states(state, self._prev_state)
+        self.compare_states(state)
         self._check_last_polls(state)
-        self._prev_state = state
 
     async def _get_file_status(
         self, folder_name: str
@@ -428,26 +788,50 @@ class MagicFolderMonitor(QObject):
         result = await self.magic_folder.get_file_status(folder_name)
         return (folder_name, result)
 
-    async def do_check(self) -> None:
-        folders = await self.magic_folder.get_folders()
-        current_folders = dict(folders)
-        previous_folders = dict(self._known_folders)
-        self.compare_folders(current_folders, previous_folders)
-        self._known_folders = current_folders
-
-        backups = await self.magic_folder.get_folder_backups()
-        if backups is None:
-            logging.warning("Could not read Magic-Folder backups during check")
+    async def do_check(self, folders: Optional[Iterable[str]] = None) -> None:
+        """
+        Check for changes to the list of magic-folders, to their backups,
+        and to the statuses of the files inside them.
+
+        :param folders: The names of the folders whose file statuses should
+            be refreshed. If ``None``, everything is refreshed. Otherwise,
+            the lists of folders and backups are re-read only if folders
+            have been added or removed since the last check, and the file
+            statuses of all other folders are left as they were.
+        """
+        if folders is None or self._folders_changed:
+            self._folders_changed = False
+            current_folders = dict(await self.magic_folder.get_folders())
+            previous_folders = dict(self._known_folders)
+            self.compare_folders(current_folders, previous_folders)
+            self._known_folders = current_folders
+
+            backups = await self.magic_folder.get_folder_backups()
+            if backups is None:
+                logging.warning(
+                    "Could not read Magic-Folder backups during check"
+                )
+            else:
+                current_backups = list(backups)
+                previous_backups = list(self._known_backups)
+                self.compare_backups(current_backups, previous_backups)
+                self._known_backups = current_backups
+            if folders is None:
+                refresh = set(current_folders)
+            else:
+                added = set(current_folders) - set(previous_folders)
+                refresh = (set(folders) | added) & set(current_folders)
         else:
-            current_backups = list(backups)
-            previous_backups = list(self._known_backups)
-            self.compare_backups(current_backups, previous_backups)
-            self._known_backups = current_backups
+            current_folders = {}
+            for name, data in self._known_folders.items():
+                current_folders[name] = dict(data)
+                current_folders[name].pop("file_status", None)
+            refresh = set(folders) & set(current_folders)
 
         results = await DeferredList(
             [
                 Deferred.fromCoroutine(self._get_file_status(f))
-                for f in current_folders
+                for f in refresh
             ],
             consumeErrors=True,
         )
@@ -455,7 +839,8 @@ class MagicFolderMonitor(QObject):
             if success:  # XXX
                 folder_name, file_status = result
                 current_folders[folder_name]["file_status"] = file_status
-        self.compare_files(current_folders, previous_folders)
+        # Folders without a (new) "file_status" are skipped by compare_files
+        self.compare_files(current_folders)
         self._known_folders = current_folders
 
     def start(self) -> None:
@@ -469,6 +854,8 @@ class MagicFolderMonitor(QObject):
         )
         self._ws_reader.start()
         self._watchdog.start()
+        if not self._intervals_timer.running:
+            self._intervals_timer.start(5, now=False)
         self.running = True
         # XXX Something should wait on the result
         Deferred.fromCoroutine(self.do_check())
@@ -476,6 +863,8 @@ class MagicFolderMonitor(QObject):
     def stop(self) -> None:
         self.running = False
         self._watchdog.stop()
+        if self._intervals_timer.running:
+            self._intervals_timer.stop()
         if self._ws_reader:
             self._ws_reader.stop()
             self._ws_reader = None
@@ -487,21 +876,33 @@ class MagicFolder:
         gateway: Tahoe,
         executable: Optional[str] = "",
         logs_maxlen: Optional[int] = 1000000,
+        log_spool: Optional[LogSpool] = None,
     ) -> None:
         self.gateway = gateway
         self.executable = executable
-        self._log_buffer: deque[bytes] = deque(maxlen=logs_maxlen)
+        self._log_buffer: Union[LogRing, LogSpool] = (
+            log_spool if log_spool is not None else LogRing(maxlen=logs_maxlen)
+        )
 
         self.configdir = Path(gateway.nodedir, "private", "magic-folder")
         self.api_port: int = 0
         self.api_token: str = ""
         self.monitor = MagicFolderMonitor(self)
         self.magic_folders: dict[str, dict] = {}
+        self._path_trie = PathTrie()
         self.remote_magic_folders: dict[str, dict] = {}
         self.rootcap_manager = gateway.rootcap_manager
         self.supervisor: Supervisor = Supervisor(
             pidfile=Path(self.configdir, f"{APP_NAME}-magic-folder.pid")
         )
+        self.running: bool = False
+        self._running_waiters: list[Deferred[None]] = []
+        # folder_name -> sizes of that folder's Tahoe-LAFS objects
+        self._object_sizes: dict[str, list[int]] = {}
+        # folder_name -> number of times its cached sizes were invalidated
+        self._object_sizes_generation: dict[str, int] = {}
+        self.monitor.files_updated.connect(self._invalidate_object_sizes)
+        self.monitor.folder_size_updated.connect(self._invalidate_object_sizes)
 
     @staticmethod
     def on_stdout_line_received(line: str) -> None:
@@ -509,17 +910,14 @@ class MagicFolder:
 
     @staticmethod
     def _is_eliot_log_message(s: str) -> bool:
-        try:
-            data = json.loads(s)
-        except json.decoder.JSONDecodeError:
-            return False
-        if (
-            isinstance(data, dict)
-            and "timestamp" in data
-            and "task_uuid" in data
-        ):
-            return True
-        return False
+        # A cheap check of the shape of the line; the line is never parsed
+        # here, so consumers of the log buffer must handle malformed JSON.
+        return (
+            s.startswith("{")
+            and s.rstrip().endswith("}")
+            and '"task_uuid"' in s
+            and '"timestamp"' in s
+        )
 
     def on_stderr_line_received(self, line: str) -> None:
         if self._is_eliot_log_message(line):
@@ -528,8 +926,18 @@ class MagicFolder:
             logging.error("[magic-folder:stderr] %s", line)
 
     def get_log_messages(self) -> list:
+        """
+        Return the buffered eliot messages. These have only had their shape
+        checked (by ``_is_eliot_log_message``), not been parsed, so some
+        may turn out not to be valid JSON.
+        """
         return list(msg.decode("utf-8") for msg in list(self._log_buffer))
 
+    def iter_log_messages(self) -> Iterator[bytes]:
+        # Unlike get_log_messages, this doesn't decode the buffered
+        # messages; consumers (e.g., dump_eliot_logs) parse them anyway.
+        return iter(self._log_buffer)
+
     def _base_command_args(self) -> list[str]:
         if not self.executable:
             self.executable = which("magic-folder")
@@ -555,8 +963,11 @@ class MagicFolder:
         return output
 
     async def stop(self) -> None:
+        self.running = False
         self.monitor.stop()
         await self.supervisor.stop()
+        if isinstance(self._log_buffer, LogSpool):
+            self._log_buffer.close()
 
     def _read_api_token(self) -> str:
         p = Path(self.configdir, "api_token")
@@ -588,10 +999,20 @@ class MagicFolder:
             ) from e
         return port
 
+    def _on_starting(self) -> None:
+        # Called before the supervised process is (re)started; any requests
+        # made from now on should wait for the new process to come up.
+        self.running = False
+
     def _on_started(self) -> None:
         self.api_token = self._read_api_token()
         self.api_port = self._read_api_port()
         self.monitor.start()
+        self.running = True
+        waiters = self._running_waiters
+        self._running_waiters = []
+        for d in waiters:
+            d.callback(None)
 
     async def start(self) -> None:
         logging.debug("Starting magic-folder...")
@@ -611,6 +1032,7 @@ class MagicFolder:
                 started_trigger="Completed initial Magic Folder setup",
                 stdout_line_collector=self.on_stdout_line_received,
                 stderr_line_collector=self.on_stderr_line_received,
+                call_before_start=self._on_starting,
                 call_after_start=self._on_started,
             )
         except Exception as exc:  # pylint: disable=broad-except
@@ -624,9 +1046,17 @@ class MagicFolder:
             )
         logging.debug("Started magic-folder")
 
-    async def await_running(self) -> None:
-        while not self.monitor.running:  # XXX
-            await deferLater(reactor, 0.2, lambda: None)  # type: ignore
+    def await_running(self) -> Deferred[None]:
+        """
+        Wait until the Magic-Folder process has started and its API is
+        available. All callers share the same wakeup: they resume as soon as
+        the (re)started process has been set up by ``_on_started``.
+        """
+        if self.running:
+            return succeed(None)
+        d: Deferred[None] = Deferred()
+        self._running_waiters.append(d)
+        return d
 
     async def _request(
         self,
@@ -635,12 +1065,12 @@ class MagicFolder:
         body: bytes = b"",
         error_404_ok: bool = False,
     ) -> JSON:
-        await self.await_running()  # XXX
+        await self.await_running()
         if not self.api_token:
             raise MagicFolderWebError("API token not found")
         if not self.api_port:
             raise MagicFolderWebError("API port not found")
-        resp = await treq.request(
+        resp = await self.gateway.http.request(
             method,
             f"http://127.0.0.1:{self.api_port}/v1{path}",
             headers={"Authorization": f"Bearer {self.api_token}"},
@@ -659,6 +1089,7 @@ class MagicFolder:
         )
         if isinstance(folders, dict):
             self.magic_folders = folders
+            self._update_path_trie()
             return folders
 
         raise TypeError(
@@ -670,8 +1101,8 @@ class MagicFolder:
         path: str,
         author: str,
         name: Optional[str] = "",
-        poll_interval: int = 60,
-        scan_interval: int = 60,
+        poll_interval: int = MAX_INTERVAL,
+        scan_interval: int = MAX_INTERVAL,
     ) -> None:
         p = Path(path)
         p.mkdir(parents=True, exist_ok=True)
@@ -702,6 +1133,26 @@ class MagicFolder:
             del self.magic_folders[folder_name]
         except KeyError:
             pass
+        self._update_path_trie()
+        self._invalidate_object_sizes(folder_name)
+
+    def _update_path_trie(self) -> None:
+        self._path_trie = PathTrie(
+            {
+                data["magic_path"]: name
+                for name, data in self.magic_folders.items()
+                if data.get("magic_path")
+            }
+        )
+
+    def get_folder_for_path(self, path: str) -> Optional[tuple[str, str]]:
+        """
+        Find the (innermost) local magic-folder that contains ``path``.
+
+        :returns: The name of the folder along with ``path`` relative to
+            the folder's root, or ``None`` if no folder contains ``path``.
+        """
+        return self._path_trie.lookup(path)
 
     def get_directory(self, folder_name: str) -> str:
         return self.magic_folders.get(folder_name, {}).get("magic_path", "")
@@ -732,10 +1183,11 @@ class MagicFolder:
         except KeyError:
             await self.get_folders()
             magic_path = self.magic_folders[folder_name]["magic_path"]
-        if filepath.startswith(magic_path):
-            filepath = filepath[len(magic_path) + len(os.sep) :]
+        if os.path.isabs(filepath):
+            filepath = os.path.relpath(filepath, magic_path)
+        query = urlencode({"path": Path(filepath).as_posix()})
         await self._request(
-            "POST", f"/magic-folder/{folder_name}/snapshot?path={filepath}"
+            "POST", f"/magic-folder/{folder_name}/snapshot?{query}"
         )
 
     async def get_participants(self, folder_name: str) -> dict[str, dict]:
@@ -780,11 +1232,54 @@ class MagicFolder:
             f"Expected object sizes as list, instead got {type(sizes)!r}"
         )
 
-    async def get_all_object_sizes(self) -> list[int]:
-        all_sizes = []
+    def _invalidate_object_sizes(self, folder_name: str, *_: object) -> None:
+        self._object_sizes.pop(folder_name, None)
+        self._object_sizes_generation[folder_name] = (
+            self._object_sizes_generation.get(folder_name, 0) + 1
+        )
+
+    async def get_all_object_sizes(self, concurrency: int = 4) -> list[int]:
+        """
+        Return the sizes of the Tahoe-LAFS objects of all magic-folders.
+
+        The sizes for each folder are cached until the monitor reports that
+        the folder's files (or size) changed; the sizes for any folders that
+        are not cached are requested concurrently, with at most
+        ``concurrency`` requests in flight at once.
+        """
         folders = await self.get_folders()
+        for folder in list(self._object_sizes):
+            if folder not in folders:
+                del self._object_sizes[folder]
+        semaphore = DeferredSemaphore(concurrency)
+        fetched: dict[str, list[int]] = {}
+
+        async def fetch(folder: str) -> None:
+            generation = self._object_sizes_generation.get(folder, 0)
+            await semaphore.acquire()
+            try:
+                sizes = await self.get_object_sizes(folder)
+            finally:
+                semaphore.release()
+            fetched[folder] = sizes
+            # Don't cache sizes that may have changed while being fetched
+            if self._object_sizes_generation.get(folder, 0) == generation:
+                self._object_sizes[folder] = sizes
+
+        results = await DeferredList(
+            [
+                Deferred.fromCoroutine(fetch(folder))
+                for folder in folders
+                if folder not in self._object_sizes
+            ],
+            consumeErrors=True,
+        )
+        for success, result in results:
+            if not success:
+                result.raiseException()
+        all_sizes = []
         for folder in folders:
-            sizes = await self.get_object_sizes(folder)
+            sizes = fetched.get(folder, self._object_sizes.get(folder, []))
             all_sizes.extend(sizes)
         return all_sizes
 
@@ -823,13 +1318,12 @@ class MagicFolder:
             raise ValueError("Collective dircap in folder data is missing")
         if upload_dircap is None:
             raise ValueError("Upload dircap in folder data is missing")
-        await self.rootcap_manager.add_backup(
+        await self.rootcap_manager.add_backups(
             ".magic-folders",
-            f"{folder_name} (collective)",
-            collective_dircap,
-        )
-        await self.rootcap_manager.add_backup(
-            ".magic-folders", f"{folder_name} (personal)", upload_dircap
+            {
+                f"{folder_name} (collective)": collective_dircap,
+                f"{folder_name} (personal)": upload_dircap,
+            },
         )
 
     async def get_folder_backups(self) -> Optional[dict[str, dict]]:
@@ -48,13 +48,12 @@ class NewscapChecker(QObject):
     @inlineCallbacks
     def _download_messages(self, downloads: list) -> TwistedDeferred[None]:
         downloads = sorted(downloads)
-        for dest, filecap in downloads:
-            try:
-                yield Deferred.fromCoroutine(
-                    self.gateway.download(filecap, dest)
-                )
-            except Exception as e:  # pylint: disable=broad-except
-                logging.warning("Error downloading '%s': %s", dest, str(e))
+        # Failures are logged (and otherwise ignored) by `download_many`
+        yield Deferred.fromCoroutine(
+            self.gateway.download_many(
+                [(filecap, dest) for dest, filecap in downloads]
+            )
+        )
         newest_message_filepath = downloads[-1][0]
         if os.path.exists(newest_message_filepath):
             with open(newest_message_filepath, encoding="utf-8") as f:
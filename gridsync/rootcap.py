@@ -13,6 +13,11 @@ from gridsync.errors import UpgradeRequiredError
 if TYPE_CHECKING:
     from gridsync.tahoe import Tahoe  # pylint: disable=cyclic-import
 
+# Backup directories that are created along with the base directory (so
+# that adding the first backup to each of them doesn't require another
+# mutable directory to be created and linked)
+DEFAULT_BACKUP_DIRNAMES = (".magic-folders", ".zkapauthorizer")
+
 
 class RootcapManager:
     """
@@ -39,9 +44,15 @@ class RootcapManager:
     Recovery Key" flow.
     """
 
-    def __init__(self, gateway: Tahoe, basedir: str = "v1") -> None:
+    def __init__(
+        self,
+        gateway: Tahoe,
+        basedir: str = "v1",
+        backup_dirnames: tuple[str, ...] = DEFAULT_BACKUP_DIRNAMES,
+    ) -> None:
         self.gateway = gateway
         self.basedir = basedir
+        self.backup_dirnames = backup_dirnames
         self.lock = DeferredLock()
         self._rootcap_path = Path(gateway.nodedir, "private", "rootcap")
         self._rootcap: str = ""
@@ -74,7 +85,9 @@ class RootcapManager:
             return self.get_rootcap()
         await self.lock.acquire()
         try:
-            rootcap = await self.gateway.mkdir()
+            rootcap = await self.gateway.mkdir_tree(
+                {self.basedir: self._backup_dirs_tree()}
+            )
         finally:
             self.lock.release()
         await self.lock.acquire()
@@ -94,6 +107,9 @@ class RootcapManager:
         logging.debug("Rootcap successfully created")
         return self._rootcap
 
+    def _backup_dirs_tree(self) -> dict:
+        return {name: {} for name in self.backup_dirnames}
+
     async def _get_basedircap(self) -> str:
         if self._basedircap:
             return self._basedircap
@@ -112,7 +128,9 @@ class RootcapManager:
             return self._basedircap
         logging.debug('Creating base ("%s") dircap...', self.basedir)
         try:
-            self._basedircap = await self.gateway.mkdir(rootcap, self.basedir)
+            self._basedircap = await self.gateway.mkdir_tree(
+                self._backup_dirs_tree(), rootcap, self.basedir
+            )
         finally:
             self.lock.release()
         logging.debug('Base ("%s") dircap successfully created', self.basedir)
@@ -156,6 +174,20 @@ class RootcapManager:
         finally:
             self.lock.release()
 
+    async def add_backups(self, dirname: str, backups: dict[str, str]) -> None:
+        """
+        Add several backups to the same backup directory at once.
+
+        :param dirname: same meaning as add_backup
+        :param backups: a mapping of names to the capabilities to back up
+        """
+        backup_cap = await self.get_backup_cap(dirname)
+        await self.lock.acquire()
+        try:
+            await self.gateway.link_many(backup_cap, backups)
+        finally:
+            self.lock.release()
+
     async def get_backup(self, dirname: str, name: str) -> str:
         """
         Retrieve a backup previously added with `add_backup`.
@@ -211,5 +243,7 @@ class RootcapManager:
                     backupdir_name,
                 )
                 continue
-            for name, data in dir_contents.items():
-                await self.add_backup(backupdir_name, name, data["cap"])
+            await self.add_backups(
+                backupdir_name,
+                {name: data["cap"] for name, data in dir_contents.items()},
+            )
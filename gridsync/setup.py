@@ -414,18 +414,14 @@ class SetupRunner(QObject):
 
     async def join_folders(self, folders_data: dict) -> None:
         folders = []
+        children = {}
         for folder, data in folders_data.items():
             self.update_progress.emit('Joining folder "{}"...'.format(folder))
             collective, personal = data["code"].split("+")
-            await self.gateway.link(
-                self.gateway.get_rootcap(),
-                folder + " (collective)",
-                collective,
-            )
-            await self.gateway.link(
-                self.gateway.get_rootcap(), folder + " (personal)", personal
-            )
+            children[folder + " (collective)"] = collective
+            children[folder + " (personal)"] = personal
             folders.append(folder)
+        await self.gateway.link_many(self.gateway.get_rootcap(), children)
         if folders:
             self.joined_folders.emit(folders)
 
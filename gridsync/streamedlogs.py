@@ -6,8 +6,7 @@ node.
 """
 
 import logging
-from collections import deque
-from typing import Optional
+from typing import Iterator, Optional, Union
 
 from autobahn.twisted.websocket import (
     WebSocketClientFactory,
@@ -19,6 +18,9 @@ from twisted.application.service import MultiService
 from twisted.internet.endpoints import TCP4ClientEndpoint
 from twisted.internet.interfaces import IReactorTime
 
+from gridsync.logring import LogRing
+from gridsync.logspool import LogSpool
+
 
 class TahoeLogReader(
     WebSocketClientProtocol
@@ -38,23 +40,30 @@ class StreamedLogs(MultiService):
     :ivar _reactor: A reactor that can connect using whatever transport the
         Tahoe-LAFS node requires (TCP, etc).
 
-    :ivar deque _buffer: Bounded storage for the streamed messages.
+    :ivar _buffer: Bounded storage for the streamed messages -- either a
+        (compressed) in-memory ``LogRing`` or, if a ``LogSpool`` was given,
+        that spool.
     """
 
     _started = False
 
     def __init__(
-        self, reactor: IReactorTime, maxlen: Optional[int] = None
+        self,
+        reactor: IReactorTime,
+        maxlen: Optional[int] = None,
+        spool: Optional[LogSpool] = None,
     ) -> None:
         super().__init__()
         self._reactor = reactor
         self._client_service: Optional[ClientService] = None
         if maxlen is None:
-            # This deque limit is based on average message size of 260 bytes
-            # and a desire to limit maximum memory consumption here to around
-            # 500 MiB.
+            # This limit is based on average message size of 260 bytes and a
+            # desire to limit maximum memory consumption here to around 500
+            # MiB (before compression; LogRing stores messages compressed).
             maxlen = 2000000
-        self._buffer: deque = deque(maxlen=maxlen)
+        self._buffer: Union[LogRing, LogSpool] = (
+            spool if spool is not None else LogRing(maxlen=maxlen)
+        )
 
     def add_message(self, message: bytes) -> None:
         self._buffer.append(message)
@@ -78,6 +87,8 @@ class StreamedLogs(MultiService):
         if self.running:
             self._client_service.disownServiceParent()  # type: ignore
             self._client_service = None
+            if isinstance(self._buffer, LogSpool):
+                self._buffer.close()
             return super().stopService()
         return None
 
@@ -85,7 +96,14 @@ class StreamedLogs(MultiService):
         """
         :return list[str]: The messages currently in the message buffer.
         """
-        return list(msg.decode("utf-8") for msg in list(self._buffer))
+        return list(msg.decode("utf-8") for msg in self._buffer)
+
+    def iter_streamed_log_messages(self) -> Iterator[bytes]:
+        """
+        :return: An iterator over the (undecoded) messages currently in the
+            message buffer, produced lazily.
+        """
+        return iter(self._buffer)
 
     def _create_client_service(
         self, nodeurl: str, api_token: str
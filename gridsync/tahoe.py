@@ -1,25 +1,41 @@
 # -*- coding: utf-8 -*-
+from __future__ import annotations
 
+import contextlib
+import copy
 import json
 import logging as log
 import os
 import re
+import shutil
+import time
+from functools import partial
 from pathlib import Path
-from typing import Optional, Union, cast
+from typing import Callable, Iterator, Optional, Union, cast
 
+import attr
 import treq
 import yaml
 from atomicwrites import atomic_write
-from twisted.internet.defer import Deferred
+from twisted.internet.defer import (
+    Deferred,
+    DeferredList,
+    DeferredSemaphore,
+    succeed,
+)
 from twisted.internet.error import ConnectError
 from twisted.internet.interfaces import IReactorTime
+from twisted.python.failure import Failure
+from twisted.web.client import FileBodyProducer
 
 from gridsync import APP_NAME
 from gridsync import settings as global_settings
-from gridsync.capabilities import diminish
+from gridsync.capabilities import diminish, is_readonly
 from gridsync.config import Config
 from gridsync.crypto import trunchash
+from gridsync.dircache import DirectoryCache, is_immutable
 from gridsync.errors import TahoeCommandError, TahoeWebError
+from gridsync.logspool import LogSpool
 from gridsync.magic_folder import MagicFolder
 from gridsync.monitor import Monitor
 from gridsync.msg import critical
@@ -28,10 +44,18 @@ from gridsync.rootcap import RootcapManager
 from gridsync.streamedlogs import StreamedLogs
 from gridsync.supervisor import Supervisor
 from gridsync.system import SubprocessProtocol, which
+from gridsync.transfer import ProgressReader, TransferProgress
 from gridsync.util import Poller
+from gridsync.webclient import WebClient
 from gridsync.zkapauthorizer import PLUGIN_NAME as ZKAPAUTHZ_PLUGIN_NAME
 from gridsync.zkapauthorizer import ZKAPAuthorizer
 
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml is unavailable
+    from yaml import SafeDumper, SafeLoader  # type: ignore
+
 
 def is_valid_furl(furl: str) -> bool:
     if re.match(r"^pb://[a-z2-7]+@[a-zA-Z0-9\.:,-]+:\d+/[a-z2-7]+$", furl):
@@ -39,6 +63,59 @@ def is_valid_furl(furl: str) -> bool:
     return False
 
 
+# The minimum size of an immutable file for which ``Tahoe.download`` will
+# fetch several byte-ranges in parallel (if asked to)
+PARALLEL_DOWNLOAD_MIN_SIZE = 64 * 1024 * 1024
+
+
+def get_chk_size(cap: str) -> Optional[int]:
+    """
+    Get the size of the immutable file at a "CHK" capability (which is
+    encoded in the capability itself) or ``None`` for any other kind of
+    capability.
+    """
+    # URI:CHK:<key>:<UEB hash>:<needed shares>:<total shares>:<size>
+    if not cap.startswith("URI:CHK:"):
+        return None
+    try:
+        return int(cap.split(":")[6])
+    except (IndexError, ValueError):
+        return None
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _range_headers(first: int, last: Optional[int]) -> dict[str, list[str]]:
+    if not first and last is None:
+        return {}
+    return {"Range": [f"bytes={first}-{'' if last is None else last}"]}
+
+
+def _range_write_mode(
+    code: int, start: int, end: Optional[int], offset: int
+) -> Optional[str]:
+    """
+    Determine how to write the body of a response to a (possibly ranged)
+    download request into a partial file already holding ``offset`` bytes.
+
+    :returns: The mode in which to open the partial file, an empty string
+        if the partial file is already complete, or ``None`` if the
+        response is an error.
+    """
+    if code == 206:
+        return "ab"
+    if code == 200 and start == 0 and end is None:
+        return "wb"
+    if code == 416 and offset and end is None:
+        return ""
+    return None
+
+
 def get_nodedirs(basedir: str) -> list:
     nodedirs = []
     try:
@@ -53,6 +130,49 @@ def get_nodedirs(basedir: str) -> list:
     return sorted(nodedirs)
 
 
+@attr.s(frozen=True)
+class GridStatus:
+    """
+    A snapshot of a node's connections to storage servers, as reported by
+    the JSON representation of the Tahoe-LAFS welcome page.
+
+    :ivar servers_connected: The number of storage servers connected to.
+    :ivar servers_known: The number of storage servers known about.
+    :ivar available_space: The sum of the space available on all connected
+        storage servers.
+    :ivar server_space: A mapping of the node IDs of connected storage
+        servers to the space available on each (or ``None`` if unknown).
+    :ivar timestamp: The time at which the snapshot was taken.
+    """
+
+    servers_connected: int = attr.ib()
+    servers_known: int = attr.ib()
+    available_space: int = attr.ib()
+    server_space: dict[str, Optional[int]] = attr.ib()
+    timestamp: float = attr.ib()
+
+    @classmethod
+    def from_json(cls, content: dict, timestamp: float) -> GridStatus:
+        servers = content.get("servers", [])
+        connected = [
+            s
+            for s in servers
+            if s["connection_status"].startswith("Connected")
+        ]
+        server_space = {
+            s.get("nodeid", ""): s.get("available_space") for s in connected
+        }
+        return cls(
+            servers_connected=len(connected),
+            servers_known=len(servers),
+            available_space=sum(
+                s.get("available_space") or 0 for s in connected
+            ),
+            server_space=server_space,
+            timestamp=timestamp,
+        )
+
+
 class Tahoe:
 
     """
@@ -61,6 +181,20 @@ class Tahoe:
         otherwise.
 
     :ivar nodeurl: a string giving the root of the node's HTTP API.
+
+    :ivar ready: ``True`` if the node was last seen to be connected to
+        enough storage servers to satisfy ``shares_happy``, ``False`` if it
+        has not been seen to be connected yet or has since disconnected.
+
+    :ivar grid_status: the most recently fetched ``GridStatus`` snapshot,
+        or ``None`` if none has been fetched yet.
+
+    :ivar dircache: the ``DirectoryCache`` of directory listings fetched
+        by ``get_json`` (and ``ls``).
+
+    :ivar http: the ``WebClient`` through which all requests to this
+        gateway's web APIs (Tahoe-LAFS, Magic-Folder, and ZKAPAuthorizer)
+        are sent.
     """
 
     STOPPED = 0
@@ -88,6 +222,8 @@ class Tahoe:
         self.servers_yaml_path = os.path.join(
             self.nodedir, "private", "servers.yaml"
         )
+        # ((mtime, size), parsed contents) of servers.yaml, as last read
+        self._servers_yaml_cache: Optional[tuple[tuple[int, int], dict]] = None
         self.config = Config(os.path.join(self.nodedir, "tahoe.cfg"))
         self.pidfile = os.path.join(self.nodedir, f"{APP_NAME}-tahoe.pid")
         self.nodeurl: str = ""
@@ -95,14 +231,38 @@ class Tahoe:
         self.shares_happy = 0
         self.name = os.path.basename(self.nodedir)
         self.use_tor = False
+        self.ready = False
+        self.grid_status: Optional[GridStatus] = None
+        self._grid_status_waiting: list[Deferred[Optional[GridStatus]]] = []
+        self.http = WebClient(reactor)
+        self.dircache = DirectoryCache()
         self.monitor = Monitor(self)
+        self.monitor.connected.connect(self.set_ready)
+        self.monitor.disconnected.connect(self.set_not_ready)
         logs_maxlen = None
+        log_spool_kwargs: Optional[dict[str, int]] = None
         debug_settings = global_settings.get("debug")
         if debug_settings:
             log_maxlen = debug_settings.get("log_maxlen")
             if log_maxlen is not None:
                 logs_maxlen = int(log_maxlen)
-        self.streamedlogs = StreamedLogs(reactor, logs_maxlen)
+            if str(debug_settings.get("log_spool")).lower() == "true":
+                log_spool_kwargs = {}
+                max_bytes = debug_settings.get("log_spool_max_bytes")
+                if max_bytes is not None:
+                    log_spool_kwargs["max_bytes"] = int(max_bytes)
+        tahoe_log_spool = None
+        magic_folder_log_spool = None
+        if log_spool_kwargs is not None:
+            # Eliot logs can contain capabilities, so keep them private
+            spool_dir = Path(self.nodedir, "private", "eliot-logs")
+            tahoe_log_spool = LogSpool(spool_dir / "tahoe", **log_spool_kwargs)
+            magic_folder_log_spool = LogSpool(
+                spool_dir / "magic-folder", **log_spool_kwargs
+            )
+        self.streamedlogs = StreamedLogs(
+            reactor, logs_maxlen, spool=tahoe_log_spool
+        )
         self.state = Tahoe.STOPPED
         self.newscap = ""
         self.newscap_checker = NewscapChecker(self)
@@ -114,7 +274,9 @@ class Tahoe:
 
         self.storage_furl: str = ""
         self.rootcap_manager = RootcapManager(self)
-        self.magic_folder = MagicFolder(self, logs_maxlen=logs_maxlen)
+        self.magic_folder = MagicFolder(
+            self, logs_maxlen=logs_maxlen, log_spool=magic_folder_log_spool
+        )
 
         self.supervisor = Supervisor(pidfile=Path(self.pidfile))
 
@@ -124,6 +286,7 @@ class Tahoe:
             ready = await self.is_ready()
             if ready:
                 log.debug('Connected to "%s"', self.name)
+                self.ready = True
             else:
                 log.debug('Connecting to "%s"...', self.name)
             return ready
@@ -246,11 +409,38 @@ class Tahoe:
         log.debug("Exported settings to '%s'", dest)
 
     def _read_servers_yaml(self) -> dict:
+        """
+        Read and parse servers.yaml, re-using the previously parsed
+        contents if the file has not changed since it was last read.
+
+        The returned dict is shared with the cache and must not be mutated.
+        """
+        try:
+            st = os.stat(self.servers_yaml_path)
+        except OSError:
+            return {}
+        stamp = (st.st_mtime_ns, st.st_size)
+        if self._servers_yaml_cache and self._servers_yaml_cache[0] == stamp:
+            return self._servers_yaml_cache[1]
         try:
             with open(self.servers_yaml_path, encoding="utf-8") as f:
-                return yaml.safe_load(f)
+                yaml_data = yaml.load(f, Loader=SafeLoader) or {}
         except OSError:
             return {}
+        self._servers_yaml_cache = (stamp, yaml_data)
+        return yaml_data
+
+    def _write_servers_yaml(self, yaml_data: dict) -> None:
+        content = yaml.dump(
+            yaml_data, Dumper=SafeDumper, default_flow_style=False
+        )
+        self._servers_yaml_cache = None
+        with atomic_write(
+            self.servers_yaml_path, mode="w", overwrite=True
+        ) as f:
+            f.write(content)
+        st = os.stat(self.servers_yaml_path)
+        self._servers_yaml_cache = ((st.st_mtime_ns, st.st_size), yaml_data)
 
     def get_storage_servers(self) -> dict:
         yaml_data = self._read_servers_yaml()
@@ -297,37 +487,43 @@ class Tahoe:
         nickname: Optional[str] = None,
         storage_options: Optional[list[dict]] = None,
     ) -> None:
-        log.debug("Adding storage server: %s...", server_id)
-        yaml_data = self._read_servers_yaml()
-        if not yaml_data or not yaml_data.get("storage"):
-            yaml_data["storage"] = {}
-        yaml_data["storage"][server_id] = {
-            "ann": {"anonymous-storage-FURL": furl}
-        }
+        data: dict = {"anonymous-storage-FURL": furl}
         if nickname:
-            yaml_data["storage"][server_id]["ann"]["nickname"] = nickname
+            data["nickname"] = nickname
         if storage_options:
-            yaml_data["storage"][server_id]["ann"][
-                "storage-options"
-            ] = storage_options
-            self._configure_storage_plugins(storage_options)
-        with atomic_write(
-            self.servers_yaml_path, mode="w", overwrite=True
-        ) as f:
-            f.write(yaml.safe_dump(yaml_data, default_flow_style=False))
-        log.debug("Added storage server: %s", server_id)
+            data["storage-options"] = storage_options
+        self.add_storage_servers({server_id: data})
 
     def add_storage_servers(self, storage_servers: dict) -> None:
-        for server_id, data in storage_servers.items():
-            nickname = data.get("nickname")
-            storage_options = data.get("storage-options")
-            furl = data.get("anonymous-storage-FURL")
-            if furl:
-                self.add_storage_server(
-                    server_id, furl, nickname, storage_options
-                )
-            else:
-                log.warning("No storage fURL provided for %s!", server_id)
+        """
+        Add several storage servers to servers.yaml (and configure any
+        storage plugins that they use) with a single write to each of
+        servers.yaml and tahoe.cfg.
+        """
+        yaml_data = copy.deepcopy(self._read_servers_yaml())
+        if not yaml_data.get("storage"):
+            yaml_data["storage"] = {}
+        added = []
+        with self.config.batch():
+            for server_id, data in storage_servers.items():
+                furl = data.get("anonymous-storage-FURL")
+                if not furl:
+                    log.warning("No storage fURL provided for %s!", server_id)
+                    continue
+                log.debug("Adding storage server: %s...", server_id)
+                ann = {"anonymous-storage-FURL": furl}
+                nickname = data.get("nickname")
+                if nickname:
+                    ann["nickname"] = nickname
+                storage_options = data.get("storage-options")
+                if storage_options:
+                    ann["storage-options"] = storage_options
+                    self._configure_storage_plugins(storage_options)
+                yaml_data["storage"][server_id] = {"ann": ann}
+                added.append(server_id)
+        if added:
+            self._write_servers_yaml(yaml_data)
+            log.debug("Added storage servers: %s", ", ".join(added))
 
     def line_received(self, line: str) -> None:
         # TODO: Connect to Core via Qt signals/slots?
@@ -402,6 +598,8 @@ class Tahoe:
         if not self.is_storage_node():
             await self.magic_folder.stop()
         await self.supervisor.stop()
+        self.set_not_ready()
+        await self.http.close()
         self.state = Tahoe.STOPPED
         log.debug('Finished stopping "%s" tahoe client', self.name)
 
@@ -415,7 +613,17 @@ class Tahoe:
         """
         return self.streamedlogs.get_streamed_log_messages()
 
+    def iter_streamed_log_messages(self) -> Iterator[bytes]:
+        """
+        Like ``get_streamed_log_messages`` but produce the (UTF-8 & JSON
+        encoded ``bytes``) messages lazily, without decoding them.
+        """
+        return self.streamedlogs.iter_streamed_log_messages()
+
     def _on_started(self) -> None:
+        # The supervised process may have been restarted; connections to
+        # storage servers will need to be re-established before use.
+        self.set_not_ready()
         self.load_settings()
 
         with open(
@@ -518,47 +726,74 @@ class Tahoe:
         """
         self.nodeurl = nodeurl
 
-    async def get_grid_status(
-        self,
-    ) -> Optional[tuple[int, int, int]]:
+    async def _fetch_grid_status(self) -> Optional[GridStatus]:
         if not self.nodeurl:
             return None
         try:
-            resp = await treq.get(self.nodeurl + "?t=json")
+            resp = await self.http.get(self.nodeurl + "?t=json")
         except ConnectError:
+            self.set_not_ready()
             return None
-        if resp.code == 200:
-            content = await treq.content(resp)
-            content = json.loads(content.decode("utf-8"))
-            servers_connected = 0
-            servers_known = 0
-            available_space = 0
-            if "servers" in content:
-                servers = content["servers"]
-                servers_known = len(servers)
-                for server in servers:
-                    if server["connection_status"].startswith("Connected"):
-                        servers_connected += 1
-                        if server["available_space"]:
-                            available_space += server["available_space"]
-            return servers_connected, servers_known, available_space
-        return None
+        if resp.code != 200:
+            return None
+        content = await treq.content(resp)
+        grid_status = GridStatus.from_json(
+            json.loads(content.decode("utf-8")), time.time()
+        )
+        self.grid_status = grid_status
+        return grid_status
+
+    def _deliver_grid_status(self, grid_status: Optional[GridStatus]) -> None:
+        waiting, self._grid_status_waiting = self._grid_status_waiting, []
+        for d in waiting:
+            d.callback(grid_status)
+
+    def _fail_grid_status(self, failure: Failure) -> None:
+        waiting, self._grid_status_waiting = self._grid_status_waiting, []
+        for d in waiting:
+            d.errback(failure)
+
+    def fetch_grid_status(
+        self, max_age: float = 1.0
+    ) -> Deferred[Optional[GridStatus]]:
+        """
+        Get a snapshot of the node's connections to storage servers.
 
-    async def get_connected_servers(self) -> Optional[int]:
-        if not self.nodeurl:
+        If the most recent snapshot is younger than ``max_age`` seconds, it
+        is returned without contacting the node. Otherwise, a new snapshot
+        is fetched; concurrent callers share the same request.
+
+        :return: A ``Deferred`` that fires with a ``GridStatus`` or with
+            ``None`` if the node could not be reached.
+        """
+        grid_status = self.grid_status
+        if grid_status and time.time() - grid_status.timestamp < max_age:
+            return succeed(grid_status)
+        d: Deferred[Optional[GridStatus]] = Deferred()
+        self._grid_status_waiting.append(d)
+        if len(self._grid_status_waiting) == 1:
+            Deferred.fromCoroutine(self._fetch_grid_status()).addCallbacks(
+                self._deliver_grid_status, self._fail_grid_status
+            )
+        return d
+
+    async def get_grid_status(
+        self,
+    ) -> Optional[tuple[int, int, int]]:
+        grid_status = await self.fetch_grid_status()
+        if grid_status is None:
             return None
-        try:
-            resp = await treq.get(self.nodeurl)
-        except ConnectError:
+        return (
+            grid_status.servers_connected,
+            grid_status.servers_known,
+            grid_status.available_space,
+        )
+
+    async def get_connected_servers(self) -> Optional[int]:
+        grid_status = await self.fetch_grid_status()
+        if grid_status is None:
             return None
-        if resp.code == 200:
-            html = await treq.content(resp)
-            match = re.search(
-                "Connected to <span>(.+?)</span>", html.decode("utf-8")
-            )
-            if match:
-                return int(match.group(1))
-        return None
+        return grid_status.servers_connected
 
     async def is_ready(self) -> bool:
         if not self.shares_happy:
@@ -568,17 +803,65 @@ class Tahoe:
             connected_servers and connected_servers >= self.shares_happy
         )
 
-    def await_ready(self) -> Deferred[bool]:
+    def set_ready(self) -> None:
+        self.ready = True
+
+    def set_not_ready(self) -> None:
+        if self.ready:
+            log.debug('Marking "%s" as not ready', self.name)
+        self.ready = False
+
+    def await_ready(self) -> Deferred[None]:
+        """
+        Wait until the node is connected to enough storage servers to
+        satisfy ``shares_happy``.
+
+        Once the node has been seen to be ready, this returns immediately
+        (without contacting the node) until it is marked as not ready again
+        -- e.g., because ``GridChecker`` noticed a disconnection or because
+        a request to the node failed to connect.
+        """
+        if self.ready:
+            return succeed(None)
         return self._ready_poller.wait_for_completion()
 
-    async def mkdir(self, parentcap: str = None, childname: str = None) -> str:
+    @staticmethod
+    def _children_json(children: dict[str, str]) -> bytes:
+        body = {}
+        for name, cap in children.items():
+            node_type = "dirnode" if cap.startswith("URI:DIR2") else "filenode"
+            key = "ro_uri" if is_readonly(cap) else "rw_uri"
+            body[name] = [node_type, {key: cap}]
+        return json.dumps(body).encode("utf-8")
+
+    async def mkdir(
+        self,
+        parentcap: str = None,
+        childname: str = None,
+        children: Optional[dict[str, str]] = None,
+    ) -> str:
+        """
+        Create a new mutable directory (optionally linked into the
+        directory at ``parentcap`` as ``childname``) and return its
+        capability.
+
+        :param children: A mapping of child names to existing capabilities
+            to link into the new directory as part of its creation.
+        """
         await self.await_ready()
         url = self.nodeurl + "uri"
-        params = {"t": "mkdir"}
+        params = {"t": "mkdir-with-children" if children else "mkdir"}
         if parentcap and childname:
             url += "/" + parentcap
             params["name"] = childname
-        resp = await treq.post(url, params=params)
+        if children:
+            resp = await self.http.post(
+                url, self._children_json(children), params=params
+            )
+        else:
+            resp = await self.http.post(url, params=params)
+        if parentcap:
+            self.dircache.invalidate(parentcap)
         content = await treq.content(resp)
         content = content.decode("utf-8").strip()
         if resp.code == 200:
@@ -587,11 +870,47 @@ class Tahoe:
             f"Error {resp.code} creating Tahoe-LAFS directory: {content}"
         )
 
+    async def mkdir_tree(
+        self, tree: dict, parentcap: str = None, childname: str = None
+    ) -> str:
+        """
+        Create a new directory -- along with any new subdirectories beneath
+        it -- and return its capability.
+
+        :param tree: A mapping of child names to either existing
+            capabilities or, for new subdirectories, (possibly empty)
+            mappings of the same form.
+
+        Tahoe-LAFS can only link existing capabilities into a directory
+        as it is created, so the tree is created from the bottom up; each
+        directory is created with its children already linked (via
+        ``t=mkdir-with-children``) and sibling subdirectories are created
+        concurrently, so no directory needs to be modified afterwards.
+        """
+        subdirs = [name for name, v in tree.items() if isinstance(v, dict)]
+        results = await DeferredList(
+            [
+                Deferred.fromCoroutine(self.mkdir_tree(tree[name]))
+                for name in subdirs
+            ],
+            consumeErrors=True,
+        )
+        children = {name: v for name, v in tree.items() if isinstance(v, str)}
+        for name, (success, result) in zip(subdirs, results):
+            if not success:
+                result.raiseException()
+            children[name] = result
+        return await self.mkdir(parentcap, childname, children=children)
+
     async def create_rootcap(self) -> str:
         return await self.rootcap_manager.create_rootcap()
 
-    async def upload(
-        self, local_path: str, dircap: str = "", mutable: bool = False
+    async def _upload(
+        self,
+        local_path: str,
+        dircap: str = "",
+        mutable: bool = False,
+        progress: Optional[TransferProgress] = None,
     ) -> str:
         if dircap:
             filename = Path(local_path).name
@@ -601,9 +920,15 @@ class Tahoe:
         if mutable:
             url = f"{url}?format=MDMF"
         log.debug("Uploading %s...", local_path)
-        await self.await_ready()
         with open(local_path, "rb") as f:
-            resp = await treq.put(url, f)
+            if progress is None:
+                resp = await self.http.put(url, f)
+            else:
+                update = progress.update
+                reader = ProgressReader(f, lambda n: update(local_path, n))
+                resp = await self.http.put(url, FileBodyProducer(reader))
+        if dircap:
+            self.dircache.invalidate(dircap)
         if resp.code in (200, 201):
             content = await treq.content(resp)
             log.debug("Successfully uploaded %s", local_path)
@@ -611,17 +936,264 @@ class Tahoe:
         content = await treq.content(resp)
         raise TahoeWebError(content.decode("utf-8"))
 
-    async def download(self, cap: str, local_path: str) -> None:
-        log.debug("Downloading %s...", local_path)
+    async def upload(
+        self, local_path: str, dircap: str = "", mutable: bool = False
+    ) -> str:
         await self.await_ready()
-        resp = await treq.get("{}uri/{}".format(self.nodeurl, cap))
-        if resp.code == 200:
-            with atomic_write(local_path, mode="wb", overwrite=True) as f:
-                await treq.collect(resp, f.write)
-            log.debug("Successfully downloaded %s", local_path)
-        else:
+        return await self._upload(local_path, dircap, mutable)
+
+    async def upload_many(
+        self,
+        local_paths: list[str],
+        dircap: str = "",
+        concurrency: int = 4,
+        mutable: bool = False,
+        progress: Optional[TransferProgress] = None,
+    ) -> tuple[dict[str, str], dict[str, Exception]]:
+        """
+        Upload several files, at most ``concurrency`` at a time, streaming
+        each from disk.
+
+        A failure to upload one file does not abort the rest of the batch;
+        the caps of the files that were uploaded successfully -- and the
+        errors for those that were not -- are returned, keyed by path.
+
+        If ``dircap`` is given, the files are uploaded unlinked and the
+        successful ones are then linked into that directory with a single
+        ``link_many`` call, so that concurrent uploads don't race to
+        update the same mutable directory.
+
+        :param progress: A ``TransferProgress`` through which to report
+            per-file and aggregate byte-progress.
+        """
+        if progress is not None:
+            for path in local_paths:
+                progress.add_file(path, _file_size(path))
+        await self.await_ready()
+        semaphore = DeferredSemaphore(concurrency)
+        caps: dict[str, str] = {}
+        errors: dict[str, Exception] = {}
+
+        async def upload_one(path: str) -> None:
+            await semaphore.acquire()
+            try:
+                cap = await self._upload(path, "", mutable, progress)
+            except Exception as e:  # pylint: disable=broad-except
+                log.warning("Error uploading %s: %s", path, str(e))
+                errors[path] = e
+                if progress is not None:
+                    progress.fail(path, e)
+            else:
+                caps[path] = cap
+                if progress is not None:
+                    progress.finish(path, cap)
+            finally:
+                semaphore.release()
+
+        await DeferredList(
+            [Deferred.fromCoroutine(upload_one(p)) for p in local_paths]
+        )
+        if dircap:
+            await self.link_many(
+                dircap, {Path(p).name: cap for p, cap in caps.items()}
+            )
+        log.debug(
+            "Uploaded %i of %i files (%i failed)",
+            len(caps),
+            len(local_paths),
+            len(errors),
+        )
+        return caps, errors
+
+    async def _download_range(
+        self,
+        url: str,
+        part_path: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        """
+        Download bytes ``start`` through ``end`` (inclusive, or through to
+        the end of the object if ``end`` is ``None``) from ``url`` into
+        ``part_path``, resuming from the end of ``part_path`` if it has
+        already been partially downloaded.
+        """
+        try:
+            offset = os.path.getsize(part_path)
+        except OSError:
+            offset = 0
+        if on_progress and offset:
+            on_progress(offset)
+        if end is not None and start + offset > end:
+            return  # This range was already downloaded completely
+        resp = await self.http.get(
+            url, headers=_range_headers(start + offset, end)
+        )
+        mode = _range_write_mode(resp.code, start, end, offset)
+        if mode is None:
             content = await treq.content(resp)
             raise TahoeWebError(content.decode("utf-8"))
+        if not mode:
+            return  # The partial file already contains the whole object
+        if mode == "wb" and on_progress and offset:
+            on_progress(-offset)  # The whole object was sent; start over
+
+        with open(part_path, mode) as f:
+
+            def collect(data: bytes) -> None:
+                f.write(data)
+                if on_progress:
+                    on_progress(len(data))
+
+            await treq.collect(resp, collect)
+            f.flush()
+            os.fsync(f.fileno())
+
+    @staticmethod
+    def _discard_stale_parts(
+        cap: str, part_path: str, part_paths: list[str]
+    ) -> None:
+        """
+        Remove the partially-downloaded ``part_paths`` unless they were left
+        by an interrupted download of the same immutable ``cap`` (split
+        into as many segments), as recorded in a ".cap" file next to
+        ``part_path``, and record ``cap`` for the download about to begin.
+        """
+        key = f"{trunchash(cap, 64)} {len(part_paths)}"
+        cap_path = part_path + ".cap"
+        try:
+            with open(cap_path, encoding="utf-8") as f:
+                resumable = is_immutable(cap) and f.read() == key
+        except OSError:
+            resumable = False
+        if resumable:
+            return
+        for path in part_paths:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+        with open(cap_path, "w", encoding="utf-8") as f:
+            f.write(key)
+
+    async def _download(
+        self,
+        cap: str,
+        local_path: str,
+        progress: Optional[TransferProgress] = None,
+        segments: int = 1,
+    ) -> None:
+        log.debug("Downloading %s...", local_path)
+        url = f"{self.nodeurl}uri/{cap}"
+        part_path = local_path + ".part"
+        on_progress: Optional[Callable[[int], None]] = None
+        if progress is not None:
+            on_progress = partial(progress.update, local_path)
+        size = get_chk_size(cap)
+        if segments > 1 and size and size >= PARALLEL_DOWNLOAD_MIN_SIZE:
+            step = -(-size // segments)  # Round up
+            ranges = [
+                (start, min(start + step, size) - 1)
+                for start in range(0, size, step)
+            ]
+            part_paths = [f"{part_path}{n}" for n in range(len(ranges))]
+            self._discard_stale_parts(cap, part_path, part_paths)
+            results = await DeferredList(
+                [
+                    Deferred.fromCoroutine(
+                        self._download_range(
+                            url, path, start, end, on_progress
+                        )
+                    )
+                    for path, (start, end) in zip(part_paths, ranges)
+                ],
+                consumeErrors=True,
+            )
+            for success, result in results:
+                if not success:
+                    result.raiseException()
+            with open(part_path, "wb") as f:
+                for path in part_paths:
+                    with open(path, "rb") as segment:
+                        shutil.copyfileobj(segment, f)
+                f.flush()
+                os.fsync(f.fileno())
+            for path in part_paths:
+                os.remove(path)
+        else:
+            # The contents of mutable objects can change between attempts,
+            # so only downloads of immutable ones are resumed
+            self._discard_stale_parts(cap, part_path, [part_path])
+            await self._download_range(url, part_path, on_progress=on_progress)
+        os.replace(part_path, local_path)
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(part_path + ".cap")
+        log.debug("Successfully downloaded %s", local_path)
+
+    async def download(
+        self,
+        cap: str,
+        local_path: str,
+        progress: Optional[TransferProgress] = None,
+        segments: int = 1,
+    ) -> None:
+        """
+        Download the file at ``cap`` to ``local_path``.
+
+        Data is streamed into a temporary ".part" file next to
+        ``local_path``, which is moved into place once the download is
+        complete. If a previous download of the same immutable file was
+        interrupted, it is resumed with an HTTP Range request; a partial
+        download of any other capability to ``local_path`` is discarded.
+
+        :param segments: The number of byte-ranges of a large (at least
+            ``PARALLEL_DOWNLOAD_MIN_SIZE``) immutable file to download in
+            parallel.
+        """
+        if progress is not None:
+            progress.add_file(local_path, get_chk_size(cap) or 0)
+        await self.await_ready()
+        await self._download(cap, local_path, progress, segments)
+
+    async def download_many(
+        self,
+        downloads: list[tuple[str, str]],
+        concurrency: int = 4,
+        progress: Optional[TransferProgress] = None,
+        segments: int = 1,
+    ) -> dict[str, Exception]:
+        """
+        Download several files, at most ``concurrency`` at a time.
+
+        A failure to download one file does not abort the rest of the
+        batch; the errors for any files that could not be downloaded are
+        returned, keyed by local path.
+
+        :param downloads: A list of (cap, local path) pairs.
+        """
+        semaphore = DeferredSemaphore(concurrency)
+        errors: dict[str, Exception] = {}
+
+        async def download_one(cap: str, local_path: str) -> None:
+            await semaphore.acquire()
+            try:
+                await self.download(
+                    cap, local_path, progress=progress, segments=segments
+                )
+            except Exception as e:  # pylint: disable=broad-except
+                log.warning("Error downloading %s: %s", local_path, str(e))
+                errors[local_path] = e
+                if progress is not None:
+                    progress.fail(local_path, e)
+            else:
+                if progress is not None:
+                    progress.finish(local_path, cap)
+            finally:
+                semaphore.release()
+
+        await DeferredList(
+            [Deferred.fromCoroutine(download_one(c, p)) for c, p in downloads]
+        )
+        return errors
 
     async def link(self, dircap: str, childname: str, childcap: str) -> None:
         dircap_hash = trunchash(dircap)
@@ -633,11 +1205,12 @@ class Tahoe:
             dircap_hash,
         )
         await self.await_ready()
-        resp = await treq.post(
+        resp = await self.http.post(
             "{}uri/{}/?t=uri&name={}&uri={}".format(
                 self.nodeurl, dircap, childname, childcap
             )
         )
+        self.dircache.invalidate(dircap)
         if resp.code != 200:
             content = await treq.content(resp)
             raise TahoeWebError(content.decode("utf-8"))
@@ -648,17 +1221,43 @@ class Tahoe:
             dircap_hash,
         )
 
+    async def link_many(self, dircap: str, children: dict[str, str]) -> None:
+        """
+        Link several children into the directory at ``dircap`` with a
+        single ``t=set_children`` request (and, thus, a single update of
+        the mutable directory) instead of one ``t=uri`` request per child.
+
+        :param children: A mapping of child names to capabilities.
+        """
+        if not children:
+            return
+        dircap_hash = trunchash(dircap)
+        log.debug("Linking %i children into %s...", len(children), dircap_hash)
+        await self.await_ready()
+        resp = await self.http.post(
+            f"{self.nodeurl}uri/{dircap}/?t=set_children",
+            self._children_json(children),
+        )
+        self.dircache.invalidate(dircap)
+        if resp.code != 200:
+            content = await treq.content(resp)
+            raise TahoeWebError(content.decode("utf-8"))
+        log.debug(
+            "Done linking %i children into %s", len(children), dircap_hash
+        )
+
     async def unlink(
         self, dircap: str, childname: str, missing_ok: bool = False
     ) -> None:
         dircap_hash = trunchash(dircap)
         log.debug('Unlinking "%s" from %s...', childname, dircap_hash)
         await self.await_ready()
-        resp = await treq.post(
+        resp = await self.http.post(
             "{}uri/{}/?t=unlink&name={}".format(
                 self.nodeurl, dircap, childname
             )
         )
+        self.dircache.invalidate(dircap)
         if resp.code == 404 and missing_ok:
             pass
         elif resp.code != 200:
@@ -666,19 +1265,35 @@ class Tahoe:
             raise TahoeWebError(content.decode("utf-8"))
         log.debug('Done unlinking "%s" from %s', childname, dircap_hash)
 
-    async def get_json(self, cap: str) -> Optional[Union[dict, list]]:
+    async def get_json_content(self, cap: str) -> Optional[bytes]:
+        """
+        Get the raw (UTF-8 encoded) JSON representation of the object at
+        the given capability, from ``dircache`` if possible.
+        """
         if not cap or not self.nodeurl:
             return None
+        content = self.dircache.get(cap)
+        if content is not None:
+            return content
+        generation = self.dircache.generation(cap)
         uri = "{}uri/{}/?t=json".format(self.nodeurl, cap)
         try:
-            resp = await treq.get(uri)
+            resp = await self.http.get(uri)
         except ConnectError:
+            self.set_not_ready()
             return None
         if resp.code == 200:
             content = await treq.content(resp)
-            return json.loads(content.decode("utf-8"))
+            self.dircache.put(cap, content, generation)
+            return content
         return None
 
+    async def get_json(self, cap: str) -> Optional[Union[dict, list]]:
+        content = await self.get_json_content(cap)
+        if content is None:
+            return None
+        return json.loads(content.decode("utf-8"))
+
     async def get_cap(self, path: str) -> Optional[str]:
         json_output = await self.get_json(path)
         if not json_output:
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Progress reporting for bulk transfers to and from a Tahoe-LAFS grid.
+"""
+from __future__ import annotations
+
+from typing import IO, Callable
+
+from qtpy.QtCore import QObject, Signal
+
+
+class TransferProgress(QObject):
+    """
+    Report the progress of a batch of uploads (or downloads).
+
+    Byte counts are cumulative; the aggregate ``progress_updated`` signal
+    reports the number of bytes transferred so far across the whole batch
+    along with the total size of the batch.
+    """
+
+    # path, bytes transferred, total bytes
+    file_progress_updated = Signal(str, object, object)
+    # bytes transferred, total bytes (for the whole batch)
+    progress_updated = Signal(object, object)
+    file_finished = Signal(str, str)  # path, cap
+    file_failed = Signal(str, str)  # path, error message
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.total = 0
+        self.transferred = 0
+        self._files: dict[str, tuple[int, int]] = {}
+
+    def add_file(self, path: str, size: int) -> None:
+        self._files[path] = (0, size)
+        self.total += size
+
+    def update(self, path: str, num_bytes: int) -> None:
+        done, size = self._files.get(path, (0, 0))
+        done += num_bytes
+        self._files[path] = (done, size)
+        self.transferred += num_bytes
+        self.file_progress_updated.emit(path, done, size)
+        self.progress_updated.emit(self.transferred, self.total)
+
+    def finish(self, path: str, cap: str) -> None:
+        self.file_finished.emit(path, cap)
+
+    def fail(self, path: str, error: Exception) -> None:
+        self.file_failed.emit(path, str(error))
+
+
+class ProgressReader:
+    """
+    Wrap a file object such that ``callback`` is called with the number of
+    bytes returned by each ``read``. Seeking and telling are passed through
+    so that the wrapper can be given to ``FileBodyProducer``.
+    """
+
+    def __init__(self, f: IO[bytes], callback: Callable[[int], None]) -> None:
+        self._f = f
+        self._callback = callback
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._f.read(size)
+        if data:
+            self._callback(len(data))
+        return data
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self._f.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._f.tell()
+
+    def close(self) -> None:
+        self._f.close()
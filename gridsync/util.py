@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import collections
+import logging
+import os
 from binascii import hexlify, unhexlify
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from html.parser import HTMLParser
 from time import time
 from typing import TYPE_CHECKING, Callable, Coroutine, Optional, TypeVar, Union
@@ -63,6 +66,83 @@ def b58decode(s: str) -> bytes:  # Adapted from python-bitcoinlib
     return b"\x00" * pad + res
 
 
+# (created, levelname, name, funcName, msg, args, exc_text)
+LogRecordTuple = tuple[float, str, str, str, str, tuple, Optional[str]]
+
+
+def format_log_record(record: LogRecordTuple) -> str:
+    """
+    Format a log record that was captured (as a tuple) by ``DequeHandler``.
+    """
+    created, levelname, _, func_name, msg, args, exc_text = record
+    if args:
+        try:
+            msg = msg % args
+        except (TypeError, ValueError):
+            msg = f"{msg} {args!r}"
+    asctime = datetime.fromtimestamp(created, timezone.utc).isoformat()
+    formatted = f"{asctime} {levelname} {func_name} {msg}"
+    if exc_text:
+        formatted = f"{formatted}\n{exc_text}"
+    return formatted
+
+
+class DequeHandler(logging.Handler):
+    """
+    Capture log records (as ``LogRecordTuple`` tuples) in the given deque.
+    Records are only formatted -- with ``format_log_record`` -- when the
+    log is viewed or exported. Messages and arguments longer than ``max_length`` characters
+    are truncated.
+    """
+
+    # Arguments of these (immutable) types are stored as-is; messages with
+    # any other arguments are formatted immediately instead.
+    _LAZY_ARG_TYPES = (str, bytes, int, float, type(None))
+
+    def __init__(
+        self, deque: collections.deque, max_length: int = 4096
+    ) -> None:
+        super().__init__()
+        self.deque = deque
+        self.max_length = max_length
+
+    def _truncate(self, value: object) -> object:
+        if isinstance(value, (str, bytes)) and len(value) > self.max_length:
+            extra = len(value) - self.max_length
+            return f"{str(value)[: self.max_length]}... ({extra} truncated)"
+        return value
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            msg = record.msg
+            args = record.args
+            if (
+                isinstance(msg, str)
+                and isinstance(args, tuple)
+                and all(isinstance(a, self._LAZY_ARG_TYPES) for a in args)
+            ):
+                args = tuple(self._truncate(a) for a in args)
+            else:
+                msg = record.getMessage()
+                args = ()
+            exc_text = None
+            if record.exc_info:
+                exc_text = logging.Formatter().formatException(record.exc_info)
+            self.deque.append(
+                (
+                    record.created,
+                    record.levelname,
+                    record.name,
+                    record.funcName,
+                    self._truncate(msg),
+                    args,
+                    exc_text,
+                )
+            )
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(record)
+
+
 def to_bool(s: str) -> bool:
     if s.lower() in ("false", "f", "no", "n", "off", "0", "none", ""):
         return False
@@ -231,3 +311,55 @@ class Poller:
         Schedule the next polling iteration.
         """
         deferLater(self.clock, self.interval, self._iterate_poll)
+
+
+class PathTrie:
+    """
+    A trie of filesystem paths (split into their components), each mapped
+    to a value, for finding the value of the longest registered path that
+    contains a given path in time proportional to the depth of the given
+    path (rather than to the number of registered paths).
+    """
+
+    # Components are never empty, so the empty string can't collide
+    _VALUE = ""
+
+    def __init__(self, paths: Optional[dict[str, str]] = None) -> None:
+        self._root: dict = {}
+        for path, value in (paths or {}).items():
+            self.add(path, value)
+
+    @staticmethod
+    def _components(path: str) -> list[str]:
+        return [c for c in os.path.normpath(path).split(os.sep) if c]
+
+    def add(self, path: str, value: str) -> None:
+        node = self._root
+        for component in self._components(path):
+            node = node.setdefault(component, {})
+        node[self._VALUE] = value
+
+    def lookup(self, path: str) -> Optional[tuple[str, str]]:
+        """
+        Find the longest registered path that is (or contains) ``path``.
+
+        :returns: The value of that registered path along with ``path``
+            relative to it (or "" if they are the same), or ``None`` if no
+            registered path contains ``path``.
+        """
+        components = self._components(path)
+        node = self._root
+        match = None
+        if self._VALUE in node:
+            match = (node[self._VALUE], 0)
+        for depth, component in enumerate(components, start=1):
+            child = node.get(component)
+            if child is None:
+                break
+            node = child
+            if self._VALUE in node:
+                match = (node[self._VALUE], depth)
+        if match is None:
+            return None
+        value, depth = match
+        return value, os.path.join("", *components[depth:])
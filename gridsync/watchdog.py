@@ -1,10 +1,18 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Optional, Union
 
 from qtpy.QtCore import QObject, Signal
-from watchdog.events import FileSystemEventHandler
+from watchdog.events import (
+    EVENT_TYPE_CREATED,
+    EVENT_TYPE_DELETED,
+    EVENT_TYPE_MOVED,
+    FileSystemEventHandler,
+)
 from watchdog.observers import Observer
 
 if TYPE_CHECKING:
@@ -13,29 +21,131 @@ if TYPE_CHECKING:
 
 
 class _WatchdogEventHandler(FileSystemEventHandler):
-    def __init__(self, watchdog: Watchdog, path: str):
+    """
+    Collect the events for a single watched path (on the observer thread)
+    and pass them on to the ``Watchdog`` in batches.
+
+    A batch is delivered once no new events have arrived for
+    ``quiet_period`` seconds or once ``max_delay`` seconds have passed since
+    the first event in the batch, whichever comes first, so that a burst
+    of events (e.g., from extracting a large archive) results in a single
+    notification rather than one per event.
+    """
+
+    def __init__(
+        self,
+        watchdog: Watchdog,
+        path: str,
+        quiet_period: float = 0.25,
+        max_delay: float = 2.0,
+    ):
         super().__init__()
         self._watchdog = watchdog
         self._path = path
+        self.quiet_period = quiet_period
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._relpaths: set[str] = set()
+        self._directories_changed = False
+        self._first_event_time: float = 0.0
+        self._last_event_time: float = 0.0
+        self._timer: Optional[threading.Timer] = None
 
-    def on_any_event(self, event: FileSystemEvent) -> None:
+    def _relpath(self, path: Union[str, bytes]) -> str:
+        return os.path.relpath(os.fsdecode(path), self._path)
+
+    def _start_timer(self, delay: float) -> None:
+        self._timer = threading.Timer(delay, self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            if threading.current_thread() is not self._timer:
+                return  # Cancelled (or replaced) after it had already fired
+            if not self._relpaths:
+                self._timer = None
+                return
+            now = time.monotonic()
+            quiet_remaining = self.quiet_period - (now - self._last_event_time)
+            delay_remaining = self.max_delay - (now - self._first_event_time)
+            if quiet_remaining > 0 and delay_remaining > 0:
+                self._start_timer(min(quiet_remaining, delay_remaining))
+                return
+            relpaths = sorted(self._relpaths)
+            directories_changed = self._directories_changed
+            self._relpaths = set()
+            self._directories_changed = False
+            self._timer = None
         self._watchdog.path_modified.emit(self._path)
+        self._watchdog.paths_modified.emit(
+            self._path, relpaths, directories_changed
+        )
+
+    def on_any_event(self, event: FileSystemEvent) -> None:
+        with self._lock:
+            self._relpaths.add(self._relpath(event.src_path))
+            dest_path = getattr(event, "dest_path", "")
+            if dest_path:
+                self._relpaths.add(self._relpath(dest_path))
+            if event.is_directory and event.event_type in (
+                EVENT_TYPE_CREATED,
+                EVENT_TYPE_DELETED,
+                EVENT_TYPE_MOVED,
+            ):
+                self._directories_changed = True
+            now = time.monotonic()
+            self._last_event_time = now
+            if self._timer is None:
+                self._first_event_time = now
+                self._start_timer(self.quiet_period)
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._relpaths = set()
+            self._directories_changed = False
 
 
 class Watchdog(QObject):
+    """
+    Watch directories (recursively) for changes.
+
+    :ivar Signal path_modified: Emitted with the watched path when
+        something beneath it has changed.
+    :ivar Signal paths_modified: Emitted (along with ``path_modified``)
+        with the watched path, a sorted list of the paths -- relative to
+        the watched path -- that changed, and whether any directories
+        were created, deleted, or moved (in which case the contents of
+        those directories might not be listed individually).
+
+    Events are batched per watched path; see ``_WatchdogEventHandler``.
+    """
 
     path_modified = Signal(str)
+    paths_modified = Signal(str, list, bool)  # path, relpaths, dirs changed
 
-    def __init__(self) -> None:
+    def __init__(
+        self, quiet_period: float = 0.25, max_delay: float = 2.0
+    ) -> None:
         super().__init__()
+        self.quiet_period = quiet_period
+        self.max_delay = max_delay
         self._observer = Observer()
         self._watches: dict[str, ObservedWatch] = {}
+        self._handlers: dict[str, _WatchdogEventHandler] = {}
 
     def add_watch(self, path: str) -> None:
         logging.debug("Scheduling watch for %s...", path)
+        handler = _WatchdogEventHandler(
+            self, path, self.quiet_period, self.max_delay
+        )
         self._watches[path] = self._observer.schedule(
-            _WatchdogEventHandler(self, path), path, recursive=True
+            handler, path, recursive=True
         )
+        self._handlers[path] = handler
         logging.debug("Watch scheduled for %s", path)
 
     def remove_watch(self, path: str) -> None:
@@ -45,6 +155,9 @@ class Watchdog(QObject):
             del self._watches[path]
         except KeyError:
             pass
+        handler = self._handlers.pop(path, None)
+        if handler is not None:
+            handler.cancel()
         logging.debug("Watch unscheduled for %s", path)
 
     def stop(self) -> None:
@@ -52,6 +165,8 @@ class Watchdog(QObject):
             logging.warning("Tried to stop Watchdog that wasn't started.")
             return
         logging.debug("Stopping Watchdog...")
+        for handler in self._handlers.values():
+            handler.cancel()
         self._observer.stop()
         try:
             self._observer.join()
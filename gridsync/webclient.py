@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+A per-gateway HTTP client for the Tahoe-LAFS, Magic-Folder and
+ZKAPAuthorizer web APIs.
+"""
+from __future__ import annotations
+
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+    cast,
+)
+
+import treq
+from twisted.internet.defer import Deferred, maybeDeferred
+from twisted.internet.interfaces import IReactorTime, ITransport
+from twisted.internet.protocol import Protocol, connectionDone
+from twisted.python.failure import Failure
+from twisted.web.client import HTTPConnectionPool
+
+if TYPE_CHECKING:
+    from treq._types import _DataType, _HeadersType, _ParamsType
+
+    from gridsync.types import TreqResponse
+
+HeadersType = Mapping[str, Union[str, Sequence[str]]]
+
+
+def _treq_headers(headers: Optional[HeadersType]) -> Optional[_HeadersType]:
+    # treq accepts any mapping of header names to values (or to lists of
+    # values) but annotates its headers with invariant dict types, which
+    # reject e.g. a dict[str, str].
+    return cast("Optional[_HeadersType]", headers)
+
+
+class _BodyProtocol(Protocol):
+    """
+    Deliver a response body to ``original``, calling ``on_done`` once the
+    whole body has been received (or the connection was lost).
+    """
+
+    def __init__(self, original: Protocol, on_done: Callable[[], None]):
+        self.original = original
+        self._on_done = on_done
+
+    def makeConnection(self, transport: ITransport) -> None:
+        self.original.makeConnection(transport)
+
+    def dataReceived(self, data: bytes) -> None:
+        self.original.dataReceived(data)
+
+    def connectionLost(self, reason: Failure = connectionDone) -> None:
+        self._on_done()
+        self.original.connectionLost(reason)
+
+
+class WebClient:
+    """
+    Send HTTP requests through a persistent connection pool that belongs to
+    a single gateway, rather than through treq's global default pool (which
+    is shared by every gateway and keeps only two connections per host).
+
+    :ivar pool: The ``HTTPConnectionPool`` used for every request.
+
+    :ivar in_flight: The number of requests that have been sent but for
+        which neither the whole response body nor an error has been
+        received yet. A response whose body is never read stays in flight.
+    """
+
+    def __init__(
+        self,
+        reactor: Optional[IReactorTime] = None,
+        max_persistent_per_host: int = 16,
+        cached_connection_timeout: int = 120,
+    ) -> None:
+        if reactor is None:
+            from twisted.internet import reactor as reactor_
+
+            reactor = reactor_
+        self.pool = HTTPConnectionPool(reactor, persistent=True)
+        self.pool.maxPersistentPerHost = max_persistent_per_host
+        self.pool.cachedConnectionTimeout = cached_connection_timeout
+        self.pool.retryAutomatically = True
+        self.in_flight: int = 0
+
+    def _finished(self) -> None:
+        self.in_flight -= 1
+
+    def _failed(self, failure: Failure) -> Failure:
+        self._finished()
+        return failure
+
+    def _track_body(self, response: TreqResponse) -> TreqResponse:
+        deliver_body = response.deliverBody
+
+        def deliver_tracked_body(protocol: Protocol) -> None:
+            # A (buffered) body may be delivered more than once; only the
+            # first delivery finishes the request.
+            response.deliverBody = deliver_body
+            deliver_body(_BodyProtocol(protocol, self._finished))
+
+        response.deliverBody = deliver_tracked_body
+        return response
+
+    def _send(
+        self, f: Callable[[], Deferred[TreqResponse]]
+    ) -> Deferred[TreqResponse]:
+        self.in_flight += 1
+        d = maybeDeferred(f)
+        d.addCallbacks(self._track_body, self._failed)
+        return d
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        data: Optional[_DataType] = None,
+        params: Optional[_ParamsType] = None,
+        headers: Optional[HeadersType] = None,
+    ) -> Deferred[TreqResponse]:
+        return self._send(
+            lambda: treq.request(
+                method,
+                url,
+                data,
+                params=params,
+                headers=_treq_headers(headers),
+                pool=self.pool,
+            )
+        )
+
+    def get(
+        self,
+        url: str,
+        params: Optional[_ParamsType] = None,
+        headers: Optional[HeadersType] = None,
+    ) -> Deferred[TreqResponse]:
+        return self._send(
+            lambda: treq.get(
+                url,
+                params=params,
+                headers=_treq_headers(headers),
+                pool=self.pool,
+            )
+        )
+
+    def post(
+        self,
+        url: str,
+        data: Optional[_DataType] = None,
+        params: Optional[_ParamsType] = None,
+        headers: Optional[HeadersType] = None,
+    ) -> Deferred[TreqResponse]:
+        return self._send(
+            lambda: treq.post(
+                url,
+                data,
+                params=params,
+                headers=_treq_headers(headers),
+                pool=self.pool,
+            )
+        )
+
+    def put(
+        self,
+        url: str,
+        data: Optional[_DataType] = None,
+        params: Optional[_ParamsType] = None,
+        headers: Optional[HeadersType] = None,
+    ) -> Deferred[TreqResponse]:
+        return self._send(
+            lambda: treq.put(
+                url,
+                data,
+                params=params,
+                headers=_treq_headers(headers),
+                pool=self.pool,
+            )
+        )
+
+    def close(self) -> Deferred[None]:
+        """
+        Close any idle persistent connections held by the pool.
+        """
+        return self.pool.closeCachedConnections()
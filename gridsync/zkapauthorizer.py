@@ -55,7 +55,7 @@ class ZKAPAuthorizer:
     def _request(
         self, method: str, path: str, data: Optional[bytes] = None
     ) -> TwistedDeferred[tuple[int, str]]:
-        resp = yield treq.request(
+        resp = yield self.gateway.http.request(
             method,
             f"{self.gateway.nodeurl}storage-plugins/{PLUGIN_NAME}{path}",
             headers={
@@ -78,17 +78,26 @@ class ZKAPAuthorizer:
 
     @inlineCallbacks
     def _get_content(self, cap: str) -> TwistedDeferred[bytes]:
-        resp = yield treq.get(f"{self.gateway.nodeurl}uri/{cap}")
+        resp = yield self.gateway.http.get(f"{self.gateway.nodeurl}uri/{cap}")
         if resp.code == 200:
             content = yield treq.content(resp)
             return content
         raise TahoeWebError(f"Error getting cap content: {resp.code}")
 
+    @inlineCallbacks
+    def _get_json_content(self, cap: str) -> TwistedDeferred[bytes]:
+        content = yield Deferred.fromCoroutine(
+            self.gateway.get_json_content(cap)
+        )
+        if content is None:
+            raise TahoeWebError("Error getting directory contents")
+        return content
+
     @inlineCallbacks
     def get_sizes(self) -> TwistedDeferred[list[Optional[int]]]:
         sizes: list = []
         rootcap = self.gateway.get_rootcap()
-        rootcap_bytes = yield self._get_content(f"{rootcap}/?t=json")
+        rootcap_bytes = yield self._get_json_content(rootcap)
         if not rootcap_bytes:
             return sizes
         sizes.append(len(rootcap_bytes))
@@ -100,7 +109,7 @@ class ZKAPAuthorizer:
                 if rw_uri:  # Only care about dirs the user can write to
                     dircaps.append(rw_uri)
             for dircap in dircaps:
-                dircap_bytes = yield self._get_content(f"{dircap}/?t=json")
+                dircap_bytes = yield self._get_json_content(dircap)
                 sizes.append(len(dircap_bytes))
                 dircap_data = json.loads(dircap_bytes.decode("utf-8"))
                 for data in dircap_data[1]["children"].values():
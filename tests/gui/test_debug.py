@@ -31,7 +31,13 @@ def test_warning_text_module_variable_is_not_none():
 def core():
     fake_core = Mock()
     fake_core.tahoe_version = "9.999"
-    fake_core.log_deque = deque(["debug msg 1", "/test/tahoe", "debug msg 3"])
+    fake_core.log_deque = deque(
+        [
+            (0.0, "DEBUG", "root", "test", "debug msg %s", (1,), None),
+            (0.0, "DEBUG", "root", "test", "/test/tahoe", (), None),
+            (0.0, "DEBUG", "root", "test", "debug msg %s", (3,), None),
+        ]
+    )
     fake_gateway = Mock()
     fake_gateway.executable = "/test/tahoe"
     fake_gateway.name = "TestGridOne"
@@ -44,6 +50,12 @@ def core():
     fake_gateway.get_streamed_log_messages = Mock(
         return_value=['{"test": 123}']
     )
+    fake_gateway.magic_folder.iter_log_messages = Mock(
+        return_value=iter([b'{"test": 123}'])
+    )
+    fake_gateway.iter_streamed_log_messages = Mock(
+        return_value=iter([b'{"test": 123}'])
+    )
     fake_gateway.get_settings = Mock(return_value={})
     fake_core.gateways = [fake_gateway]
     fake_core.gui.main_window.gateways = fake_core.gateways
@@ -74,6 +86,17 @@ def test_log_loader_load_warning_text_in_filtered_content(core):
     assert warning_text in log_loader.filtered_content
 
 
+def test_log_loader_reuses_redactor_until_filters_change(core):
+    log_loader = LogLoader(core)
+    log_loader.load()
+    redactor = log_loader._redactor
+    log_loader.load()
+    reused = log_loader._redactor is redactor
+    core.gateways[0].executable = "/test/other/tahoe"
+    log_loader.load()
+    assert (reused, log_loader._redactor is redactor) == (True, False)
+
+
 @pytest.mark.parametrize(
     "checkbox_state, expected_content",
     [
@@ -22,3 +22,14 @@ def test_watchdog_emits_path_modified_signal(watchdog, tmp_path, qtbot):
         file_path = tmp_path / "File.txt"
         file_path.write_text("")
     assert blocker.args == [str(tmp_path)]
+
+
+@pytest.mark.skipif(
+    "CI" in os.environ, reason="Flakey on public infrastructure"
+)
+def test_watchdog_emits_paths_modified_signal(watchdog, tmp_path, qtbot):
+    watchdog.add_watch(str(tmp_path))
+    with qtbot.wait_signal(watchdog.paths_modified) as blocker:
+        for i in range(100):
+            (tmp_path / f"File-{i}.txt").write_text("")
+    assert "File-0.txt" in blocker.args[1]
@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 
 import os
+from unittest.mock import MagicMock, Mock
+
+import pytest
+from atomicwrites import atomic_write
 
 from gridsync.config import Config
 
@@ -45,3 +49,50 @@ def test_config_load(tmpdir):
     with open(config.filename, "w") as f:
         f.write("[test_section]\ntest_option = test_value\n\n")
     assert config.load() == {"test_section": {"test_option": "test_value"}}
+
+
+def test_config_get_parses_file_once(tmpdir, monkeypatch):
+    config = Config(os.path.join(str(tmpdir), "test_get_cached.ini"))
+    with open(config.filename, "w") as f:
+        f.write("[test_section]\ntest_option = test_value\n\n")
+    config.get("test_section", "test_option")
+    monkeypatch.setattr(
+        "gridsync.config.RawConfigParser.read",
+        Mock(side_effect=AssertionError("File was parsed again")),
+    )
+    assert config.get("test_section", "test_option") == "test_value"
+
+
+def test_config_get_rereads_file_when_changed(tmpdir):
+    config = Config(os.path.join(str(tmpdir), "test_get_changed.ini"))
+    with open(config.filename, "w") as f:
+        f.write("[test_section]\ntest_option = test_value\n\n")
+    config.get("test_section", "test_option")
+    with open(config.filename, "w") as f:
+        f.write("[test_section]\ntest_option = changed_value\n\n")
+    assert config.get("test_section", "test_option") == "changed_value"
+
+
+def test_config_batch_writes_once(tmpdir, monkeypatch):
+    config = Config(os.path.join(str(tmpdir), "test_batch.ini"))
+    fake_atomic_write = MagicMock(wraps=atomic_write)
+    monkeypatch.setattr("gridsync.config.atomic_write", fake_atomic_write)
+    with config.batch():
+        config.set("test_section", "option_1", "value_1")
+        config.set("test_section", "option_2", "value_2")
+        assert config.get("test_section", "option_1") == "value_1"
+    assert fake_atomic_write.call_count == 1
+    with open(config.filename) as f:
+        assert f.read() == (
+            "[test_section]\noption_1 = value_1\noption_2 = value_2\n\n"
+        )
+
+
+def test_config_batch_discards_changes_on_error(tmpdir):
+    config = Config(os.path.join(str(tmpdir), "test_batch_error.ini"))
+    config.set("test_section", "test_option", "test_value")
+    with pytest.raises(ValueError):
+        with config.batch():
+            config.set("test_section", "test_option", "changed_value")
+            raise ValueError()
+    assert config.get("test_section", "test_option") == "test_value"
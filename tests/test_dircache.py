@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from gridsync.capabilities import diminish
+from gridsync.dircache import DirectoryCache, is_immutable
+
+ROOTCAP = (
+    "URI:DIR2:x6ciqn3dbnkslpvazwz6z7ic2q:"
+    "slkf7invl5apcabpyztxazkcufmptsclx7m3rn6hhiyuiz2hvu6a"
+)
+
+
+@pytest.mark.parametrize(
+    "cap,expected",
+    [
+        ("URI:DIR2-CHK:aaaa:bbbb:1:1:100", True),
+        ("URI:DIR2-LIT:aaaa", True),
+        ("URI:DIR2-CHK:aaaa:bbbb:1:1:100/child", True),
+        ("URI:DIR2-Verifier:aaaa:bbbb", True),
+        ("URI:DIR2:aaaa:bbbb", False),
+        ("URI:DIR2-RO:aaaa:bbbb", False),
+        ("URI:DIR2-MDMF:aaaa:bbbb", False),
+    ],
+)
+def test_is_immutable(cap, expected):
+    assert is_immutable(cap) is expected
+
+
+def test_get_miss_counted():
+    cache = DirectoryCache()
+    assert (cache.get(ROOTCAP), cache.misses) == (None, 1)
+
+
+def test_get_hit_counted():
+    cache = DirectoryCache()
+    cache.put(ROOTCAP, b"[]")
+    assert (cache.get(ROOTCAP), cache.hits) == (b"[]", 1)
+
+
+def test_mutable_entry_expires(monkeypatch):
+    cache = DirectoryCache(ttl=10)
+    monkeypatch.setattr("time.monotonic", lambda: 100)
+    cache.put(ROOTCAP, b"[]")
+    monkeypatch.setattr("time.monotonic", lambda: 111)
+    assert cache.get(ROOTCAP) is None
+
+
+def test_immutable_entry_does_not_expire(monkeypatch):
+    cache = DirectoryCache(ttl=10)
+    cap = "URI:DIR2-CHK:aaaa:bbbb:1:1:100"
+    monkeypatch.setattr("time.monotonic", lambda: 100)
+    cache.put(cap, b"[]")
+    monkeypatch.setattr("time.monotonic", lambda: 100000)
+    assert cache.get(cap) == b"[]"
+
+
+def test_least_recently_used_entry_evicted():
+    cache = DirectoryCache(maxsize=2)
+    cache.put("URI:DIR2:a:a", b"a")
+    cache.put("URI:DIR2:b:b", b"b")
+    cache.get("URI:DIR2:a:a")
+    cache.put("URI:DIR2:c:c", b"c")
+    assert cache.get("URI:DIR2:b:b") is None
+
+
+def test_invalidate_drops_read_only_form_of_dircap():
+    cache = DirectoryCache()
+    cache.put(ROOTCAP, b"[]")
+    cache.put(diminish(ROOTCAP), b"[]")
+    cache.invalidate(ROOTCAP)
+    assert len(cache) == 0
+
+
+def test_paths_beneath_mutable_dircap_not_cached():
+    cache = DirectoryCache()
+    cache.put(ROOTCAP + "/v1", b"[]")
+    assert cache.get(ROOTCAP + "/v1") is None
+
+
+def test_paths_beneath_immutable_dircap_cached():
+    cache = DirectoryCache()
+    cache.put("URI:DIR2-CHK:aaaa:bbbb:1:1:100/v1", b"[]")
+    assert cache.get("URI:DIR2-CHK:aaaa:bbbb:1:1:100/v1") == b"[]"
+
+
+def test_invalidate_keeps_other_dircaps():
+    cache = DirectoryCache()
+    cache.put(ROOTCAP, b"[]")
+    cache.put("URI:DIR2:other:other", b"[]")
+    cache.invalidate(ROOTCAP)
+    assert cache.get("URI:DIR2:other:other") == b"[]"
+
+
+def test_put_discards_listing_fetched_before_invalidation():
+    cache = DirectoryCache()
+    generation = cache.generation(ROOTCAP)
+    cache.invalidate(ROOTCAP)
+    cache.put(ROOTCAP, b"[]", generation)
+    assert cache.get(ROOTCAP) is None
+
+
+def test_put_keeps_listing_if_other_dircap_invalidated():
+    cache = DirectoryCache()
+    generation = cache.generation(ROOTCAP)
+    cache.invalidate("URI:DIR2:other:other")
+    cache.put(ROOTCAP, b"[]", generation)
+    assert cache.get(ROOTCAP) == b"[]"
+
+
+def test_stats():
+    cache = DirectoryCache()
+    cache.put(ROOTCAP, b"[]")
+    cache.get(ROOTCAP)
+    cache.get("URI:DIR2:other:other")
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
@@ -9,7 +9,9 @@ import pytest
 
 from gridsync import autostart_file_path, config_dir, pkgdir
 from gridsync.filter import (
+    Redactor,
     apply_filters,
+    dump_eliot_logs,
     filter_eliot_logs,
     filter_tahoe_log_message,
     get_filters,
@@ -154,6 +156,58 @@ def test_apply_filters_filtered_string_in_result(core, string, filtered):
     assert "<Filtered:{}>".format(filtered) in result
 
 
+def _apply_filters_sequentially(in_str, filters):
+    for s, mask in filters:
+        if s and mask:
+            in_str = in_str.replace(s, "<Filtered:{}>".format(mask))
+    return in_str
+
+
+@pytest.mark.parametrize(
+    "filters,in_str",
+    [
+        # Earlier filters take precedence at the same position
+        ([("Test", "A"), ("TestFolder", "B")], "TestFolder"),
+        ([("TestFolder", "B"), ("Test", "A")], "TestFolder Test"),
+        # An earlier filter that begins in the middle of a later one
+        ([("Folder", "A"), ("/tmp/Folder", "B")], "/tmp/Folder"),
+        ([("bcd", "A"), ("abc", "B")], "abcd abc bcd"),
+        # A later filter that matches (part of) an earlier filter's mask
+        ([("abc", "A"), ("Filtered", "B")], "abc Filtered"),
+        ([("abc", "A"), ("A>x", "B")], "abcx"),
+        # Duplicate and empty filters
+        ([("abc", "A"), ("abc", "B"), ("", "C"), (None, "D")], "abc"),
+        ([("aa", "A")], "aaa aaaa"),
+    ],
+)
+def test_apply_filters_matches_sequential_replacement(filters, in_str):
+    assert apply_filters(in_str, filters) == _apply_filters_sequentially(
+        in_str, filters
+    )
+
+
+def test_apply_filters_matches_sequential_replacement_for_log(core):
+    filters = get_filters(core)
+    in_str = "\n".join(
+        "{} synced {}/file{}.txt".format(s, s, i)
+        for i, (s, _) in enumerate(filters)
+        if s
+    )
+    assert apply_filters(in_str, filters) == _apply_filters_sequentially(
+        in_str, filters
+    )
+
+
+def test_redactor_uses_a_single_pass_for_independent_filters():
+    filters = [("/tmp/test", "Path"), ("test", "Name"), ("/tmp", "Dir")]
+    assert len(Redactor(filters).passes) == 1
+
+
+def test_redactor_uses_another_pass_if_filter_contains_earlier_filter():
+    filters = [("test", "Name"), ("/tmp/test", "Path")]
+    assert len(Redactor(filters).passes) == 2
+
+
 @pytest.mark.parametrize(
     "msg,keys",
     [
@@ -657,3 +711,31 @@ def test_filter_eliot_logs_apply_filter_use_identifier():
 def test_join_eliot_logs_sort_output():
     messages = ['{"C": 3, "A": 1, "B": 2}']
     assert join_eliot_logs(messages) == '{"A": 1, "B": 2, "C": 3}'
+
+
+def test_dump_eliot_logs_matches_join_and_filter_eliot_logs():
+    messages = [
+        '{"action_type": "magic-folder:full-scan", "nickname": "TestGrid"}',
+        '{"C": 3, "A": 1, "B": 2}',
+        '{"message_type": "processing", "info": "secret"}',
+    ] * 5
+    assert dump_eliot_logs(messages, "1", chunk_size=2) == (
+        join_eliot_logs(messages),
+        join_eliot_logs(filter_eliot_logs(messages, "1")),
+    )
+
+
+def test_dump_eliot_logs_decodes_each_message_once(monkeypatch):
+    loads = Mock(wraps=json.loads)
+    monkeypatch.setattr("gridsync.filter.json.loads", loads)
+    messages = [b'{"nickname": "TestGrid"}'] * 10
+    dump_eliot_logs(iter(messages), "1", chunk_size=3)
+    assert loads.call_count == 10
+
+
+def test_dump_eliot_logs_skips_malformed_messages():
+    messages = ['{"A": 1}', "{", "[1, 2]", '{"B": 2}']
+    assert dump_eliot_logs(messages) == (
+        '{"A": 1}\n{"B": 2}',
+        '{"A": 1}\n{"B": 2}',
+    )
@@ -0,0 +1,50 @@
+import json
+from collections import deque
+
+import pytest
+
+from gridsync.logring import LogRing
+
+
+@pytest.mark.parametrize("maxlen", [0, 1, 3, 10, None])
+@pytest.mark.parametrize("block_size", [1, 4, 7])
+def test_log_ring_keeps_most_recent_messages_like_a_deque(maxlen, block_size):
+    ring = LogRing(maxlen=maxlen, block_size=block_size)
+    expected: deque = deque(maxlen=maxlen)
+    for i in range(50):
+        message = str(i).encode()
+        ring.append(message)
+        expected.append(message)
+        assert list(ring) == list(expected)
+        assert len(ring) == len(expected)
+
+
+def test_log_ring_drops_oldest_blocks_to_stay_within_byte_budget():
+    ring = LogRing(max_bytes=1000, block_size=10)
+    for i in range(1000):
+        ring.append(json.dumps({"i": i}).encode())
+    assert ring.memory_usage() <= 1000
+    messages = list(ring)
+    assert 0 < len(messages) == len(ring) < 1000
+    assert messages[-1] == b'{"i": 999}'
+
+
+def test_log_ring_compresses_messages():
+    ring = LogRing(block_size=100)
+    messages = [
+        json.dumps({"timestamp": 1600000000 + i, "task_uuid": "abc"}).encode()
+        for i in range(1000)
+    ]
+    for message in messages:
+        ring.append(message)
+    assert ring.memory_usage() * 10 < sum(len(m) for m in messages)
+    assert list(ring) == messages
+
+
+def test_log_ring_clear():
+    ring = LogRing(block_size=2)
+    for i in range(5):
+        ring.append(b"message")
+    ring.clear()
+    assert list(ring) == []
+    assert len(ring) == 0
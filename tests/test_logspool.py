@@ -0,0 +1,48 @@
+from gridsync.logspool import LogSpool
+
+
+def test_log_spool_returns_appended_messages(tmp_path):
+    spool = LogSpool(tmp_path)
+    spool.append(b'{"a": 1}')
+    spool.append(b'{"b": 2}')
+    assert list(spool) == [b'{"a": 1}', b'{"b": 2}']
+    spool.close()
+
+
+def test_log_spool_persists_messages_across_instances(tmp_path):
+    spool = LogSpool(tmp_path)
+    spool.append(b"first")
+    spool.close()
+    spool = LogSpool(tmp_path)
+    spool.append(b"second")
+    assert list(spool) == [b"first", b"second"]
+    spool.close()
+
+
+def test_log_spool_rotates_segments(tmp_path):
+    spool = LogSpool(tmp_path, segment_size=100)
+    for i in range(100):
+        spool.append(b"message %d" % i)
+    spool.close()
+    assert len(spool.segments()) > 1
+    assert list(spool) == [b"message %d" % i for i in range(100)]
+
+
+def test_log_spool_removes_oldest_segments(tmp_path):
+    spool = LogSpool(tmp_path, max_bytes=500, segment_size=100)
+    for i in range(1000):
+        spool.append(b"message %d" % i)
+    spool.close()
+    messages = list(spool)
+    assert sum(p.stat().st_size for p in spool.segments()) <= 600
+    assert messages[-1] == b"message 999"
+    assert b"message 0" not in messages
+
+
+def test_log_spool_ignores_partially_written_message(tmp_path):
+    spool = LogSpool(tmp_path)
+    spool.append(b"complete")
+    spool.close()
+    with open(spool.segments()[-1], "ab") as f:
+        f.write(b"incompl")
+    assert list(spool) == [b"complete"]
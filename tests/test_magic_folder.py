@@ -1,9 +1,15 @@
+import os
 from pathlib import Path
+from unittest.mock import Mock
 
 import pytest
+from pytest_twisted import ensureDeferred
+from twisted.internet.defer import succeed
 
 from gridsync.crypto import randstr
 from gridsync.magic_folder import (
+    AdaptiveIntervals,
+    FileStatusIndex,
     MagicFolder,
     MagicFolderConfigError,
     MagicFolderError,
@@ -58,6 +64,66 @@ def test__read_api_port_raises_magic_folder_config_error_if_not_int(tmp_path):
         magic_folder._read_api_port()
 
 
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        ['{"timestamp": 1, "task_uuid": "abc"}', True],
+        ['{"task_uuid": "abc"}', False],
+        ['Traceback: {"timestamp": 1, "task_uuid": "abc"}', False],
+        ['{"timestamp": 1, "task_uuid": "abc"', False],
+    ],
+)
+def test__is_eliot_log_message(line, expected):
+    assert MagicFolder._is_eliot_log_message(line) is expected
+
+
+def test_on_stderr_line_received_stores_raw_eliot_line(tmp_path):
+    magic_folder = MagicFolder(Tahoe(tmp_path / "nodedir"))
+    line = '{"task_uuid": "abc",  "timestamp": 1}'
+    magic_folder.on_stderr_line_received(line)
+    assert list(magic_folder._log_buffer) == [line.encode("utf-8")]
+
+
+def test_get_log_messages_returns_shape_checked_messages(tmp_path):
+    magic_folder = MagicFolder(Tahoe(tmp_path / "nodedir"))
+    magic_folder.on_stderr_line_received('{"task_uuid": "a", "timestamp": 1}')
+    magic_folder.on_stderr_line_received('{"task_uuid": "b" "timestamp": 2}')
+    assert magic_folder.get_log_messages() == [
+        '{"task_uuid": "a", "timestamp": 1}',
+        '{"task_uuid": "b" "timestamp": 2}',
+    ]
+
+
+def test_await_running_returns_immediately_if_running(tmp_path):
+    magic_folder = MagicFolder(Tahoe(tmp_path / "nodedir"))
+    magic_folder.running = True
+    assert magic_folder.await_running().called
+
+
+def test_await_running_waiters_resume_when_started(tmp_path, monkeypatch):
+    magic_folder = MagicFolder(Tahoe(tmp_path / "nodedir"))
+    monkeypatch.setattr(magic_folder, "_read_api_token", lambda: "Token")
+    monkeypatch.setattr(magic_folder, "_read_api_port", lambda: 1234)
+    monkeypatch.setattr(magic_folder.monitor, "start", lambda: None)
+    waiters = [magic_folder.await_running() for _ in range(3)]
+    assert not any(d.called for d in waiters)
+    magic_folder._on_started()
+    assert all(d.called for d in waiters)
+
+
+def test_await_running_waits_again_after_restart(tmp_path, monkeypatch):
+    magic_folder = MagicFolder(Tahoe(tmp_path / "nodedir"))
+    monkeypatch.setattr(magic_folder, "_read_api_token", lambda: "Token")
+    monkeypatch.setattr(magic_folder, "_read_api_port", lambda: 1234)
+    monkeypatch.setattr(magic_folder.monitor, "start", lambda: None)
+    magic_folder._on_started()
+    magic_folder._on_starting()
+    d = magic_folder.await_running()
+    assert not d.called
+    magic_folder._on_started()
+    assert d.called
+
+
 @pytest.mark.parametrize(
     "state, status",
     [
@@ -143,3 +209,433 @@ def test_magic_folder_monitor__parse_folder_statuses(tmp_path, state, status):
     monitor = magic_folder.monitor
     statuses = monitor._parse_folder_statuses(state)
     assert statuses.get("TestFolder") == status
+
+
+def _state_with_uploads(*relpaths):
+    return {
+        "folders": {
+            "TestFolder": {
+                "uploads": [{"relpath": relpath} for relpath in relpaths],
+                "downloads": [],
+                "errors": [],
+            }
+        }
+    }
+
+
+def test_magic_folder_monitor_compare_states_parses_each_state_once(
+    tmp_path, monkeypatch
+):
+    monitor = MagicFolder(Tahoe(tmp_path / "nodedir")).monitor
+    monkeypatch.setattr(monitor, "_check_overall_status", Mock())
+    fake_parse_operations = Mock(wraps=monitor._parse_operations)
+    monkeypatch.setattr(monitor, "_parse_operations", fake_parse_operations)
+    for relpaths in (["a"], ["a", "b"], ["b"]):
+        monitor.compare_states(_state_with_uploads(*relpaths))
+    assert fake_parse_operations.call_count == 3
+
+
+def test_magic_folder_monitor_compare_states_emits_upload_signals(
+    tmp_path, monkeypatch, qtbot
+):
+    monitor = MagicFolder(Tahoe(tmp_path / "nodedir")).monitor
+    monkeypatch.setattr(monitor, "_check_overall_status", Mock())
+    monitor.compare_states(_state_with_uploads("a", "b"))
+    with qtbot.wait_signals(
+        [monitor.upload_finished, monitor.files_updated]
+    ) as blocker:
+        monitor.compare_states(_state_with_uploads())
+    assert [list(s.args) for s in blocker.all_signals_and_args] == [
+        ["TestFolder", "a", {"relpath": "a"}],
+        ["TestFolder", "b", {"relpath": "b"}],
+        ["TestFolder", ["a", "b"]],
+    ]
+
+
+def test_file_status_index_resolves_paths_once(tmp_path, monkeypatch):
+    index = FileStatusIndex(str(tmp_path))
+    index.update([{"relpath": "a", "size": 1, "mtime": 1}])
+    expected_path = str(Path(tmp_path, "a").resolve())
+    monkeypatch.setattr(
+        "gridsync.magic_folder.Path.resolve",
+        Mock(side_effect=AssertionError("Path was resolved again")),
+    )
+    index.update([{"relpath": "a", "size": 1, "mtime": 1}])
+    assert index.files["a"]["path"] == expected_path
+
+
+def test_file_status_index_update_reports_changes(tmp_path):
+    index = FileStatusIndex(str(tmp_path))
+    a = {"relpath": "a", "size": 1, "mtime": 1, "last-updated": 1}
+    b = {"relpath": "b", "size": 2, "mtime": 2, "last-updated": 2}
+    index.update([a, b])
+    a2 = {"relpath": "a", "size": 3, "mtime": 1, "last-updated": 3}
+    c = {"relpath": "c", "size": 4, "mtime": 4, "last-updated": 4}
+    added, modified, removed = index.update([a2, c])
+    assert (added, modified, removed) == ([c], [(a2, False, True)], [b])
+    assert (index.total_size, index.latest_mtime) == (7, 4)
+
+
+def test_magic_folder_monitor_compare_files_skips_missing_file_status(
+    tmp_path, qtbot
+):
+    monitor = MagicFolder(Tahoe(tmp_path / "nodedir")).monitor
+    folder = {
+        "magic_path": str(tmp_path),
+        "file_status": [{"relpath": "a", "size": 1, "mtime": 1}],
+    }
+    monitor.compare_files({"TestFolder": folder})
+    with qtbot.assert_not_emitted(monitor.file_removed):
+        monitor.compare_files({"TestFolder": {"magic_path": str(tmp_path)}})
+    assert monitor._folder_sizes["TestFolder"] == 1
+
+
+def _fake_magic_folder_api(monkeypatch, tmp_path, folder_names):
+    requests = []
+
+    async def fake_get_folders(self):
+        requests.append("folders")
+        return {name: {"magic_path": str(tmp_path)} for name in folder_names}
+
+    async def fake_get_folder_backups(self):
+        requests.append("backups")
+        return {}
+
+    async def fake_get_file_status(self, folder_name):
+        requests.append(folder_name)
+        return []
+
+    monkeypatch.setattr(MagicFolder, "get_folders", fake_get_folders)
+    monkeypatch.setattr(
+        MagicFolder, "get_folder_backups", fake_get_folder_backups
+    )
+    monkeypatch.setattr(MagicFolder, "get_file_status", fake_get_file_status)
+    return requests
+
+
+@ensureDeferred
+async def test_magic_folder_monitor_do_check_refreshes_everything(
+    tmp_path, monkeypatch
+):
+    monitor = MagicFolder(Tahoe(tmp_path / "nodedir")).monitor
+    requests = _fake_magic_folder_api(monkeypatch, tmp_path, ["A", "B"])
+    await monitor.do_check()
+    assert sorted(requests) == ["A", "B", "backups", "folders"]
+
+
+@ensureDeferred
+async def test_magic_folder_monitor_do_check_refreshes_only_dirty_folders(
+    tmp_path, monkeypatch
+):
+    monitor = MagicFolder(Tahoe(tmp_path / "nodedir")).monitor
+    requests = _fake_magic_folder_api(monkeypatch, tmp_path, ["A", "B"])
+    await monitor.do_check()
+    requests.clear()
+    await monitor.do_check({"B"})
+    assert requests == ["B"]
+
+
+@ensureDeferred
+async def test_magic_folder_monitor_do_check_rereads_folders_if_changed(
+    tmp_path, monkeypatch
+):
+    monitor = MagicFolder(Tahoe(tmp_path / "nodedir")).monitor
+    monkeypatch.setattr(monitor, "_check_overall_status", Mock())
+    requests = _fake_magic_folder_api(monkeypatch, tmp_path, ["A"])
+    await monitor.do_check()
+    monitor.compare_states({"folders": {"A": {}}})
+    monitor._dirty_folders.clear()
+    requests = _fake_magic_folder_api(monkeypatch, tmp_path, ["A", "B"])
+    monitor.compare_states({"folders": {"A": {}, "B": {}}})
+    await monitor.do_check(monitor._dirty_folders)
+    assert sorted(requests) == ["B", "backups", "folders"]
+
+
+def _fake_object_sizes_api(monkeypatch, folder_names):
+    requests = []
+
+    async def fake_get_folders(self):
+        return {name: {} for name in folder_names}
+
+    async def fake_get_object_sizes(self, folder_name):
+        requests.append(folder_name)
+        return [len(folder_name)]
+
+    monkeypatch.setattr(MagicFolder, "get_folders", fake_get_folders)
+    monkeypatch.setattr(MagicFolder, "get_object_sizes", fake_get_object_sizes)
+    return requests
+
+
+@ensureDeferred
+async def test_get_all_object_sizes_caches_sizes(tmp_path, monkeypatch):
+    magic_folder = MagicFolder(Tahoe(tmp_path / "nodedir"))
+    requests = _fake_object_sizes_api(monkeypatch, ["A", "BB"])
+    assert await magic_folder.get_all_object_sizes() == [1, 2]
+    assert await magic_folder.get_all_object_sizes() == [1, 2]
+    assert sorted(requests) == ["A", "BB"]
+
+
+@ensureDeferred
+async def test_get_all_object_sizes_refetches_updated_folder(
+    tmp_path, monkeypatch
+):
+    magic_folder = MagicFolder(Tahoe(tmp_path / "nodedir"))
+    requests = _fake_object_sizes_api(monkeypatch, ["A", "BB"])
+    await magic_folder.get_all_object_sizes()
+    requests.clear()
+    magic_folder.monitor.files_updated.emit("BB", ["file.txt"])
+    await magic_folder.get_all_object_sizes()
+    assert requests == ["BB"]
+
+
+@ensureDeferred
+async def test_get_all_object_sizes_drops_removed_folders(
+    tmp_path, monkeypatch
+):
+    magic_folder = MagicFolder(Tahoe(tmp_path / "nodedir"))
+    _fake_object_sizes_api(monkeypatch, ["A", "BB"])
+    await magic_folder.get_all_object_sizes()
+    _fake_object_sizes_api(monkeypatch, ["A"])
+    assert await magic_folder.get_all_object_sizes() == [1]
+
+
+@pytest.mark.parametrize(
+    "filepath, query",
+    [
+        ("a b.txt", "path=a+b.txt"),
+        ("R&D #1/100%+.txt", "path=R%26D+%231%2F100%25%2B.txt"),
+    ],
+)
+@ensureDeferred
+async def test_add_snapshot_quotes_path(
+    tmp_path, monkeypatch, filepath, query
+):
+    magic_folder = MagicFolder(Tahoe(tmp_path / "nodedir"))
+    magic_folder.magic_folders = {"TestFolder": {"magic_path": str(tmp_path)}}
+    fake_request = Mock(return_value=succeed({}))
+    monkeypatch.setattr(magic_folder, "_request", fake_request)
+    await magic_folder.add_snapshot(
+        "TestFolder", os.path.join(str(tmp_path), *filepath.split("/"))
+    )
+    fake_request.assert_called_once_with(
+        "POST", f"/magic-folder/TestFolder/snapshot?{query}"
+    )
+
+
+def _fake_snapshot_api(monkeypatch):
+    calls = []
+
+    async def fake_scan(self, folder_name):
+        calls.append(("scan", folder_name))
+        return {}
+
+    async def fake_add_snapshot(self, folder_name, filepath):
+        calls.append(("snapshot", filepath))
+
+    monkeypatch.setattr(MagicFolder, "scan", fake_scan)
+    monkeypatch.setattr(MagicFolder, "add_snapshot", fake_add_snapshot)
+    return calls
+
+
+@ensureDeferred
+async def test__snapshot_local_changes_snapshots_changed_files(
+    tmp_path, monkeypatch
+):
+    monitor = MagicFolder(Tahoe(tmp_path / "nodedir")).monitor
+    calls = _fake_snapshot_api(monkeypatch)
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "subdir").mkdir()
+    await monitor._snapshot_local_changes(
+        "TestFolder", str(tmp_path), [".", "a.txt", "subdir"], False
+    )
+    assert calls == [("snapshot", "a.txt")]
+
+
+@ensureDeferred
+async def test__snapshot_local_changes_scans_above_threshold(
+    tmp_path, monkeypatch
+):
+    monitor = MagicFolder(Tahoe(tmp_path / "nodedir")).monitor
+    monitor.snapshot_threshold = 1
+    calls = _fake_snapshot_api(monkeypatch)
+    await monitor._snapshot_local_changes(
+        "TestFolder", str(tmp_path), ["a.txt", "b.txt"], False
+    )
+    assert calls == [("scan", "TestFolder")]
+
+
+@ensureDeferred
+async def test__snapshot_local_changes_scans_if_directories_changed(
+    tmp_path, monkeypatch
+):
+    monitor = MagicFolder(Tahoe(tmp_path / "nodedir")).monitor
+    calls = _fake_snapshot_api(monkeypatch)
+    await monitor._snapshot_local_changes(
+        "TestFolder", str(tmp_path), ["subdir"], True
+    )
+    assert calls == [("scan", "TestFolder")]
+
+
+@ensureDeferred
+async def test__snapshot_local_changes_scans_if_known_file_deleted(
+    tmp_path, monkeypatch
+):
+    monitor = MagicFolder(Tahoe(tmp_path / "nodedir")).monitor
+    monitor.compare_files(
+        {
+            "TestFolder": {
+                "magic_path": str(tmp_path),
+                "file_status": [{"relpath": "a.txt", "size": 1}],
+            }
+        }
+    )
+    calls = _fake_snapshot_api(monkeypatch)
+    await monitor._snapshot_local_changes(
+        "TestFolder", str(tmp_path), ["a.txt"], False
+    )
+    assert calls == [("scan", "TestFolder")]
+
+
+@ensureDeferred
+async def test__snapshot_local_changes_scans_if_unknown_file_deleted(
+    tmp_path, monkeypatch
+):
+    monitor = MagicFolder(Tahoe(tmp_path / "nodedir")).monitor
+    calls = _fake_snapshot_api(monkeypatch)
+    (tmp_path / "a.txt").write_text("a")
+    await monitor._snapshot_local_changes(
+        "TestFolder", str(tmp_path), ["a.txt", "not-in-index.txt"], False
+    )
+    assert calls == [("scan", "TestFolder")]
+
+
+def test_get_folder_for_path_picks_innermost_folder(tmp_path):
+    magic_folder = MagicFolder(Tahoe(tmp_path / "nodedir"))
+    magic_folder.magic_folders = {
+        "Outer": {"magic_path": str(tmp_path / "outer")},
+        "Inner": {"magic_path": str(tmp_path / "outer" / "inner")},
+    }
+    magic_folder._update_path_trie()
+    assert magic_folder.get_folder_for_path(
+        str(tmp_path / "outer" / "inner" / "file.txt")
+    ) == ("Inner", "file.txt")
+
+
+def test__on_paths_modified_ignores_paths_in_nested_folders(
+    tmp_path, monkeypatch
+):
+    magic_folder = MagicFolder(Tahoe(tmp_path / "nodedir"))
+    magic_folder.magic_folders = {
+        "Outer": {"magic_path": str(tmp_path / "outer")},
+        "Inner": {"magic_path": str(tmp_path / "outer" / "inner")},
+    }
+    magic_folder._update_path_trie()
+    fake_snapshot_local_changes = Mock(return_value=None)
+    monkeypatch.setattr(
+        magic_folder.monitor,
+        "_snapshot_local_changes",
+        fake_snapshot_local_changes,
+    )
+    monkeypatch.setattr("gridsync.magic_folder.Deferred.fromCoroutine", Mock())
+    magic_folder.monitor._on_paths_modified(
+        str(tmp_path / "outer"),
+        ["a.txt", os.path.join("inner", "b.txt")],
+        False,
+    )
+    fake_snapshot_local_changes.assert_called_once_with(
+        "Outer", str(tmp_path / "outer"), ["a.txt"], False
+    )
+
+
+def test_adaptive_intervals_start_at_initial_interval():
+    intervals = AdaptiveIntervals(minimum=10, maximum=600, initial=60)
+    intervals.add_folder("A", 600, 30, now=0)
+    assert intervals.get_intervals("A") == (60, 30)
+
+
+def test_adaptive_intervals_back_off_while_idle():
+    intervals = AdaptiveIntervals(minimum=10, maximum=600, initial=60)
+    intervals.add_folder("A", 600, 600, now=0)
+    to_scan, to_poll, changed = intervals.advance(now=60)
+    assert (to_scan, to_poll, changed) == (["A"], ["A"], {"A"})
+    assert intervals.get_intervals("A") == (120, 120)
+
+
+def test_adaptive_intervals_do_not_exceed_configured_interval():
+    intervals = AdaptiveIntervals(minimum=10, maximum=600, initial=60)
+    intervals.add_folder("A", 100, 100, now=0)
+    intervals.advance(now=60)
+    assert intervals.get_intervals("A") == (100, 100)
+    # magic-folder will scan and poll on its own at its configured interval
+    assert intervals.advance(now=160) == ([], [], set())
+
+
+def test_adaptive_intervals_shorten_on_activity():
+    intervals = AdaptiveIntervals(minimum=10, maximum=600, initial=60)
+    intervals.add_folder("A", 600, 600, now=0)
+    assert intervals.record_local_activity("A") is True
+    assert intervals.get_intervals("A") == (10, 60)
+    assert intervals.advance(now=10) == (["A"], [], set())
+
+
+def test_adaptive_intervals_stay_short_while_active():
+    intervals = AdaptiveIntervals(minimum=10, maximum=600, initial=60)
+    intervals.add_folder("A", 600, 600, now=0)
+    intervals.record_remote_activity("A")
+    intervals.advance(now=10)
+    assert intervals.record_remote_activity("A") is False
+    intervals.advance(now=20)
+    assert intervals.get_intervals("A") == (60, 10)
+    intervals.advance(now=30)
+    assert intervals.get_intervals("A") == (60, 20)
+
+
+def test_adaptive_intervals_ignore_activity_in_unknown_folders():
+    intervals = AdaptiveIntervals()
+    assert intervals.record_local_activity("Unknown") is False
+
+
+async def _noop(*args):
+    pass
+
+
+def test_magic_folder_monitor_scans_active_folders(tmp_path, monkeypatch):
+    magic_folder = MagicFolder(Tahoe(tmp_path / "nodedir"))
+    magic_folder.magic_folders = {
+        "A": {"magic_path": str(tmp_path), "scan_interval": 600}
+    }
+    magic_folder._update_path_trie()
+    monitor = magic_folder.monitor
+    monitor.snapshot_threshold = 1
+    monkeypatch.setattr(monitor, "_snapshot_local_changes", _noop)
+    scans = []
+
+    async def fake_scan(folder_name):
+        scans.append(folder_name)
+        return {}
+
+    monkeypatch.setattr(magic_folder, "scan", fake_scan)
+    monkeypatch.setattr(magic_folder, "poll", fake_scan)
+    monkeypatch.setattr("gridsync.magic_folder.reactor.seconds", lambda: 0)
+    monitor._check_intervals()
+    monitor._on_paths_modified(str(tmp_path), ["a.txt", "b.txt"], False)
+    monkeypatch.setattr("gridsync.magic_folder.reactor.seconds", lambda: 10)
+    monitor._check_intervals()
+    assert scans == ["A"]
+
+
+def test_magic_folder_monitor_does_not_scan_after_snapshots(
+    tmp_path, monkeypatch
+):
+    magic_folder = MagicFolder(Tahoe(tmp_path / "nodedir"))
+    magic_folder.magic_folders = {
+        "A": {"magic_path": str(tmp_path), "scan_interval": 600}
+    }
+    magic_folder._update_path_trie()
+    monitor = magic_folder.monitor
+    monkeypatch.setattr(monitor, "_snapshot_local_changes", _noop)
+    monkeypatch.setattr("gridsync.magic_folder.reactor.seconds", lambda: 0)
+    monitor._check_intervals()
+    scan_interval, _ = monitor.intervals.get_intervals("A")
+    monitor._on_paths_modified(str(tmp_path), ["a.txt"], False)
+    assert monitor.intervals.get_intervals("A")[0] == scan_interval
@@ -53,6 +53,7 @@ async def test_newscap_checker__download_messages(
         self,
         cap: str,
         local_path: str,
+        **kwargs,
     ) -> None:
         nonlocal call_count
         call_count += 1
@@ -64,7 +65,7 @@ async def test_newscap_checker__download_messages(
 
 
 def test_newscap_checker__download_messages_warn(newscap_checker, monkeypatch):
-    async def fake_download(self, cap: str, local_path: str) -> None:
+    async def fake_download(self, cap: str, local_path: str, **kw) -> None:
         raise TahoeWebError()
 
     monkeypatch.setattr("gridsync.tahoe.Tahoe.download", fake_download)
@@ -78,7 +79,7 @@ def test_newscap_checker__download_messages_warn(newscap_checker, monkeypatch):
 def test_newscap_checker__download_emit_message_received_signal_newest_file(
     newscap_checker, monkeypatch, qtbot
 ):
-    async def fake_download(self, cap: str, local_path: str) -> None:
+    async def fake_download(self, cap: str, local_path: str, **kw) -> None:
         pass
 
     monkeypatch.setattr("gridsync.tahoe.Tahoe.download", fake_download)
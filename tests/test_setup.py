@@ -579,12 +579,12 @@ def test_join_grid_storage_servers(monkeypatch, tmpdir):
 async def test_join_folders_emit_joined_folders_signal(
     monkeypatch, qtbot, tmpdir
 ):
-    async def fake_link(self, dircap, name, childcap):
+    async def fake_link_many(self, dircap, children):
         return None
 
     monkeypatch.setattr(
-        "gridsync.tahoe.Tahoe.link",
-        fake_link,
+        "gridsync.tahoe.Tahoe.link_many",
+        fake_link_many,
     )
     sr = SetupRunner([])
     sr.gateway = Tahoe(str(tmpdir.mkdir("TestGrid")))
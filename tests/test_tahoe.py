@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import json
 import os
 from pathlib import Path
 from typing import Awaitable, Callable, TypeVar
@@ -13,18 +14,31 @@ import pytest
 import yaml
 from pytest_twisted import ensureDeferred, inlineCallbacks
 from twisted.internet.defer import Deferred, succeed
+from twisted.internet.error import ConnectError
 from twisted.internet.testing import MemoryReactorClock
 
 from gridsync.crypto import randstr
 from gridsync.errors import TahoeCommandError, TahoeError, TahoeWebError
 from gridsync.tahoe import (
+    GridStatus,
     Tahoe,
+    get_chk_size,
     get_nodedirs,
     is_valid_furl,
     storage_options_to_config,
 )
+from gridsync.transfer import TransferProgress
 from gridsync.zkapauthorizer import PLUGIN_NAME as ZKAPAUTHZ_PLUGIN_NAME
 
+DIRCAP = (
+    "URI:DIR2:3x67kv2fmpz2fji4s775o72yxe:"
+    "jpi2cfxsc4xjioea735g7fnqdjimkn6scpit4xumkkzk27nfm6pq"
+)
+FILECAP = (
+    "URI:CHK:452hmzwvthqbsawh6e4ua4plei:"
+    "6zeihsoigv7xl7ijdmyzfa7wt5rajqhj3ppmaqgxoilt4n5srszq:1:1:201576"
+)
+
 
 def fake_get(*args, **kwargs):
     response = MagicMock()
@@ -136,6 +150,19 @@ def test_tahoe_set_streamedlogs_maxlen_from_config_txt(
     assert client.streamedlogs._buffer.maxlen == expected
 
 
+def test_tahoe_spools_logs_to_nodedir_if_enabled(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        "gridsync.tahoe.global_settings",
+        {"debug": {"log_spool": "true", "log_spool_max_bytes": "1024"}},
+    )
+    client = Tahoe(str(tmp_path / "nodedir"))
+    spool = client.streamedlogs._buffer
+    assert (spool.directory, spool.max_bytes) == (
+        tmp_path / "nodedir" / "private" / "eliot-logs" / "tahoe",
+        1024,
+    )
+
+
 def test_tahoe_load_newscap_from_global_settings(tahoe, monkeypatch):
     global_settings = {
         "news:{}".format(tahoe.name): {"newscap": "URI:NewscapFromSettings"}
@@ -235,6 +262,43 @@ def test_add_storage_servers(tmpdir):
     assert client.get_storage_servers() == storage_servers
 
 
+def test_add_storage_servers_writes_servers_yaml_once(tmpdir, monkeypatch):
+    nodedir = str(tmpdir.mkdir("TestGrid"))
+    os.makedirs(os.path.join(nodedir, "private"))
+    client = Tahoe(nodedir)
+    fake_write = MagicMock(wraps=client._write_servers_yaml)
+    monkeypatch.setattr(client, "_write_servers_yaml", fake_write)
+    storage_servers = {
+        f"node-{i}": {"anonymous-storage-FURL": f"pb://{i}"}
+        for i in range(100)
+    }
+    client.add_storage_servers(storage_servers)
+    assert fake_write.call_count == 1
+    assert client.get_storage_servers() == storage_servers
+
+
+def test_get_storage_servers_parses_servers_yaml_once(tahoe, monkeypatch):
+    tahoe.add_storage_server("v0-bbb", "pb://b.b", "bob")
+    monkeypatch.setattr(
+        "gridsync.tahoe.yaml.load",
+        Mock(side_effect=AssertionError("servers.yaml was parsed again")),
+    )
+    assert "v0-bbb" in tahoe.get_storage_servers()
+
+
+def test_get_storage_servers_rereads_changed_servers_yaml(tahoe):
+    tahoe.add_storage_server("v0-bbb", "pb://b.b", "bob")
+    tahoe.get_storage_servers()
+    with open(tahoe.servers_yaml_path, "w") as f:
+        f.write(
+            "storage:\n  v0-ccc:\n    ann:\n"
+            "      anonymous-storage-FURL: pb://c.c\n"
+        )
+    assert tahoe.get_storage_servers() == {
+        "v0-ccc": {"anonymous-storage-FURL": "pb://c.c"}
+    }
+
+
 def test_add_storage_servers_no_add_missing_furl(tmpdir):
     nodedir = str(tmpdir.mkdir("TestGrid"))
     os.makedirs(os.path.join(nodedir, "private"))
@@ -522,9 +586,7 @@ async def test_tahoe_stop_locked(locked, call_count, tahoe, monkeypatch):
     assert not tahoe.rootcap_manager.lock.locked
 
 
-@inlineCallbacks
-def test_get_grid_status(tahoe, monkeypatch):
-    json_content = b"""{
+GRID_STATUS_JSON = b"""{
         "introducers": {
             "statuses": [
                 "Connected to introducer.local:3456 via tcp"
@@ -557,21 +619,89 @@ def test_get_grid_status(tahoe, monkeypatch):
             }
         ]
     }"""
+
+
+@inlineCallbacks
+def test_get_grid_status(tahoe, monkeypatch):
     monkeypatch.setattr("treq.get", fake_get)
-    monkeypatch.setattr("treq.content", lambda _: succeed(json_content))
+    monkeypatch.setattr("treq.content", lambda _: succeed(GRID_STATUS_JSON))
     num_connected, num_known, available_space = yield Deferred.fromCoroutine(
         tahoe.get_grid_status()
     )
     assert (num_connected, num_known, available_space) == (2, 3, 3072)
 
 
+@inlineCallbacks
+def test_fetch_grid_status_server_space(tahoe, monkeypatch):
+    monkeypatch.setattr("treq.get", fake_get)
+    monkeypatch.setattr("treq.content", lambda _: succeed(GRID_STATUS_JSON))
+    grid_status = yield tahoe.fetch_grid_status()
+    assert grid_status.server_space == {
+        "v0-bbbbbbbbbbbbbbbbbbbbbbbb": 1024,
+        "v0-cccccccccccccccccccccccc": 2048,
+    }
+
+
+@inlineCallbacks
+def test_fetch_grid_status_reuses_fresh_snapshot(tahoe, monkeypatch):
+    fake_treq_get = Mock(side_effect=fake_get)
+    monkeypatch.setattr("treq.get", fake_treq_get)
+    monkeypatch.setattr("treq.content", lambda _: succeed(GRID_STATUS_JSON))
+    first = yield tahoe.fetch_grid_status(max_age=60)
+    second = yield tahoe.fetch_grid_status(max_age=60)
+    assert (second, fake_treq_get.call_count) == (first, 1)
+
+
+@inlineCallbacks
+def test_fetch_grid_status_refetches_stale_snapshot(tahoe, monkeypatch):
+    fake_treq_get = Mock(side_effect=fake_get)
+    monkeypatch.setattr("treq.get", fake_treq_get)
+    monkeypatch.setattr("treq.content", lambda _: succeed(GRID_STATUS_JSON))
+    yield tahoe.fetch_grid_status()
+    yield tahoe.fetch_grid_status(max_age=0)
+    assert fake_treq_get.call_count == 2
+
+
+def test_fetch_grid_status_concurrent_callers_share_request(
+    tahoe, monkeypatch
+):
+    response = MagicMock()
+    response.code = 200
+    pending = Deferred()
+    fake_treq_get = Mock(return_value=pending)
+    monkeypatch.setattr("treq.get", fake_treq_get)
+    monkeypatch.setattr("treq.content", lambda _: succeed(GRID_STATUS_JSON))
+    results = []
+    for _ in range(10):
+        tahoe.fetch_grid_status().addCallback(results.append)
+    pending.callback(response)
+    assert (fake_treq_get.call_count, len(results)) == (1, 10)
+
+
+def test_fetch_grid_status_concurrent_callers_share_failure(
+    tahoe, monkeypatch
+):
+    pending = Deferred()
+    monkeypatch.setattr("treq.get", Mock(return_value=pending))
+    failures = []
+    for _ in range(3):
+        tahoe.fetch_grid_status().addErrback(failures.append)
+    pending.errback(ValueError("test error"))
+    assert [f.check(ValueError) for f in failures] == [ValueError] * 3
+
+
+def test_grid_status_from_json_counts_servers_without_nodeids():
+    server = {"connection_status": "Connected", "available_space": 1}
+    status = GridStatus.from_json({"servers": [server, server]}, 0.0)
+    assert (status.servers_connected, status.available_space) == (2, 2)
+
+
 @inlineCallbacks
 def test_get_connected_servers(tahoe, monkeypatch):
-    html = b"Connected to <span>3</span>of <span>10</span>"
     monkeypatch.setattr("treq.get", fake_get)
-    monkeypatch.setattr("treq.content", lambda _: succeed(html))
+    monkeypatch.setattr("treq.content", lambda _: succeed(GRID_STATUS_JSON))
     output = yield Deferred.fromCoroutine(tahoe.get_connected_servers())
-    assert output == 3
+    assert output == 2
 
 
 @inlineCallbacks
@@ -583,8 +713,8 @@ def test_is_ready_false_not_shares_happy(tahoe, monkeypatch):
 T = TypeVar("T")
 
 
-def fake_awaitable_method(value: T) -> Callable[[], Awaitable[T]]:
-    async def fake(self) -> T:
+def fake_awaitable_method(value: T) -> Callable[..., Awaitable[T]]:
+    async def fake(self, *args: object, **kwargs: object) -> T:
         return value
 
     return fake
@@ -645,6 +775,7 @@ def test_concurrent_await_ready(tahoe, monkeypatch):
 
     @inlineCallbacks
     def measure_poll_count(how_many_waiters):
+        tahoe.set_not_ready()
         is_ready = False
         poll_count = 0
 
@@ -688,6 +819,97 @@ def test_concurrent_await_ready(tahoe, monkeypatch):
     assert abs(multi_count - single_count) <= 1
 
 
+@inlineCallbacks
+def test_await_ready_sets_ready(tahoe, monkeypatch):
+    monkeypatch.setattr(
+        "gridsync.tahoe.Tahoe.is_ready", fake_awaitable_method(True)
+    )
+    yield tahoe.await_ready()
+    assert tahoe.ready is True
+
+
+@inlineCallbacks
+def test_await_ready_does_not_poll_when_ready(tahoe, monkeypatch):
+    fake_is_ready = Mock()
+    monkeypatch.setattr("gridsync.tahoe.Tahoe.is_ready", fake_is_ready)
+    tahoe.set_ready()
+    yield tahoe.await_ready()
+    assert fake_is_ready.call_count == 0
+
+
+@inlineCallbacks
+def test_await_ready_polls_again_after_set_not_ready(tahoe, monkeypatch):
+    poll_count = 0
+
+    async def check_ready(self) -> bool:
+        nonlocal poll_count
+        poll_count += 1
+        return True
+
+    monkeypatch.setattr("gridsync.tahoe.Tahoe.is_ready", check_ready)
+    yield tahoe.await_ready()
+    yield tahoe.await_ready()
+    tahoe.set_not_ready()
+    yield tahoe.await_ready()
+    assert poll_count == 2
+
+
+def test_monitor_disconnected_sets_not_ready(tahoe):
+    tahoe.set_ready()
+    tahoe.monitor.disconnected.emit()
+    assert tahoe.ready is False
+
+
+@inlineCallbacks
+def test_get_json_connect_error_sets_not_ready(tahoe, monkeypatch):
+    def fake_get_connect_error(*args, **kwargs):
+        raise ConnectError()
+
+    monkeypatch.setattr("treq.get", fake_get_connect_error)
+    tahoe.set_ready()
+    yield Deferred.fromCoroutine(tahoe.get_json("URI:DIR2:abc:def"))
+    assert tahoe.ready is False
+
+
+@inlineCallbacks
+def test_get_json_cached(tahoe, monkeypatch):
+    fake_treq_get = Mock(side_effect=fake_get)
+    monkeypatch.setattr("treq.get", fake_treq_get)
+    monkeypatch.setattr("treq.content", lambda _: succeed(b'["dirnode", {}]'))
+    yield Deferred.fromCoroutine(tahoe.get_json("URI:DIR2:abc:def"))
+    output = yield Deferred.fromCoroutine(tahoe.get_json("URI:DIR2:abc:def"))
+    assert (output, fake_treq_get.call_count) == (["dirnode", {}], 1)
+
+
+@inlineCallbacks
+def test_link_invalidates_cached_json(tahoe, monkeypatch):
+    monkeypatch.setattr(
+        "gridsync.tahoe.Tahoe.await_ready", lambda _: succeed(None)
+    )
+    fake_treq_get = Mock(side_effect=fake_get)
+    monkeypatch.setattr("treq.get", fake_treq_get)
+    monkeypatch.setattr("treq.post", fake_post)
+    monkeypatch.setattr("treq.content", lambda _: succeed(b'["dirnode", {}]'))
+    yield Deferred.fromCoroutine(tahoe.get_json("URI:DIR2:abc:def"))
+    yield Deferred.fromCoroutine(
+        tahoe.link("URI:DIR2:abc:def", "test_childname", "test_childcap")
+    )
+    yield Deferred.fromCoroutine(tahoe.get_json("URI:DIR2:abc:def"))
+    assert fake_treq_get.call_count == 2
+
+
+@inlineCallbacks
+def test_get_json_not_cached_if_invalidated_while_fetching(tahoe, monkeypatch):
+    response = Deferred()
+    monkeypatch.setattr("treq.get", Mock(return_value=response))
+    monkeypatch.setattr("treq.content", lambda _: succeed(b'["dirnode", {}]'))
+    d = Deferred.fromCoroutine(tahoe.get_json("URI:DIR2:abc:def"))
+    tahoe.dircache.invalidate("URI:DIR2:abc:def")
+    response.callback(MagicMock(code=200))
+    yield d
+    assert tahoe.dircache.get("URI:DIR2:abc:def") is None
+
+
 @inlineCallbacks
 def test_tahoe_mkdir(tahoe, monkeypatch):
     monkeypatch.setattr(
@@ -712,6 +934,64 @@ def test_tahoe_mkdir_fail_code_500(tahoe, monkeypatch):
         yield Deferred.fromCoroutine(tahoe.mkdir())
 
 
+@ensureDeferred
+async def test_tahoe_mkdir_with_children(tahoe, monkeypatch):
+    monkeypatch.setattr(
+        "gridsync.tahoe.Tahoe.await_ready", lambda _: succeed(None)
+    )
+    fake_post = MagicMock(return_value=succeed(MagicMock(code=200)))
+    monkeypatch.setattr("treq.post", fake_post)
+    monkeypatch.setattr("treq.content", lambda _: succeed(b"URI:DIR2:new"))
+    output = await tahoe.mkdir(children={"subdir": DIRCAP})
+    assert output == "URI:DIR2:new"
+    assert fake_post.call_args[1]["params"] == {"t": "mkdir-with-children"}
+    assert json.loads(fake_post.call_args[0][1]) == {
+        "subdir": ["dirnode", {"rw_uri": DIRCAP}]
+    }
+
+
+@ensureDeferred
+async def test_tahoe_mkdir_tree_creates_subdirs_before_parents(
+    tahoe, monkeypatch
+):
+    created = []
+
+    async def fake_mkdir(self, parentcap=None, childname=None, children=None):
+        cap = f"URI:DIR2:{len(created)}"
+        created.append((parentcap, childname, children, cap))
+        return cap
+
+    monkeypatch.setattr("gridsync.tahoe.Tahoe.mkdir", fake_mkdir)
+    output = await tahoe.mkdir_tree(
+        {"v1": {".a": {}, ".b": {}}, "existing": "URI:CHK:x"}
+    )
+    assert created == [
+        (None, None, {}, "URI:DIR2:0"),
+        (None, None, {}, "URI:DIR2:1"),
+        (
+            None,
+            None,
+            {".a": "URI:DIR2:0", ".b": "URI:DIR2:1"},
+            "URI:DIR2:2",
+        ),
+        (
+            None,
+            None,
+            {"existing": "URI:CHK:x", "v1": "URI:DIR2:2"},
+            "URI:DIR2:3",
+        ),
+    ]
+    assert output == "URI:DIR2:3"
+
+
+@ensureDeferred
+async def test_tahoe_mkdir_tree_links_into_parentcap(tahoe, monkeypatch):
+    fake_mkdir = MagicMock(return_value=succeed("URI:DIR2:new"))
+    monkeypatch.setattr("gridsync.tahoe.Tahoe.mkdir", fake_mkdir)
+    await tahoe.mkdir_tree({}, "URI:DIR2:parent", "v1")
+    fake_mkdir.assert_called_once_with("URI:DIR2:parent", "v1", children={})
+
+
 @ensureDeferred
 async def test_tahoe_upload(tahoe, monkeypatch):
     monkeypatch.setattr(
@@ -742,6 +1022,102 @@ async def test_tahoe_upload_fail_code_500(tahoe, monkeypatch):
         await tahoe.upload(os.path.join(tahoe.nodedir, "tahoe.cfg"))
 
 
+@ensureDeferred
+async def test_tahoe_upload_many(tahoe, monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        "gridsync.tahoe.Tahoe.await_ready", lambda _: succeed(None)
+    )
+    monkeypatch.setattr("treq.put", fake_put)
+    monkeypatch.setattr("treq.post", fake_post)
+    monkeypatch.setattr("treq.content", lambda _: succeed(FILECAP.encode()))
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"file-{i}"
+        path.write_bytes(b"x" * i)
+        paths.append(str(path))
+    caps, errors = await tahoe.upload_many(paths, "URI:DIR2:a:b")
+    assert (caps, errors) == ({p: FILECAP for p in paths}, {})
+
+
+@ensureDeferred
+async def test_tahoe_upload_many_links_into_dircap_once(
+    tahoe, monkeypatch, tmp_path
+):
+    monkeypatch.setattr(
+        "gridsync.tahoe.Tahoe.await_ready", lambda _: succeed(None)
+    )
+    put = MagicMock(side_effect=fake_put)
+    post = MagicMock(side_effect=fake_post)
+    monkeypatch.setattr("treq.put", put)
+    monkeypatch.setattr("treq.post", post)
+    monkeypatch.setattr("treq.content", lambda _: succeed(FILECAP.encode()))
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"file-{i}"
+        path.write_bytes(b"test")
+        paths.append(str(path))
+    await tahoe.upload_many(paths, "URI:DIR2:a:b")
+    assert {c[0][0] for c in put.call_args_list} == {tahoe.nodeurl + "uri"}
+    assert post.call_count == 1
+    url, body = post.call_args[0]
+    assert url.endswith("uri/URI:DIR2:a:b/?t=set_children")
+    assert sorted(json.loads(body)) == ["file-0", "file-1", "file-2"]
+
+
+@ensureDeferred
+async def test_tahoe_upload_many_collects_failures(
+    tahoe, monkeypatch, tmp_path
+):
+    monkeypatch.setattr(
+        "gridsync.tahoe.Tahoe.await_ready", lambda _: succeed(None)
+    )
+    monkeypatch.setattr("treq.put", fake_put)
+    monkeypatch.setattr("treq.post", fake_post)
+    monkeypatch.setattr("treq.content", lambda _: succeed(FILECAP.encode()))
+    good = tmp_path / "good"
+    good.write_bytes(b"test")
+    bad = str(tmp_path / "missing")
+    caps, errors = await tahoe.upload_many([bad, str(good)], "URI:DIR2:a:b")
+    assert caps == {str(good): FILECAP}
+    assert list(errors) == [bad]
+    assert isinstance(errors[bad], FileNotFoundError)
+
+
+@ensureDeferred
+async def test_tahoe_upload_many_limits_concurrency(
+    tahoe, monkeypatch, tmp_path
+):
+    monkeypatch.setattr(
+        "gridsync.tahoe.Tahoe.await_ready", lambda _: succeed(None)
+    )
+    pending = []
+
+    def fake_put_pending(*args, **kwargs):
+        d = Deferred()
+        pending.append(d)
+        return d
+
+    monkeypatch.setattr("treq.put", fake_put_pending)
+    monkeypatch.setattr("treq.post", fake_post)
+    monkeypatch.setattr("treq.content", lambda _: succeed(FILECAP.encode()))
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"file-{i}"
+        path.write_bytes(b"test")
+        paths.append(str(path))
+    d = Deferred.fromCoroutine(
+        tahoe.upload_many(paths, "URI:DIR2:a:b", concurrency=2)
+    )
+    max_pending = 0
+    while not d.called:
+        max_pending = max(max_pending, len(pending))
+        response = MagicMock()
+        response.code = 201
+        pending.pop(0).callback(response)
+    caps, _ = await d
+    assert (max_pending, len(caps)) == (2, 5)
+
+
 @inlineCallbacks
 def test_tahoe_download(tahoe, monkeypatch):
     def fake_collect(response, collector):
@@ -771,6 +1147,145 @@ async def test_tahoe_download_fail_code_500(tahoe, monkeypatch):
         await tahoe.download("test_cap", os.path.join(tahoe.nodedir, "nofile"))
 
 
+def fake_ranged_get(data: bytes, calls: list):
+    def fake_get(url, headers=None, **kwargs):
+        calls.append(headers)
+        response = MagicMock()
+        ranges = (headers or {}).get("Range")
+        if ranges:
+            first, last = ranges[0][len("bytes=") :].split("-")
+            end = int(last) + 1 if last else len(data)
+            response.code = 206
+            response.body = data[int(first) : end]
+        else:
+            response.code = 200
+            response.body = data
+        return succeed(response)
+
+    return fake_get
+
+
+def fake_collect_body(response, collector):
+    collector(response.body)
+    return succeed(None)
+
+
+def test_get_chk_size():
+    assert get_chk_size("URI:CHK:aaa:bbb:1:3:12345") == 12345
+
+
+def test_get_chk_size_none_for_mutable_caps():
+    assert get_chk_size("URI:DIR2:aaa:bbb") is None
+
+
+@ensureDeferred
+async def test_tahoe_download_resumes_partial_file(tahoe, monkeypatch):
+    monkeypatch.setattr(
+        "gridsync.tahoe.Tahoe.await_ready", lambda _: succeed(None)
+    )
+    calls = []
+    monkeypatch.setattr("treq.get", fake_ranged_get(b"0123456789", calls))
+    monkeypatch.setattr("treq.collect", fake_collect_body)
+    location = os.path.join(tahoe.nodedir, "test_downloaded_file")
+    part_path = location + ".part"
+    tahoe._discard_stale_parts(
+        "URI:CHK:aaa:bbb:1:1:10", part_path, [part_path]
+    )
+    with open(part_path, "wb") as f:
+        f.write(b"0123")
+    await tahoe.download("URI:CHK:aaa:bbb:1:1:10", location)
+    with open(location, "rb") as f:
+        assert (f.read(), calls) == (b"0123456789", [{"Range": ["bytes=4-"]}])
+    assert not os.path.exists(part_path + ".cap")
+
+
+@ensureDeferred
+async def test_tahoe_download_discards_partial_file_of_other_cap(
+    tahoe, monkeypatch
+):
+    monkeypatch.setattr(
+        "gridsync.tahoe.Tahoe.await_ready", lambda _: succeed(None)
+    )
+    calls = []
+    monkeypatch.setattr("treq.get", fake_ranged_get(b"0123456789", calls))
+    monkeypatch.setattr("treq.collect", fake_collect_body)
+    location = os.path.join(tahoe.nodedir, "test_downloaded_file")
+    part_path = location + ".part"
+    tahoe._discard_stale_parts(
+        "URI:CHK:ccc:ddd:1:1:10", part_path, [part_path]
+    )
+    with open(part_path, "wb") as f:
+        f.write(b"xxxx")
+    await tahoe.download("URI:CHK:aaa:bbb:1:1:10", location)
+    with open(location, "rb") as f:
+        assert (f.read(), calls) == (b"0123456789", [{}])
+
+
+@ensureDeferred
+async def test_tahoe_download_does_not_resume_mutable_file(tahoe, monkeypatch):
+    monkeypatch.setattr(
+        "gridsync.tahoe.Tahoe.await_ready", lambda _: succeed(None)
+    )
+    calls = []
+    monkeypatch.setattr("treq.get", fake_ranged_get(b"0123456789", calls))
+    monkeypatch.setattr("treq.collect", fake_collect_body)
+    location = os.path.join(tahoe.nodedir, "test_downloaded_file")
+    with open(location + ".part", "wb") as f:
+        f.write(b"xxxx")
+    await tahoe.download("URI:MDMF:aaa:bbb", location)
+    with open(location, "rb") as f:
+        assert (f.read(), calls) == (b"0123456789", [{}])
+
+
+@ensureDeferred
+async def test_tahoe_download_parallel_segments(tahoe, monkeypatch):
+    monkeypatch.setattr(
+        "gridsync.tahoe.Tahoe.await_ready", lambda _: succeed(None)
+    )
+    monkeypatch.setattr("gridsync.tahoe.PARALLEL_DOWNLOAD_MIN_SIZE", 1)
+    calls = []
+    monkeypatch.setattr("treq.get", fake_ranged_get(b"0123456789", calls))
+    monkeypatch.setattr("treq.collect", fake_collect_body)
+    location = os.path.join(tahoe.nodedir, "test_downloaded_file")
+    progress = TransferProgress()
+    await tahoe.download(
+        "URI:CHK:aaa:bbb:1:1:10", location, progress=progress, segments=3
+    )
+    with open(location, "rb") as f:
+        assert f.read() == b"0123456789"
+    assert calls == [
+        {"Range": ["bytes=0-3"]},
+        {"Range": ["bytes=4-7"]},
+        {"Range": ["bytes=8-9"]},
+    ]
+    assert (progress.transferred, progress.total) == (10, 10)
+    assert not os.path.exists(location + ".part0")
+
+
+@ensureDeferred
+async def test_tahoe_download_many_collects_failures(tahoe, monkeypatch):
+    monkeypatch.setattr(
+        "gridsync.tahoe.Tahoe.await_ready", lambda _: succeed(None)
+    )
+
+    def fake_get(url, **kwargs):
+        if url.endswith("bad"):
+            return fake_get_code_500()
+        response = MagicMock()
+        response.code = 200
+        response.body = b"test_content"
+        return succeed(response)
+
+    monkeypatch.setattr("treq.get", fake_get)
+    monkeypatch.setattr("treq.collect", fake_collect_body)
+    monkeypatch.setattr("treq.content", lambda _: succeed(b"test content"))
+    good = os.path.join(tahoe.nodedir, "good")
+    bad = os.path.join(tahoe.nodedir, "bad")
+    errors = await tahoe.download_many([("URI:good", good), ("URI:bad", bad)])
+    assert list(errors) == [bad]
+    assert os.path.exists(good) and not os.path.exists(bad)
+
+
 @ensureDeferred
 async def test_tahoe_link(tahoe, monkeypatch):
     monkeypatch.setattr(
@@ -792,6 +1307,44 @@ async def test_tahoe_link_fail_code_500(tahoe, monkeypatch):
         await tahoe.link("test_dircap", "test_childname", "test_childcap")
 
 
+@ensureDeferred
+async def test_tahoe_link_many_sends_set_children(tahoe, monkeypatch):
+    monkeypatch.setattr(
+        "gridsync.tahoe.Tahoe.await_ready", lambda _: succeed(None)
+    )
+    fake_post = MagicMock(return_value=succeed(MagicMock(code=200)))
+    monkeypatch.setattr("treq.post", fake_post)
+    await tahoe.link_many(
+        "URI:DIR2:aaa:bbb", {"subdir": DIRCAP, "file": FILECAP}
+    )
+    assert fake_post.call_count == 1
+    url, body = fake_post.call_args[0]
+    assert url.endswith("uri/URI:DIR2:aaa:bbb/?t=set_children")
+    assert json.loads(body) == {
+        "subdir": ["dirnode", {"rw_uri": DIRCAP}],
+        "file": ["filenode", {"ro_uri": FILECAP}],
+    }
+
+
+@ensureDeferred
+async def test_tahoe_link_many_no_children_sends_nothing(tahoe, monkeypatch):
+    fake_post = MagicMock()
+    monkeypatch.setattr("treq.post", fake_post)
+    await tahoe.link_many("URI:DIR2:aaa:bbb", {})
+    assert fake_post.call_count == 0
+
+
+@ensureDeferred
+async def test_tahoe_link_many_fail_code_500(tahoe, monkeypatch):
+    monkeypatch.setattr(
+        "gridsync.tahoe.Tahoe.await_ready", lambda _: succeed(None)
+    )
+    monkeypatch.setattr("treq.post", fake_post_code_500)
+    monkeypatch.setattr("treq.content", lambda _: succeed(b"test content"))
+    with pytest.raises(TahoeWebError):
+        await tahoe.link_many("test_dircap", {"test_childname": FILECAP})
+
+
 @ensureDeferred
 async def test_tahoe_unlink(tahoe, monkeypatch):
     monkeypatch.setattr(
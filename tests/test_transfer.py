@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+
+from io import BytesIO
+from unittest.mock import Mock
+
+from gridsync.transfer import ProgressReader, TransferProgress
+
+
+def test_progress_reader_reports_bytes_read():
+    callback = Mock()
+    reader = ProgressReader(BytesIO(b"0123456789"), callback)
+    reader.read(4)
+    reader.read()
+    reader.read()
+    assert [c.args[0] for c in callback.call_args_list] == [4, 6]
+
+
+def test_progress_reader_passes_through_seek_and_tell():
+    reader = ProgressReader(BytesIO(b"0123456789"), Mock())
+    reader.seek(0, 2)
+    assert reader.tell() == 10
+
+
+def test_transfer_progress_emits_file_and_aggregate_progress(qtbot):
+    progress = TransferProgress()
+    progress.add_file("a", 10)
+    progress.add_file("b", 30)
+    progress.update("a", 5)
+    with qtbot.wait_signals(
+        [progress.file_progress_updated, progress.progress_updated]
+    ) as blocker:
+        progress.update("b", 15)
+    assert [list(s.args) for s in blocker.all_signals_and_args] == [
+        ["b", 15, 30],
+        [20, 40],
+    ]
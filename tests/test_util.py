@@ -1,12 +1,20 @@
 # -*- coding: utf-8 -*-
 
+import collections
+import logging
+import os
+import sys
 from binascii import hexlify, unhexlify
+from pathlib import Path
 
 import pytest
 
 from gridsync.util import (
+    DequeHandler,
+    PathTrie,
     b58decode,
     b58encode,
+    format_log_record,
     future_date,
     humanized_list,
     strip_html_tags,
@@ -111,3 +119,100 @@ def test_future_date_does_not_return_centuries_for_small_int_days():
 )
 def test_strip_html_tags(s, expected):
     assert strip_html_tags(s) == expected
+
+
+@pytest.fixture()
+def path_trie(tmp_path):
+    return PathTrie(
+        {
+            str(tmp_path / "a"): "A",
+            str(tmp_path / "a" / "b"): "AB",
+            str(tmp_path / "ab"): "AB2",
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        [("a",), ("A", "")],
+        [("a", "x", "y"), ("A", os.path.join("x", "y"))],
+        [("a", "b", "c"), ("AB", "c")],
+        [("a", "bc"), ("A", "bc")],
+        [("ab", "c"), ("AB2", "c")],
+        [("b",), None],
+    ],
+)
+def test_path_trie_lookup_returns_longest_match(
+    path_trie, tmp_path, path, expected
+):
+    assert path_trie.lookup(str(Path(tmp_path, *path))) == expected
+
+
+def test_format_log_record():
+    record = (0.0, "DEBUG", "root", "func", "Got %s (%i)", ("x", 1), None)
+    assert format_log_record(record) == (
+        "1970-01-01T00:00:00+00:00 DEBUG func Got x (1)"
+    )
+
+
+def test_format_log_record_with_mismatched_args():
+    record = (0.0, "INFO", "root", "func", "Got %s %s", ("x",), None)
+    assert format_log_record(record).endswith("Got %s %s ('x',)")
+
+
+def test_format_log_record_appends_exception_text():
+    record = (0.0, "ERROR", "root", "func", "Failed", (), "Traceback...")
+    assert format_log_record(record).endswith("Failed\nTraceback...")
+
+
+def make_log_record(msg, args=(), exc_info=None):
+    return logging.LogRecord(
+        "root", logging.DEBUG, __file__, 1, msg, args, exc_info, "test_func"
+    )
+
+
+def test_deque_handler_stores_record_tuple():
+    deque = collections.deque()
+    record = make_log_record("Got %s and %r", ("a", 1))
+    DequeHandler(deque).emit(record)
+    assert deque.pop() == (
+        record.created,
+        "DEBUG",
+        "root",
+        "test_func",
+        "Got %s and %r",
+        ("a", 1),
+        None,
+    )
+
+
+def test_deque_handler_truncates_long_messages_and_args():
+    deque = collections.deque()
+    DequeHandler(deque, max_length=4).emit(
+        make_log_record("abcdef %s", ("12345",))
+    )
+    msg, args = deque.pop()[4:6]
+    assert (msg, args) == ("abcd... (5 truncated)", ("1234... (1 truncated)",))
+
+
+def test_deque_handler_formats_mutable_args_immediately():
+    deque = collections.deque()
+    value = ["a"]
+    DequeHandler(deque).emit(make_log_record("Got %s", (value,)))
+    value.append("b")
+    record = deque.pop()
+    assert record[4:6] == ("Got ['a']", ())
+    assert format_log_record(record).endswith("Got ['a']")
+
+
+def test_deque_handler_formats_exception_info():
+    deque = collections.deque()
+    try:
+        raise ValueError("Test error")
+    except ValueError:
+        record = make_log_record("Failed", exc_info=sys.exc_info())
+    DequeHandler(deque).emit(record)
+    exc_text = deque.pop()[6]
+    assert exc_text.startswith("Traceback")
+    assert exc_text.endswith("ValueError: Test error")
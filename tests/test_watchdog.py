@@ -0,0 +1,74 @@
+import os
+import time
+from unittest.mock import Mock
+
+from watchdog.events import DirDeletedEvent, FileCreatedEvent, FileMovedEvent
+
+from gridsync.watchdog import Watchdog, _WatchdogEventHandler
+
+
+def test_watchdog_event_handler_coalesces_events(tmp_path, qtbot):
+    watchdog = Watchdog(quiet_period=0.1)
+    handler = _WatchdogEventHandler(watchdog, str(tmp_path), 0.1, 2.0)
+    with qtbot.wait_signal(watchdog.paths_modified) as blocker:
+        for i in range(1000):
+            handler.on_any_event(FileCreatedEvent(str(tmp_path / f"{i}.txt")))
+    root, relpaths, directories_changed = blocker.args
+    assert (root, len(relpaths)) == (str(tmp_path), 1000)
+    assert not directories_changed
+
+
+def test_watchdog_event_handler_includes_move_destinations(tmp_path, qtbot):
+    watchdog = Watchdog()
+    handler = _WatchdogEventHandler(watchdog, str(tmp_path), 0.01, 2.0)
+    with qtbot.wait_signal(watchdog.paths_modified) as blocker:
+        handler.on_any_event(
+            FileMovedEvent(
+                str(tmp_path / "a.txt"), str(tmp_path / "dir" / "b.txt")
+            )
+        )
+    expected = ["a.txt", os.path.join("dir", "b.txt")]
+    assert blocker.args == [str(tmp_path), expected, False]
+
+
+def test_watchdog_event_handler_reports_directory_changes(tmp_path, qtbot):
+    watchdog = Watchdog()
+    handler = _WatchdogEventHandler(watchdog, str(tmp_path), 0.01, 2.0)
+    with qtbot.wait_signal(watchdog.paths_modified) as blocker:
+        handler.on_any_event(DirDeletedEvent(str(tmp_path / "dir")))
+    assert blocker.args == [str(tmp_path), ["dir"], True]
+
+
+def test_watchdog_event_handler_delivers_after_max_delay(tmp_path, qtbot):
+    watchdog = Watchdog()
+    handler = _WatchdogEventHandler(watchdog, str(tmp_path), 0.2, 0.3)
+    callback = Mock()
+    watchdog.path_modified.connect(callback)
+    deadline = time.monotonic() + 1.0
+    while time.monotonic() < deadline:  # Never stay quiet for long enough
+        handler.on_any_event(FileCreatedEvent(str(tmp_path / "a.txt")))
+        qtbot.wait(50)
+    handler.cancel()
+    assert 2 <= callback.call_count <= 4
+
+
+def test_watchdog_event_handler_cancel_discards_pending_events(
+    tmp_path, qtbot
+):
+    watchdog = Watchdog()
+    handler = _WatchdogEventHandler(watchdog, str(tmp_path), 0.05, 2.0)
+    handler.on_any_event(FileCreatedEvent(str(tmp_path / "a.txt")))
+    handler.cancel()
+    with qtbot.assert_not_emitted(watchdog.paths_modified, wait=200):
+        pass
+
+
+def test_watchdog_event_handler_timer_fired_after_cancel_emits_nothing(
+    tmp_path, qtbot
+):
+    watchdog = Watchdog()
+    handler = _WatchdogEventHandler(watchdog, str(tmp_path), 0.05, 2.0)
+    handler.on_any_event(FileCreatedEvent(str(tmp_path / "a.txt")))
+    handler.cancel()
+    with qtbot.assert_not_emitted(watchdog.paths_modified, wait=100):
+        handler._on_timer()  # As if the timer fired just before cancel()
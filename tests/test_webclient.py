@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+from unittest.mock import MagicMock
+
+from pytest_twisted import inlineCallbacks
+from twisted.internet.defer import Deferred, succeed
+from twisted.internet.testing import MemoryReactorClock
+from twisted.python.failure import Failure
+from twisted.web.client import ResponseDone
+
+from gridsync.webclient import WebClient
+
+
+def test_webclient_configures_pool():
+    client = WebClient(
+        MemoryReactorClock(),
+        max_persistent_per_host=5,
+        cached_connection_timeout=30,
+    )
+    assert (
+        client.pool.persistent,
+        client.pool.maxPersistentPerHost,
+        client.pool.cachedConnectionTimeout,
+    ) == (True, 5, 30)
+
+
+@inlineCallbacks
+def test_webclient_passes_pool_to_treq(monkeypatch):
+    fake_get = MagicMock(return_value=succeed(MagicMock(code=200)))
+    monkeypatch.setattr("treq.get", fake_get)
+    client = WebClient(MemoryReactorClock())
+    yield client.get("http://example.invalid/")
+    assert fake_get.call_args[1]["pool"] is client.pool
+
+
+class FakeResponse:
+    code = 200
+
+    def __init__(self):
+        self.protocols = []
+
+    def deliverBody(self, protocol):
+        self.protocols.append(protocol)
+
+
+def test_webclient_tracks_in_flight_requests(monkeypatch):
+    pending: Deferred = Deferred()
+    monkeypatch.setattr("treq.request", lambda *args, **kwargs: pending)
+    client = WebClient(MemoryReactorClock())
+    client.request("GET", "http://example.invalid/")
+    counts = [client.in_flight]
+    response = FakeResponse()
+    pending.callback(response)
+    counts.append(client.in_flight)  # Headers received; body still pending
+    response.deliverBody(MagicMock())
+    response.protocols[0].connectionLost(Failure(ResponseDone()))
+    counts.append(client.in_flight)
+    assert counts == [1, 1, 0]
+
+
+def test_webclient_in_flight_decremented_once_per_response(monkeypatch):
+    monkeypatch.setattr(
+        "treq.request", lambda *args, **kwargs: succeed(response)
+    )
+    response = FakeResponse()
+    client = WebClient(MemoryReactorClock())
+    client.request("GET", "http://example.invalid/")
+    response.deliverBody(MagicMock())
+    response.deliverBody(MagicMock())
+    for protocol in response.protocols:
+        protocol.connectionLost(Failure(ResponseDone()))
+    assert client.in_flight == 0
+
+
+def test_webclient_in_flight_decremented_on_error(monkeypatch):
+    pending: Deferred = Deferred()
+    monkeypatch.setattr("treq.request", lambda *args, **kwargs: pending)
+    client = WebClient(MemoryReactorClock())
+    d = client.request("GET", "http://example.invalid/")
+    d.addErrback(lambda _: None)
+    pending.errback(ConnectionRefusedError())
+    assert client.in_flight == 0